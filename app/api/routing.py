@@ -0,0 +1,74 @@
+import functools
+import inspect
+import types
+import typing
+from typing import Any, Callable
+
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response as RawResponse
+
+from app.schemas.response import Response, ResponseHelper
+
+
+class ModelResponseRoute(APIRoute):
+    """
+    APIRoute that writes a returned Response envelope straight to JSON bytes when its data already
+    has the type declared by response_model, instead of letting FastAPI dump, re-validate and encode
+    it. Any other return value goes through FastAPI's regular response_model handling.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs):
+        super().__init__(path, self.__wrap(endpoint), **kwargs)
+
+    def __wrap(self, endpoint: Callable[..., Any]) -> Callable[..., Any]:
+        # include_router builds a new route from the already wrapped endpoint
+        endpoint = getattr(endpoint, "model_route_endpoint", endpoint)
+        signature = inspect.signature(endpoint)
+        # FastAPI injects the sub-response holding headers/status set by dependencies
+        sub_response = inspect.Parameter("_model_route_response", inspect.Parameter.KEYWORD_ONLY,
+                                         annotation=RawResponse)
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, _model_route_response: RawResponse, **kwargs):
+            if inspect.iscoroutinefunction(endpoint):
+                result = await endpoint(*args, **kwargs)
+            else:
+                result = await run_in_threadpool(endpoint, *args, **kwargs)
+            if not isinstance(result, Response) or not self.__is_declared(result.data):
+                return result
+            response = ResponseHelper.json_response(result,
+                                                    status_code=_model_route_response.status_code or self.status_code or 200)
+            for key, value in _model_route_response.headers.items():
+                response.headers.setdefault(key, value)
+            return response
+
+        wrapper.model_route_endpoint = endpoint
+        wrapper.__signature__ = signature.replace(parameters=[*signature.parameters.values(), sub_response])
+        return wrapper
+
+    def __is_declared(self, data: Any) -> bool:
+        if not isinstance(self.response_model, type) or not issubclass(self.response_model, Response):
+            return False
+        annotation = self.response_model.model_fields["data"].annotation
+        return self.__matches(data, annotation)
+
+    @classmethod
+    def __matches(cls, value: Any, annotation: Any) -> bool:
+        if annotation is Any or isinstance(annotation, typing.TypeVar):
+            return True
+        origin = typing.get_origin(annotation)
+        if origin is typing.Union or origin is types.UnionType:
+            return any(cls.__matches(value, arg) for arg in typing.get_args(annotation))
+        if origin is list:
+            args = typing.get_args(annotation)
+            return isinstance(value, list) and (not args or all(cls.__matches(item, args[0]) for item in value))
+        if annotation is type(None):
+            return value is None
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            # a different model (e.g. with extra fields) still needs response_model filtering
+            return type(value) is annotation
+        if annotation in (bool, int, float, str, dict):
+            return type(value) is annotation
+        return False
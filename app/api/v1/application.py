@@ -2,6 +2,7 @@ from typing import Annotated, List
 
 from fastapi import APIRouter, Depends, Header, Request
 
+from app.api.routing import ModelResponseRoute
 from app.dependencies.security import bearer_token, device_token, get_user_from_token
 from app.models.user import UserModel
 from app.schemas.app import DeviceRequest, ContactUsRequest, DeleteDeviceRequest, FaqResponse, PageContentResponse, \
@@ -14,7 +15,7 @@ from app.services.currency_service import CurrencyService
 # service = AppMockService()
 service = AppService()
 currency_service = CurrencyService()
-router = APIRouter()
+router = APIRouter(route_class=ModelResponseRoute)
 
 
 @router.post("/device", response_model=Response, dependencies=[Depends(device_token)])
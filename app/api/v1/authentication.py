@@ -2,13 +2,14 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, Header, Request
 
+from app.api.routing import ModelResponseRoute
 from app.dependencies.security import refresh_token, bearer_token, device_token
 from app.models.user import UserModel
 from app.schemas.auth import LoginRequest, VerifyOtpRequest, AuthResponseDTO, UpdateUserInfoRequest
 from app.schemas.response import Response
 from app.services.auth_service import AuthService
 
-router = APIRouter()
+router = APIRouter(route_class=ModelResponseRoute)
 
 service = AuthService()
 
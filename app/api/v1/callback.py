@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Request
 from fastapi.params import Query
 
+from app.api.routing import ModelResponseRoute
 from app.schemas.response import ResponseHelper
 from app.services.callback_service import CallbackService
 
-router = APIRouter()
+router = APIRouter(route_class=ModelResponseRoute)
 
 service = CallbackService()
 
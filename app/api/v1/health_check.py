@@ -3,9 +3,10 @@ import datetime
 from fastapi import APIRouter
 from loguru import logger
 
-from app.config.config import supabase_client, esim_hub_service_instance
+from app.api.routing import ModelResponseRoute
+from app.config.config import shared_supabase_client, supabase_pool_stats, esim_hub_service_instance
 
-router = APIRouter()
+router = APIRouter(route_class=ModelResponseRoute)
 
 
 @router.get("/")
@@ -16,14 +17,15 @@ async def health_check():
         "status": "ok",
         "server_time": datetime.datetime.strftime(datetime.datetime.now(), "%Y-%m-%d %H:%M:%S"),
         "supabase": supabase_status,
-        "esim_hub": esim_hub_status
+        "esim_hub": esim_hub_status,
+        "supabase_pool": supabase_pool_stats()
     }
     return response
 
 
 async def __check_supabase_connection():
     try:
-        client = supabase_client()
+        client = shared_supabase_client()
         response = (client.table("users_copy").select("*").limit(1).execute())
         logger.info(response)
         return "ok"
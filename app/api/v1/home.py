@@ -1,18 +1,25 @@
 import os
 
 from fastapi import APIRouter, Depends, Header
+from starlette.responses import Response as RawResponse
 
+from app.api.routing import ModelResponseRoute
+from app.dependencies.catalog_cache import catalog_validator, CatalogValidator
 from app.dependencies.security import device_token
 from app.schemas.home import HomeResponseDto
 from app.schemas.response import Response
 from app.services.home_service import HomeService
 
-router = APIRouter()
+router = APIRouter(route_class=ModelResponseRoute)
 
 service = HomeService()
 
 
 @router.get("/", response_model=Response[HomeResponseDto], dependencies=[Depends(device_token)])
-async def home(x_currency: str = Header(os.getenv("DEFAULT_CURRENCY")), accept_language: str = Header("en"), ) -> \
+async def home(x_currency: str = Header(os.getenv("DEFAULT_CURRENCY")), accept_language: str = Header("en"),
+               validator: CatalogValidator = Depends(catalog_validator)) -> \
 Response[HomeResponseDto]:
-    return await service.home_v2(currency=x_currency, locale=accept_language)
+    payload = await service.get_home_payload(currency=x_currency, locale=accept_language)
+    # a payload with a failed section must not be validated by clients or cached by the CDN
+    headers = validator.headers if payload.complete else {"Cache-Control": "no-store"}
+    return RawResponse(content=payload.body, media_type="application/json", headers=headers)
@@ -1,5 +1,6 @@
 from fastapi import APIRouter , Header ,Depends
 
+from app.api.routing import ModelResponseRoute
 from app.schemas.home import BundleDTO
 from app.schemas.promotion import PromotionValidationRequest, ReferralRewardRequest, PromotionHistoryDto
 from app.schemas.response import Response
@@ -8,7 +9,7 @@ from app.dependencies.security import bearer_token, device_token
 from typing import Annotated, List
 from app.models.user import UserModel
 
-router = APIRouter()
+router = APIRouter(route_class=ModelResponseRoute)
 promotion_service = PromotionService()
 
 @router.post("/validation",response_model=Response[BundleDTO],dependencies=[Depends(bearer_token), Depends(device_token)])
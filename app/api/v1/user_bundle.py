@@ -4,6 +4,7 @@ from typing import Annotated, List
 from fastapi import APIRouter, Depends, Header
 from fastapi.params import Query
 
+from app.api.routing import ModelResponseRoute
 from app.dependencies.security import bearer_token, device_token, bearer_token_anonymous
 from app.models.user import UserModel
 from app.schemas.app import UserNotificationResponse
@@ -11,10 +12,10 @@ from app.schemas.bundle import AssignRequest, AssignTopUpRequest, PaymentIntentR
     ConsumptionResponse, UserOrderHistoryResponse, VerifyOtpRequestDto
 from app.schemas.bundle import UpdateBundleLabelRequest
 from app.schemas.home import BundleDTO
-from app.schemas.response import Response
+from app.schemas.response import Response, CursorResponse
 from app.services.user_service import UserBundleService
 
-router = APIRouter()
+router = APIRouter(route_class=ModelResponseRoute)
 
 service = UserBundleService()
 
@@ -79,18 +80,28 @@ async def get_order_details(order_id: str, user: Annotated[UserModel, Depends(be
     return await service.get_user_esim_by_order_id(order_id, user)
 
 
-@router.get("/user-notification", response_model=Response[List[UserNotificationResponse]],
+@router.get("/user-notification", response_model=CursorResponse[List[UserNotificationResponse]],
             dependencies=[Depends(bearer_token), Depends(device_token)])
 async def user_notification(user: Annotated[UserModel, Depends(bearer_token)],
-                            page_index: int = Query(1, description="Page Index"),
-                            page_size: int = Query(10, description="Page Size")):
-    return await service.user_notifications(user=user, page_index=page_index, page_size=page_size)
+                            page_index: int = Query(1, description="Page Index, ignored when a cursor is sent"),
+                            page_size: int = Query(10, description="Page Size"),
+                            cursor: str = Query(None, description="nextCursor of the previous page"),
+                            include_total: bool = Query(False, description="Return the total count")):
+    return await service.user_notifications(user=user, page_index=page_index, page_size=page_size, cursor=cursor,
+                                            include_total=include_total)
+
+
+@router.get("/user-notification/unread-count", response_model=Response[int],
+            dependencies=[Depends(bearer_token), Depends(device_token)])
+async def unread_user_notification_count(user: Annotated[UserModel, Depends(bearer_token)]):
+    return await service.unread_notifications_count(user)
 
 
 @router.post("/read-user-notification/", response_model=Response[dict],
              dependencies=[Depends(bearer_token), Depends(device_token)])
-async def read_user_notification(user: Annotated[UserModel, Depends(bearer_token)], x_device_id: str = Header(None)):
-    return await service.read_user_notification(user, x_device_id)
+async def read_user_notification(user: Annotated[UserModel, Depends(bearer_token)], x_device_id: str = Header(None),
+                                 up_to: int = Query(None, description="Id of the newest notification seen")):
+    return await service.read_user_notification(user, x_device_id, up_to)
 
 
 @router.get("/bundle-exists/{code}", response_model=Response[bool],
@@ -124,14 +135,17 @@ async def get_related_topup(bundle_code: str, iccid: str, user: Annotated[UserMo
                                                   accept_language=accept_language, currency_code=x_currency)
 
 
-@router.get("/order-history", response_model=Response[List[UserOrderHistoryResponse]],
+@router.get("/order-history", response_model=CursorResponse[List[UserOrderHistoryResponse]],
             dependencies=[Depends(bearer_token), Depends(device_token)])
 async def get_order_history(user: Annotated[UserModel, Depends(bearer_token)],
-                            page_index: int = Query(1, description="Page Index"),
+                            page_index: int = Query(1, description="Page Index, ignored when a cursor is sent"),
                             page_size: int = Query(10, description="Page Size"), x_device_id: str = Header(None),
-                            accept_language: str = Header("en"), ) -> Response[
-    List[UserOrderHistoryResponse]]:
-    return await service.get_order_history(user_id=user.id, page_index=page_index, page_size=page_size)
+                            accept_language: str = Header("en"),
+                            cursor: str = Query(None, description="nextCursor of the previous page"),
+                            include_total: bool = Query(False, description="Return the total count")) -> \
+        CursorResponse[List[UserOrderHistoryResponse]]:
+    return await service.get_order_history(user_id=user.id, page_index=page_index, page_size=page_size,
+                                           cursor=cursor, include_total=include_total)
 
 
 @router.get("/order-history/{order_id}", response_model=Response[UserOrderHistoryResponse],
@@ -2,6 +2,7 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends
 
+from app.api.routing import ModelResponseRoute
 from app.dependencies.security import bearer_token, device_token
 from app.models.user import UserModel
 from app.schemas.promotion import PromotionCodeDetailsResponse
@@ -10,7 +11,7 @@ from app.schemas.response import Response, ResponseHelper
 from app.schemas.user_wallet import UserWalletResponse, TopUpWalletRequest
 from app.services.user_wallet_service import UserWalletService
 
-router = APIRouter()
+router = APIRouter(route_class=ModelResponseRoute)
 service = UserWalletService()
 
 
@@ -1,6 +1,7 @@
 import os
 from typing import Annotated
 
+from app.api.routing import ModelResponseRoute
 from app.dependencies.security import bearer_token, device_token
 from app.models.user import UserModel
 from app.schemas.response import Response
@@ -8,7 +9,7 @@ from app.schemas.voucher import VoucherRequestRedeem
 from app.services.voucher_service import VoucherService
 from fastapi import APIRouter, Depends, Header
 
-router = APIRouter()
+router = APIRouter(route_class=ModelResponseRoute)
 
 service = VoucherService()
 
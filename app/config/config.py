@@ -1,11 +1,16 @@
+import importlib.util
 import os
 import random
+import threading
 from io import BytesIO
+from typing import Optional
 
+import httpx
 import qrcode
 import stripe
 from dotenv import load_dotenv
 from loguru import logger
+from postgrest.utils import SyncClient
 from stripe import PaymentIntent, Charge
 from supabase import create_client, Client
 from supabase.lib.client_options import SyncClientOptions
@@ -50,6 +55,74 @@ def supabase_client() -> Client:
                          options=SyncClientOptions(auto_refresh_token=False))
 
 
+_shared_client: Optional[Client] = None
+_shared_client_lock = threading.Lock()
+_shared_client_requests = 0
+
+
+def shared_supabase_client() -> Client:
+    """
+    Process-wide client used by the repositories and token checks. Its PostgREST session keeps a
+    bounded pool of keep-alive connections (SUPABASE_POOL_SIZE, SUPABASE_POOL_KEEPALIVE), over
+    HTTP/2 when h2 is installed, so requests reuse connections instead of opening a client per repository.
+    Sign in, sign up, refresh and sign out store a session on the client and must use supabase_client().
+    """
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                client = supabase_client()
+                postgrest = client.postgrest
+                session = postgrest.session
+                postgrest.session = SyncClient(
+                    base_url=session.base_url,
+                    headers=session.headers,
+                    timeout=session.timeout,
+                    follow_redirects=True,
+                    http2=os.getenv("SUPABASE_HTTP2", "true").lower() == "true" and importlib.util.find_spec(
+                        "h2") is not None,
+                    limits=httpx.Limits(max_connections=int(os.getenv("SUPABASE_POOL_SIZE", 50)),
+                                        max_keepalive_connections=int(os.getenv("SUPABASE_POOL_KEEPALIVE", 20))),
+                    event_hooks={"request": [__count_supabase_request]})
+                session.close()
+                _shared_client = client
+    return _shared_client
+
+
+def __count_supabase_request(request: httpx.Request):
+    global _shared_client_requests
+    _shared_client_requests += 1
+
+
+def supabase_pool_stats() -> dict:
+    """
+    Snapshot of the shared PostgREST connection pool: open, active and idle connections, requests
+    waiting for a free connection, and the number of requests sent since startup.
+    """
+    if _shared_client is None:
+        return {"connections": 0, "active": 0, "idle": 0, "waiting": 0, "requests": 0}
+    # httpx does not expose its connection pool publicly
+    pool = getattr(_shared_client.postgrest.session._transport, "_pool", None)
+    connections = pool.connections if pool is not None else []
+    idle = sum(1 for connection in connections if connection.is_idle())
+    waiting = sum(1 for request in getattr(pool, "_requests", []) if request.is_queued())
+    return {
+        "connections": len(connections),
+        "active": len(connections) - idle,
+        "idle": idle,
+        "waiting": waiting,
+        "requests": _shared_client_requests
+    }
+
+
+def close_shared_supabase_client():
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is not None:
+            _shared_client.postgrest.session.close()
+            _shared_client = None
+
+
 def esim_hub_service_instance():
     return EsimHubService(
         base_url=os.getenv("ESIM_HUB_BASE_URL"),
@@ -82,6 +82,7 @@ class DatabaseTables(StrEnum):
     TABLE_USER_PROFILE_BUNDLE = "user_profile_bundle"
     TABLE_USER_PROFILE = "user_profile"
     TABLE_USER_COPY = "users_copy"
+    TABLE_USER_COUNTER = "user_counter"
 
     TABLE_BUNDLE = "bundle"
     TABLE_TAG = "tag"
@@ -1,7 +1,8 @@
+import asyncio
 import base64
 import json
 import os
-from typing import List, Dict, Optional, Union
+from typing import List, Dict, Optional, Tuple, Union
 
 import firebase_admin
 from firebase_admin import messaging, credentials
@@ -10,6 +11,7 @@ from loguru import logger
 
 from app.config.notification_types import NotificationContent
 from app.models.notification import NotificationModel
+from app.repo.async_repo import AsyncRepository
 from app.repo.device_repo import DeviceRepo
 from app.repo.notification_repo import NotificationRepo
 
@@ -60,34 +62,35 @@ class FCMService:
             # Initialize Firebase when service is instantiated
             initialize_firebase()
             self._initialized = True
-            self.__notification_repo = NotificationRepo()
-            self.__device_repo = DeviceRepo()
+            self.__notification_repo = AsyncRepository(NotificationRepo())
+            self.__device_repo = AsyncRepository(DeviceRepo())
 
-    def get_user_fcm_tokens(self, user_id: str) -> List[str]:
+    async def get_user_fcm_tokens(self, user_id: str) -> List[str]:
         """
         Retrieves FCM tokens from the logged-in user devices.
         :param user_id: User ID.
         :return: List of FCM tokens.
         """
-        devices = self.__device_repo.list(where={"user_id": user_id, "is_logged_in": True})
+        devices = await self.__device_repo.list(where={"user_id": user_id, "is_logged_in": True})
         return [device.fcm_token for device in devices if device.fcm_token is not None]
 
-    def get_device_fcm_token(self, device_id: str) -> List[str]:
+    async def get_device_fcm_token(self, device_id: str) -> List[str]:
         """
         Retrieves FCM tokens from the logged-in user devices.
         :param device_id: Device Id
         :return: List of FCM tokens.
         """
-        devices = self.__device_repo.list(where={"device_id": device_id})
+        devices = await self.__device_repo.list(where={"device_id": device_id})
         return [device.fcm_token for device in devices if device.fcm_token is not None]
 
-    def get_device_user_id(self, device_id: str) -> str:
-        devices = self.__device_repo.list(where={"device_id": device_id, "is_logged_in": True})
+    async def get_device_user_id(self, device_id: str) -> str:
+        devices = await self.__device_repo.list(where={"device_id": device_id, "is_logged_in": True})
         if len(devices) > 0:
             return devices[0].user_id
         return ""
 
-    def send_notification_to_user_from_template(self, content_template: NotificationContent, user_id: str) -> List[str]:
+    async def send_notification_to_user_from_template(self, content_template: NotificationContent,
+                                                      user_id: str) -> List[str]:
         """Send notification using a registered template."""
         notification = content_template
 
@@ -95,22 +98,30 @@ class FCMService:
             raise ValueError(f"Template {notification} not found")
 
         if notification.isSilent:
-            return self.send_data_message_to_user(user_id, notification.data)
-        notification_data = NotificationModel.model_validate({
-            "user_id": user_id,
-            "title": notification.title,
-            "content": notification.message,
-            "status": False,
-            "data": json.dumps(notification.data),
-            "image_url": ""
-        }).model_dump(exclude={"id", "created_at", "updated_at"})
-        self.__notification_repo.create(notification_data)
+            return await self.send_data_message_to_user(user_id, notification.data)
+        await self.__notification_repo.create(self.__to_notification_data(notification, user_id))
 
-        return self.send_notification_to_user(user_id, notification.title, notification.message, None,
-                                              notification.data)
+        return await self.send_notification_to_user(user_id, notification.title, notification.message, None,
+                                                    notification.data)
 
-    def send_notification_to_device_from_template(self, content_template: NotificationContent, device_id: str) -> List[
-        str]:
+    async def send_notifications_to_users_from_templates(self,
+                                                         content_templates: List[Tuple[str, NotificationContent]]):
+        """
+        Send each notification to its user, storing all of them with a single insert.
+        :param content_templates: (user ID, notification template) pairs, a user may appear more than once.
+        """
+        await self.__notification_repo.create_many([self.__to_notification_data(notification, user_id)
+                                                    for user_id, notification in content_templates
+                                                    if not notification.isSilent])
+        for user_id, notification in content_templates:
+            if notification.isSilent:
+                await self.send_data_message_to_user(user_id, notification.data)
+            else:
+                await self.send_notification_to_user(user_id, notification.title, notification.message, None,
+                                                     notification.data)
+
+    async def send_notification_to_device_from_template(self, content_template: NotificationContent,
+                                                        device_id: str) -> List[str]:
         """Send notification using a registered template."""
         notification = content_template
 
@@ -118,24 +129,28 @@ class FCMService:
             raise ValueError(f"Template {notification} not found")
 
         if notification.isSilent:
-            return self.send_data_message_to_device(device_id, notification.data)
+            return await self.send_data_message_to_device(device_id, notification.data)
+
+        notification_data = self.__to_notification_data(notification, await self.get_device_user_id(device_id))
+        await self.__notification_repo.create(notification_data)
+
+        return await self.send_notification_to_device(device_id, notification.title, notification.message, None,
+                                                      notification.data)
 
-        notification_data = NotificationModel.model_validate({
-            "user_id": self.get_device_user_id(device_id),
+    @staticmethod
+    def __to_notification_data(notification: NotificationContent, user_id: str) -> dict:
+        return NotificationModel.model_validate({
+            "user_id": user_id,
             "title": notification.title,
             "content": notification.message,
             "status": False,
             "data": json.dumps(notification.data),
             "image_url": ""
         }).model_dump(exclude={"id", "created_at", "updated_at"})
-        self.__notification_repo.create(notification_data)
-
-        return self.send_notification_to_device(device_id, notification.title, notification.message, None,
-                                                notification.data)
 
-    def send_notification_to_user(self, user_id: str, title: str, body: str,
-                                  image: Optional[str] = None,
-                                  data: Optional[Dict[str, str]] = None) -> List[str] | None:
+    async def send_notification_to_user(self, user_id: str, title: str, body: str,
+                                        image: Optional[str] = None,
+                                        data: Optional[Dict[str, str]] = None) -> List[str] | None:
         """
         Sends a rich push notification to all logged-in devices of a user.
         :param user_id: User ID.
@@ -145,20 +160,20 @@ class FCMService:
         :param data: Optional data payload to include with notification.
         :return: List of responses.
         """
-        tokens = self.get_user_fcm_tokens(user_id)
+        tokens = await self.get_user_fcm_tokens(user_id)
         if not tokens:
             logger.warning(f"No FCM tokens found for user_id: {user_id}")
             return []
 
         try:
-            self.send_multicast_notification(tokens, title, body, image, data)
+            await asyncio.to_thread(self.send_multicast_notification, tokens, title, body, image, data)
         except Exception as e:
             logger.error(f"Error sending notifications: {e}")
             return [str(e)]
 
-    def send_notification_to_device(self, device_id: str, title: str, body: str,
-                                    image: Optional[str] = None,
-                                    data: Optional[Dict[str, str]] = None) -> List[str] | None:
+    async def send_notification_to_device(self, device_id: str, title: str, body: str,
+                                          image: Optional[str] = None,
+                                          data: Optional[Dict[str, str]] = None) -> List[str] | None:
         """
         Sends a rich push notification to all logged-in devices of a user.
         :param device_id: Device ID.
@@ -168,49 +183,49 @@ class FCMService:
         :param data: Optional data payload to include with notification.
         :return: List of responses.
         """
-        tokens = self.get_device_fcm_token(device_id)
+        tokens = await self.get_device_fcm_token(device_id)
         if not tokens:
             logger.warning(f"No FCM tokens found for device_id: {device_id}")
             return []
 
         try:
-            self.send_multicast_notification(tokens, title, body, image, data)
+            await asyncio.to_thread(self.send_multicast_notification, tokens, title, body, image, data)
         except Exception as e:
             logger.error(f"Error sending notifications: {e}")
             return [str(e)]
 
-    def send_data_message_to_user(self, user_id: str, data: dict) -> List[str] | None:
+    async def send_data_message_to_user(self, user_id: str, data: dict) -> List[str] | None:
         """
         Sends a data message (silent notification) to all logged-in devices of a user.
         :param user_id: User ID.
         :param data: Dictionary containing the data payload.
         :return: List of responses.
         """
-        tokens = self.get_user_fcm_tokens(user_id)
+        tokens = await self.get_user_fcm_tokens(user_id)
         if not tokens:
             logger.warning(f"No FCM tokens found for user_id: {user_id}")
             return []
 
         try:
-            self.send_multicast_notification(tokens, "", "", None, data, True)
+            await asyncio.to_thread(self.send_multicast_notification, tokens, "", "", None, data, True)
         except Exception as e:
             logger.error(f"Error sending data messages: {e}")
             return [str(e)]
 
-    def send_data_message_to_device(self, device_id: str, data: dict) -> List[str] | None:
+    async def send_data_message_to_device(self, device_id: str, data: dict) -> List[str] | None:
         """
         Sends a data message (silent notification) to all logged-in devices of a user.
         :param device_id: User ID.
         :param data: Dictionary containing the data payload.
         :return: List of responses.
         """
-        tokens = self.get_device_fcm_token(device_id)
+        tokens = await self.get_device_fcm_token(device_id)
         if not tokens:
             logger.warning(f"No FCM tokens found for user_id: {device_id}")
             return []
 
         try:
-            self.send_multicast_notification(tokens, "", "", None, data, True)
+            await asyncio.to_thread(self.send_multicast_notification, tokens, "", "", None, data, True)
         except Exception as e:
             logger.error(f"Error sending data messages: {e}")
             return [str(e)]
@@ -0,0 +1,66 @@
+import hashlib
+import os
+from typing import Optional
+
+from fastapi import Header, Request, Response
+
+from app.exceptions import NotModifiedException
+from app.services.catalog_service import catalog_service
+from app.services.currency_service import CurrencyService
+
+currency_service = CurrencyService()
+
+
+class CatalogValidator:
+    """
+    Validators of a catalog response: a strong ETag over the catalog version, locale and, for priced
+    responses, the currency and exchange rate, plus the Cache-Control and Vary headers to revalidate
+    it. Catalog routes require a device id, so responses are private to the client by default.
+    """
+
+    def __init__(self, version: str, locale: str, currency: Optional[str] = None, rate: Optional[float] = None):
+        parts = [version, locale] if currency is None else [version, currency, locale, repr(rate)]
+        digest = hashlib.sha256("|".join(parts).encode()).hexdigest()
+        self.etag = f'"{digest[:32]}"'
+        self.headers = {
+            "ETag": self.etag,
+            "Cache-Control": os.getenv("CATALOG_CACHE_CONTROL", "private, max-age=0, must-revalidate"),
+            "Vary": "Accept-Language" if currency is None else "Accept-Language, X-Currency",
+        }
+
+    def matches(self, if_none_match: str | None) -> bool:
+        if not if_none_match:
+            return False
+        candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+        return "*" in candidates or self.etag in candidates or f"W/{self.etag}" in candidates
+
+
+def catalog_validator(request: Request, response: Response,
+                      x_currency: str = Header(os.getenv("DEFAULT_CURRENCY")),
+                      accept_language: str = Header("en")) -> CatalogValidator:
+    """
+    Answers 304 Not Modified before the endpoint runs when If-None-Match carries the current ETag,
+    otherwise adds the validators to the response.
+    """
+    snapshot = catalog_service.get_snapshot()
+    validator = CatalogValidator(version=snapshot.version, locale=snapshot.resolve_locale(accept_language),
+                                 currency=x_currency, rate=currency_service.get_rate_by_currency(x_currency))
+    return _apply(validator, request, response)
+
+
+def catalog_locale_validator(request: Request, response: Response,
+                             accept_language: str = Header("en")) -> CatalogValidator:
+    """
+    catalog_validator for unpriced responses (regions, countries), which an exchange rate update
+    does not change.
+    """
+    snapshot = catalog_service.get_snapshot()
+    validator = CatalogValidator(version=snapshot.version, locale=snapshot.resolve_locale(accept_language))
+    return _apply(validator, request, response)
+
+
+def _apply(validator: CatalogValidator, request: Request, response: Response) -> CatalogValidator:
+    if validator.matches(request.headers.get("If-None-Match")):
+        raise NotModifiedException(headers=validator.headers)
+    response.headers.update(validator.headers)
+    return validator
@@ -6,7 +6,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from gotrue import AuthResponse
 from loguru import logger
 
-from app.config.config import supabase_client
+from app.config.config import shared_supabase_client
 from app.exceptions import CustomException
 from app.models.user import UserModel
 
@@ -27,7 +27,7 @@ def bearer_token(credentials: HTTPAuthorizationCredentials = Security(security))
         expiry_time = datetime.fromtimestamp(decoded_token['exp'], tz=timezone.utc)
         if expiry_time < datetime.now(tz=timezone.utc):
             raise HTTPException(status_code=401, detail="Bearer Token is expired")
-        response: AuthResponse = supabase_client().auth.get_user(jwt=credentials.credentials)
+        response: AuthResponse = shared_supabase_client().auth.get_user(jwt=credentials.credentials)
         if response.user.is_anonymous and not response.user.email:
             raise HTTPException(status_code=401, detail="Anonymous user is not allowed")
         return UserModel(id=response.user.id, email=response.user.email,
@@ -45,7 +45,7 @@ def bearer_token_anonymous(credentials: HTTPAuthorizationCredentials = Security(
     if not credentials or not credentials.credentials:
         raise CustomException(code=401, name="Token is required", details="Bearer Token is required for this operation")
     try:
-        response: AuthResponse = supabase_client().auth.get_user(jwt=credentials.credentials)
+        response: AuthResponse = shared_supabase_client().auth.get_user(jwt=credentials.credentials)
         metadata = response.user.user_metadata
         return UserModel(
             id=response.user.id if metadata.get("user_id", None) is None else metadata.get("user_id", None),
@@ -65,7 +65,7 @@ def optional_bearer_token(credentials: HTTPAuthorizationCredentials = Security(s
     if not credentials or not credentials.credentials:
         return None
     try:
-        response = supabase_client().auth.get_user(jwt=credentials.credentials)
+        response = shared_supabase_client().auth.get_user(jwt=credentials.credentials)
 
         return UserModel(id=response.user.id, email=response.user.email,
                          token=credentials.credentials,
@@ -80,7 +80,7 @@ def get_user_from_token(jwt_token: str) -> UserModel | None:
         return None
     jwt_token = jwt_token.replace("Bearer ", "").replace("bearer ", "")
     try:
-        response = supabase_client().auth.get_user(jwt=jwt_token)
+        response = shared_supabase_client().auth.get_user(jwt=jwt_token)
         return UserModel(id=response.user.id, email=response.user.email,
                          token=jwt_token,
                          msisdn=response.user.user_metadata.get("msisdn", None),
@@ -39,4 +39,9 @@ class DCBException(CustomException):
             self.details = details["message"] or details["code"]
         else:
             self.details = str(details)
-        super().__init__(name=self.name, details=self.details, code=self.code)
\ No newline at end of file
+        super().__init__(name=self.name, details=self.details, code=self.code)
+
+class NotModifiedException(Exception):
+    def __init__(self, headers: dict):
+        self.headers = headers
+        super().__init__("Not Modified")
@@ -1,13 +1,13 @@
+import os
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError, ValidationException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from loguru import logger
 from pydantic import ValidationError
-from starlette.responses import JSONResponse
+from starlette.responses import Response
 
 from app.api.v1.application import router as app_routes
 from app.api.v1.authentication import router as auth_routes
@@ -22,8 +22,14 @@ from app.api.v1.user_wallet import router as user_wallet_router
 from app.api.v1.promotion import router as promotion_router
 from app.api.v1.voucher import router as voucher_router
 from app.api.v2.home import router as home_routes_v2
-from app.exceptions import CustomException
+from app.config.config import close_shared_supabase_client
+from app.exceptions import CustomException, NotModifiedException
+from app.repo.identity_map import request_identity_map
+from app.repo.query_stats import request_query_stats
 from app.schemas.response import ResponseHelper
+from app.services.catalog_service import catalog_service
+from app.services.currency_service import exchange_rate_table
+from app.services.integration.http_pool import close_pooled_async_clients
 from app.services.scheduler_service import SchedulerService
 
 
@@ -33,9 +39,19 @@ scheduler_service = SchedulerService()
 async def lifespan(app: FastAPI):
     # Startup
     scheduler_service.start_scheduler()
+    try:
+        catalog_service.refresh()
+    except Exception as e:
+        logger.error(f"error while warming up catalog snapshot: {e}")
+    try:
+        exchange_rate_table.load()
+    except Exception as e:
+        logger.error(f"error while loading exchange rates: {e}")
     yield
     # Shutdown
     scheduler_service.shutdown_scheduler()
+    close_shared_supabase_client()
+    await close_pooled_async_clients()
 
 esim_app = FastAPI(lifespan=lifespan,title="eSIM Reseller Backend Open Source",
                    description="eSIM Reseller Backend Open Source using FAST API Framework",
@@ -49,10 +65,7 @@ async def global_exception_handler(request: Request, exc: Exception):
     logger.error(f"Exception: {exc}")
     response_data = ResponseHelper.error_response(status_code=500, title="Exception", error="Internal Server Exception",
                                                   developer_message=str(exc))
-    return JSONResponse(
-        status_code=500,
-        content=jsonable_encoder(response_data),
-    )
+    return ResponseHelper.json_response(response_data, status_code=500)
 
 
 @esim_app.exception_handler(HTTPException)
@@ -66,10 +79,7 @@ async def custom_unauthorized_handler(request: Request, exc: HTTPException):
         exc.status_code = 401
     response_data = ResponseHelper.error_response(status_code=exc.status_code, title=title, error=exc.detail,
                                                   developer_message=str(exc))
-    return JSONResponse(
-        status_code=exc.status_code,
-        content=jsonable_encoder(response_data),
-    )
+    return ResponseHelper.json_response(response_data, status_code=exc.status_code)
 
 
 @esim_app.exception_handler(CustomException)
@@ -77,10 +87,12 @@ async def global_exception_handler(request: Request, exc: CustomException):
     logger.error(f"CustomException: {exc}")
     response_data = ResponseHelper.error_response(status_code=exc.code, title=exc.name,
                                                   error=exc.name, developer_message=exc.details)
-    return JSONResponse(
-        status_code=exc.code,
-        content=jsonable_encoder(response_data),
-    )
+    return ResponseHelper.json_response(response_data, status_code=exc.code)
+
+
+@esim_app.exception_handler(NotModifiedException)
+async def not_modified_handler(request: Request, exc: NotModifiedException):
+    return Response(status_code=304, headers=exc.headers)
 
 
 @esim_app.exception_handler(RequestValidationError)
@@ -108,10 +120,19 @@ async def handle_validations(request: Request, exc):
     error = f"Validation error: {', '.join(formatted_errors)}"
     response_data = ResponseHelper.error_response(status_code=422, error=error, title="Validation Error",
                                                   developer_message=error)
-    return JSONResponse(
-        status_code=400,
-        content=jsonable_encoder(response_data),
-    )
+    return ResponseHelper.json_response(response_data, status_code=400)
+
+
+@esim_app.middleware("http")
+async def repository_request_scope(request, call_next):
+    # rows read by id or by the same where clause are fetched once per request
+    with request_identity_map(), request_query_stats(request.url.path) as query_stats:
+        response = await call_next(request)
+    if os.getenv("DB_QUERY_DEBUG", "false").lower() == "true":
+        response.headers["X-DB-Calls"] = str(query_stats.calls)
+        response.headers["X-DB-Time-Ms"] = f"{query_stats.duration * 1000:.1f}"
+        logger.info(query_stats.summary())
+    return response
 
 
 @esim_app.middleware("http")
@@ -17,6 +17,14 @@ class UserModel(BaseModel):
     anonymous_user_id: Optional[str] = None
 
 
+class UserCounterModel(BaseModel):
+    user_id: str
+    notification_count: int = 0
+    order_count: int = 0
+    unread_notification_count: int = 0
+    updated_at: Optional[str] = None
+
+
 class UsersCopyModel(BaseModel):
     id: str
     email: Optional[str]
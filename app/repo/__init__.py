@@ -2,5 +2,5 @@ from .contact_us_repo import ContactUsRepo
 from .device_repo import DeviceRepo
 from .notification_repo import NotificationRepo
 from .promotion_repo import PromotionRepo, PromotionRuleRepo, PromotionUsageRepo
-from .user_order_repo import UserRepo, UserProfileRepo, UserOrderRepo, UserProfileBundleRepo
+from .user_order_repo import UserRepo, UserProfileRepo, UserOrderRepo, UserProfileBundleRepo, UserCounterRepo
 from .user_wallet_repo import UserWalletRepo, UserWalletTransactionRepo
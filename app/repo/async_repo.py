@@ -0,0 +1,82 @@
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Generic, TypeVar, Optional, Dict
+
+from app.repo.base_repo import BaseRepository
+from app.repo.identity_map import get_identity_map, MISSING
+
+T = TypeVar("T", bound=BaseRepository)
+
+# bounded so a burst of slow queries queues here instead of starving the default executor
+db_executor = ThreadPoolExecutor(max_workers=int(os.getenv("DB_THREAD_POOL_SIZE", 16)), thread_name_prefix="db")
+
+
+class AsyncRepository(Generic[T]):
+    """
+    Awaitable view of a repository: every method of the wrapped repository keeps its name and
+    arguments but runs on the bounded db_executor, so PostgREST round trips no longer block the
+    event loop. Non-callable attributes (e.g. table) are returned as is.
+    """
+
+    def __init__(self, repo: T):
+        self.repo = repo
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.repo, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        async def method(*args, **kwargs):
+            return await self.__run(attribute, *args, **kwargs)
+
+        return method
+
+    async def get_by_id(self, record_id: str):
+        """
+        Within a request scope, get_by_id calls issued in the same event loop iteration (e.g. under
+        asyncio.gather) are coalesced into one get_by_ids query; outside of it, or for a cached table,
+        the call goes straight to the repository.
+        """
+        identity_map = get_identity_map()
+        if identity_map is None or self.repo.cache is not None:
+            return await self.__run(self.repo.get_by_id, record_id)
+
+        row = identity_map.get((self.repo.table_name, "id", record_id), MISSING)
+        if row is not MISSING:
+            return row.model_copy() if row is not None else None
+
+        loop = asyncio.get_running_loop()
+        key = ("pending", self.repo.table_name)
+        batch: Optional[Dict[str, asyncio.Future]] = identity_map.get(key)
+        if batch is None:
+            batch = identity_map[key] = {}
+            loop.call_soon(lambda: asyncio.ensure_future(self.__load_batch(identity_map, key, batch)))
+        future = batch.get(record_id)
+        if future is None:
+            future = batch[record_id] = loop.create_future()
+        # shielded so one cancelled caller does not cancel the lookup for the others
+        row = await asyncio.shield(future)
+        return row.model_copy() if row is not None else None
+
+    async def __load_batch(self, identity_map: dict, key: tuple, batch: Dict[str, asyncio.Future]):
+        if identity_map.get(key) is batch:
+            identity_map.pop(key, None)
+        try:
+            rows = await self.__run(self.repo.get_by_ids, list(batch))
+        except Exception as e:
+            for future in batch.values():
+                future.set_exception(e)
+            return
+        for record_id, future in batch.items():
+            future.set_result(rows.get(record_id))
+
+    @staticmethod
+    async def __run(function, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        # copy the caller's context so request scoped context variables reach the repository
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(db_executor, functools.partial(context.run, function, *args, **kwargs))
@@ -1,20 +1,88 @@
-from typing import TypeVar, Generic, Type, List, Optional
+import json
+import os
+import time
+from typing import TypeVar, Generic, Type, List, Optional, Any, Iterable, Callable, Dict, Tuple
 
+from postgrest.types import CountMethod, ReturnMethod
 from pydantic import BaseModel
 
-from app.config.config import supabase_client
+from app.config.config import shared_supabase_client
 from app.config.db import DatabaseTables
 from app.exceptions import DatabaseException
+from app.repo.identity_map import get_identity_map, forget_table, MISSING
+from app.repo.query_stats import record_query
+from app.repo.table_cache import get_table_cache, clear_table_cache
 
 T = TypeVar("T", bound=BaseModel)
 
 
 class BaseRepository(Generic[T]):
 
-    def __init__(self, table_name: DatabaseTables, model: Type[T]):
-        self.client = supabase_client()
+    def __init__(self, table_name: DatabaseTables, model: Type[T], trusted_rows: bool = False, cache_ttl: int = 0):
+        """
+        trusted_rows skips validation when hydrating full rows; only for flat models whose columns
+        already have the model's types. Rows read with a column projection are never validated,
+        fields outside the projection keep their defaults.
+        cache_ttl > 0 serves get_by_id, get_first_by and list from a process-wide cache of the table
+        for that many seconds; meant for small reference tables.
+        """
+        self.client = shared_supabase_client()
+        self.table_name = table_name
         self.table = self.client.table(table_name)
         self.model = model
+        self.trusted_rows = trusted_rows
+        self.cache = get_table_cache(table_name, cache_ttl) if cache_ttl > 0 else None
+
+    def _to_model(self, row: dict, columns: str = "*") -> T:
+        if self.trusted_rows or columns != "*":
+            return self.model.model_construct(**row)
+        return self.model(**row)
+
+    def _cached(self, key: tuple, load: Callable[[], Any]) -> Any:
+        if self.cache is None:
+            return load()
+        try:
+            value = self.cache.get(key)
+        except TypeError:
+            return load()
+        if value is MISSING:
+            generation = self.cache.generation
+            value = load()
+            self.cache.put(key, value, generation)
+        if isinstance(value, list):
+            return [item.model_copy() for item in value]
+        return value.model_copy() if value is not None else None
+
+    def _remembered(self, key: tuple, load: Callable[[], Optional[T]]) -> Optional[T]:
+        """
+        Returns the row stored under key in the request's identity map, loading it on the first
+        lookup. Callers get a copy so changing one result does not leak into the next lookup.
+        """
+        identity_map = get_identity_map()
+        if identity_map is None:
+            return self._cached(key, load)
+        map_key = (self.table_name, *key)
+        try:
+            row = identity_map.get(map_key, MISSING)
+        except TypeError:
+            # unhashable where values are not remembered
+            return self._cached(key, load)
+        if row is MISSING:
+            row = identity_map[map_key] = self._cached(key, load)
+        return row.model_copy() if row is not None else None
+
+    def _execute(self, query, operation: str, *shape):
+        started = time.perf_counter()
+        try:
+            return query.execute()
+        finally:
+            record_query(self.table_name, operation, shape, time.perf_counter() - started)
+
+    def _forget(self):
+        clear_table_cache(self.table_name)
+        identity_map = get_identity_map()
+        if identity_map is not None:
+            forget_table(identity_map, self.table_name)
 
     def select(self, tables: dict, where: dict = (), filters: dict = (), limit: int = 1000, offset: int = 0,
                order_by: str = None, desc=False,
@@ -32,56 +100,145 @@ class BaseRepository(Generic[T]):
             query = query.limit(limit).offset(offset)
             if order_by:
                 query = query.order(order_by, desc=desc)
-            response = query.execute()
+            response = self._execute(query, "select", tuple(tables), tuple(where), tuple(filters))
             if not as_model:
                 return response.data if response.data else []
-            return [self.model(**item) for item in response.data] if response.data else []
+            return [self._to_model(item) for item in response.data] if response.data else []
         except Exception as e:
             raise DatabaseException(str(e))
 
     def get_by_id(self, record_id: str) -> Optional[T]:
+        def load():
+            try:
+                response = self._execute(self.table.select("*").eq("id", record_id), "get_by_id")
+                return self._to_model(response.data[0]) if response.data else None
+            except Exception as e:
+                raise DatabaseException(str(e))
+
+        return self._remembered(("id", record_id), load)
+
+    def get_by_ids(self, record_ids: List[str]) -> Dict[str, Optional[T]]:
+        """
+        Loads several rows by id with one in query, keyed by the requested ids; missing rows map to None.
+        The rows are remembered for later get_by_id calls in the same request.
+        """
+        identity_map = get_identity_map()
+        missing = [record_id for record_id in record_ids
+                   if identity_map is None or (self.table_name, "id", record_id) not in identity_map]
+        rows = {}
+        if missing:
+            try:
+                response = self._execute(self.table.select("*").in_("id", missing), "get_by_ids")
+                rows = {str(item["id"]): self._to_model(item) for item in response.data or []}
+            except Exception as e:
+                raise DatabaseException(str(e))
+        return {record_id: self._remembered(("id", record_id), lambda: rows.get(str(record_id)))
+                for record_id in record_ids}
+
+    def select_procedure(self, where: dict = (),function_name : str='') -> List[T]:
         try:
-            response = self.table.select("*").eq("id", record_id).execute()
-            return self.model(**response.data[0]) if response.data else None
+            response = self._execute(self.client.rpc(function_name, params=where), f"rpc:{function_name}", tuple(where))
+            return [self._to_model(item) for item in response.data] if response.data else []
         except Exception as e:
             raise DatabaseException(str(e))
 
-    def select_procedure(self, where: dict = (),function_name : str='') -> List[T]:
+    def get_first_by(self, where: dict, filters: dict = None, columns: str = "*") -> Optional[T]:
+        def load():
+            try:
+                myquery = self.table.select(columns)
+                for key, value in where.items():
+                    myquery = myquery.eq(key, value)
+                if filters:
+                    for key, value in filters.items():
+                        myquery = myquery.filter(key, "eq", value)
+                response = self._execute(myquery.limit(1), "get_first_by", tuple(where), tuple(filters or ()))
+                return self._to_model(response.data[0], columns) if response.data else None
+            except Exception as e:
+                raise DatabaseException(str(e))
+
+        return self._remembered(("first", tuple(where.items()), tuple((filters or {}).items()), columns), load)
+
+    def exists(self, where: dict, filters: dict = None) -> bool:
         try:
-            response = self.client.rpc(function_name, params=where).execute()
-            return [self.model(**item) for item in response.data] if response.data else []
+            query = self.table.select("id")
+            for key, value in where.items():
+                query = query.eq(key, value)
+            if filters:
+                for key, value in filters.items():
+                    query = query.filter(key, "eq", value)
+            response = self._execute(query.limit(1), "exists", tuple(where), tuple(filters or ()))
+            return len(response.data) > 0
         except Exception as e:
             raise DatabaseException(str(e))
 
-    def get_first_by(self, where: dict, filters: dict = None) -> Optional[T]:
+    def count(self, where: dict, filters: dict = None) -> int:
         try:
-            myquery = self.table.select("*")
+            query = self.table.select("id", count=CountMethod.exact, head=True)
             for key, value in where.items():
-                myquery = myquery.eq(key, value)
+                query = query.eq(key, value)
             if filters:
                 for key, value in filters.items():
-                    myquery = myquery.filter(key, "eq", value)
-            response = myquery.execute()
-            return self.model(**response.data[0]) if response.data else None
+                    query = query.filter(key, "eq", value)
+            response = self._execute(query, "count", tuple(where), tuple(filters or ()))
+            return response.count or 0
         except Exception as e:
             raise DatabaseException(str(e))
 
-    def list(self, where: dict, limit: int = 1000, offset: int = 0, order_by: str = None, desc=False) -> List[T]:
+    def values(self, column: str, where: dict, limit: int = 1000, offset: int = 0, order_by: str = None,
+               desc=False) -> List[Any]:
         try:
-            query = self.table.select("*")
+            query = self.table.select(column)
             for key, value in where.items():
                 query = query.eq(key, value)
             query = query.limit(limit).offset(offset)
             if order_by:
                 query = query.order(order_by, desc=desc)
-            response = query.execute()
-            return [self.model(**item) for item in response.data] if response.data else []
+            response = self._execute(query, "values", column, tuple(where))
+            return [item[column] for item in response.data] if response.data else []
+        except Exception as e:
+            raise DatabaseException(str(e))
+
+    def list(self, where: dict, limit: int = 1000, offset: int = 0, order_by: str = None, desc=False,
+             columns: str = "*") -> List[T]:
+        def load():
+            try:
+                query = self.table.select(columns)
+                for key, value in where.items():
+                    query = query.eq(key, value)
+                query = query.limit(limit).offset(offset)
+                if order_by:
+                    query = query.order(order_by, desc=desc)
+                response = self._execute(query, "list", tuple(where))
+                return [self._to_model(item, columns) for item in response.data] if response.data else []
+            except Exception as e:
+                raise DatabaseException(str(e))
+
+        return self._cached(("list", tuple(where.items()), limit, offset, order_by, desc, columns), load)
+
+    def list_keyset(self, where: dict, after: Optional[Tuple[Any, Any]] = None, limit: int = 20, offset: int = 0,
+                    order_by: str = "created_at", columns: str = "*") -> List[T]:
+        """
+        Newest first page ordered by (order_by, id), starting right after the after position instead
+        of skipping offset rows, so deep pages cost the same as the first one.
+        """
+        try:
+            query = self.table.select(columns)
+            for key, value in where.items():
+                query = query.eq(key, value)
+            if after is not None:
+                # quoted, timestamps contain characters reserved by the PostgREST filter syntax
+                value, record_id = (json.dumps(str(item)) for item in after)
+                query = query.or_(f"{order_by}.lt.{value},and({order_by}.eq.{value},id.lt.{record_id})")
+            query = query.order(order_by, desc=True).order("id", desc=True).limit(limit).offset(offset)
+            response = self._execute(query, "list_keyset", tuple(where), after is not None)
+            return [self._to_model(item, columns) for item in response.data] if response.data else []
         except Exception as e:
             raise DatabaseException(str(e))
 
-    def list_in(self, where: dict,filter:dict= (), limit: int = 1000, offset: int = 0, order_by: str = None, desc=False) -> List[T]:
+    def list_in(self, where: dict,filter:dict= (), limit: int = 1000, offset: int = 0, order_by: str = None, desc=False,
+                columns: str = "*") -> List[T]:
         try:
-            query = self.table.select("*")
+            query = self.table.select(columns)
             for key, value in where.items():
                 query = query.eq(key, value)
             for key, value in filter.items():
@@ -91,33 +248,85 @@ class BaseRepository(Generic[T]):
             query = query.limit(limit).offset(offset)
             if order_by:
                 query = query.order(order_by, desc=desc)
-            response = query.execute()
-            return [self.model(**item) for item in response.data] if response.data else []
+            response = self._execute(query, "list_in", tuple(where), tuple(filter))
+            return [self._to_model(item, columns) for item in response.data] if response.data else []
         except Exception as e:
             raise DatabaseException(str(e))
 
     def create(self, data: dict) -> Optional[T]:
+        self._forget()
+        try:
+            response = self._execute(self.table.insert(data), "create")
+            return self._to_model(response.data[0]) if response.data else None
+        except Exception as e:
+            raise DatabaseException(str(e))
+
+    def create_many(self, data: List[dict], chunk_size: int = None) -> int:
+        self._forget()
+        try:
+            inserted = 0
+            for chunk in self.__chunks(data, chunk_size):
+                response = self._execute(
+                    self.table.insert(chunk, count=CountMethod.exact, returning=ReturnMethod.minimal), "create_many")
+                inserted += response.count or 0
+            return inserted
+        except Exception as e:
+            raise DatabaseException(str(e))
+
+    def upsert_many(self, data: List[dict], on_conflict: str, ignore_duplicates: bool = False,
+                    chunk_size: int = None) -> int:
+        self._forget()
+        try:
+            affected = 0
+            for chunk in self.__chunks(data, chunk_size):
+                response = self._execute(
+                    self.table.upsert(chunk, on_conflict=on_conflict, ignore_duplicates=ignore_duplicates,
+                                      count=CountMethod.exact, returning=ReturnMethod.minimal), "upsert_many")
+                affected += response.count or 0
+            return affected
+        except Exception as e:
+            raise DatabaseException(str(e))
+
+    def update_in(self, column: str, values: List[Any], data: dict, where: dict = None, chunk_size: int = None) -> int:
+        self._forget()
         try:
-            response = self.table.insert(data).execute()
-            return self.model(**response.data[0]) if response.data else None
+            updated = 0
+            for chunk in self.__chunks(values, chunk_size):
+                query = self.table.update(data, count=CountMethod.exact, returning=ReturnMethod.minimal)
+                if where:
+                    for key, value in where.items():
+                        query = query.eq(key, value)
+                response = self._execute(query.in_(column, chunk), "update_in", column, tuple(where or ()))
+                updated += response.count or 0
+            return updated
         except Exception as e:
             raise DatabaseException(str(e))
 
+    @staticmethod
+    def __chunks(items: List[Any], chunk_size: int = None) -> Iterable[List[Any]]:
+        # keeps each request body and url (for in filters) within PostgREST and proxy limits
+        chunk_size = chunk_size or int(os.getenv("DB_BULK_CHUNK_SIZE", 500))
+        for start in range(0, len(items), chunk_size):
+            yield items[start:start + chunk_size]
+
     def upsert(self, data: dict, on_conflict: str):
+        self._forget()
         try:
-            response = self.table.upsert(data, on_conflict=on_conflict).execute()
+            response = self._execute(self.table.upsert(data, on_conflict=on_conflict), "upsert")
             return response.data if response.data else None
         except Exception as e:
             raise DatabaseException(str(e))
 
     def update(self, record_id: str, data: dict):
+        self._forget()
         try:
-            response = self.table.update(data).eq("id", record_id).execute()
+            response = self._execute(self.table.update(data).eq("id", record_id), "update")
             return response.data if response.data else None
         except Exception as e:
             raise DatabaseException(str(e))
 
     def update_by(self, where: dict, data: dict, filters: dict = None):
+        self._forget()
         try:
             myquery = self.table.update(data)
 
@@ -126,24 +335,26 @@ class BaseRepository(Generic[T]):
             if filters:
                 for key, value in filters.items():
                     myquery = myquery.filter(key, "eq", value)
-            response = myquery.execute()
+            response = self._execute(myquery, "update_by", tuple(where), tuple(filters or ()))
             return response.data if response.data else None
         except Exception as e:
             raise DatabaseException(str(e))
 
     def delete(self, record_id: str):
+        self._forget()
         try:
-            response = self.table.delete().eq("id", record_id).execute()
+            response = self._execute(self.table.delete().eq("id", record_id), "delete")
             return response.data if response.data else None
         except Exception as e:
             raise DatabaseException(str(e))
 
     def delete_by(self, where: dict):
+        self._forget()
         try:
             query = self.table.delete()
             for key, value in where.items():
                 query = query.eq(key, value)
-            response = query.execute()
+            response = self._execute(query, "delete_by", tuple(where))
             return response.data if response.data else None
         except Exception as e:
             raise DatabaseException(str(e))
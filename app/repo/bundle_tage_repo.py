@@ -6,4 +6,4 @@ from app.repo.base_repo import BaseRepository
 class BundleTagRepo(BaseRepository):
 
     def __init__(self):
-        super().__init__(DatabaseTables.TABLE_BUNDLE_TAG, BundleTagModel)
+        super().__init__(DatabaseTables.TABLE_BUNDLE_TAG, BundleTagModel, trusted_rows=True)
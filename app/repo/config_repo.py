@@ -1,8 +1,12 @@
+from typing import Optional
+
 from app.config.db import DatabaseTables
 from app.models.app import AppConfigModel
 from app.repo.base_repo import BaseRepository
+from app.repo.table_cache import reference_cache_ttl
 
 
 class ConfigRepo(BaseRepository):
-    def __init__(self):
-        super().__init__(DatabaseTables.TABLE_APP_CONFIG, AppConfigModel)
+    def __init__(self, cache_ttl: Optional[int] = None):
+        super().__init__(DatabaseTables.TABLE_APP_CONFIG, AppConfigModel, trusted_rows=True,
+                         cache_ttl=reference_cache_ttl() if cache_ttl is None else cache_ttl)
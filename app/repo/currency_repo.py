@@ -1,9 +1,13 @@
+from typing import Optional
+
 from app.config.db import DatabaseTables
 from app.models.app import CurrencyModel
 from app.repo.base_repo import BaseRepository
+from app.repo.table_cache import reference_cache_ttl
 
 
 class CurrencyRepo(BaseRepository):
 
-    def __init__(self):
-        super().__init__(DatabaseTables.TABLE_CURRENCY, CurrencyModel)
\ No newline at end of file
+    def __init__(self, cache_ttl: Optional[int] = None):
+        super().__init__(DatabaseTables.TABLE_CURRENCY, CurrencyModel, trusted_rows=True,
+                         cache_ttl=reference_cache_ttl() if cache_ttl is None else cache_ttl)
@@ -0,0 +1,34 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+# marks a lookup that has not been made yet, None is a remembered missing row
+MISSING = object()
+
+# rows read during the current request, keyed by (table, lookup...); None outside a request scope
+_identity_map: ContextVar[Optional[Dict[tuple, Any]]] = ContextVar("repository_identity_map", default=None)
+
+
+@contextmanager
+def request_identity_map():
+    """
+    Opens a request scope in which repository reads by id or by the same where clause are served from
+    memory after the first round trip. Any write to a table forgets what was read from it.
+    """
+    identity_map = {}
+    token = _identity_map.set(identity_map)
+    try:
+        yield identity_map
+    finally:
+        # tasks spawned by the request keep a reference to the map, empty it so they read fresh rows
+        identity_map.clear()
+        _identity_map.reset(token)
+
+
+def get_identity_map() -> Optional[Dict[tuple, Any]]:
+    return _identity_map.get()
+
+
+def forget_table(identity_map: Dict[tuple, Any], table_name: str):
+    for key in [key for key in list(identity_map) if key[0] == table_name]:
+        identity_map.pop(key, None)
@@ -0,0 +1,38 @@
+import base64
+import binascii
+import json
+from typing import Optional, Tuple, List, TypeVar
+
+from pydantic import BaseModel
+
+from app.exceptions import BadRequestException
+
+T = TypeVar("T", bound=BaseModel)
+
+
+def encode_cursor(row: BaseModel, order_by: str = "created_at") -> str:
+    """
+    Opaque cursor pointing right after row, for the (order_by, id) ordering used by list_keyset.
+    """
+    position = [getattr(row, order_by), getattr(row, "id")]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[str, str]]:
+    if not cursor:
+        return None
+    try:
+        value, record_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError, TypeError):
+        raise BadRequestException(details="Invalid cursor")
+    return value, record_id
+
+
+def keyset_page(rows: List[T], limit: int, order_by: str = "created_at") -> Tuple[List[T], Optional[str]]:
+    """
+    Splits rows read with limit + 1 into the page and the cursor of the next one, None on the last page.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1], order_by)
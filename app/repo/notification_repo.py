@@ -1,4 +1,9 @@
+from typing import Optional
+
+from postgrest.types import CountMethod, ReturnMethod
+
 from app.config.db import DatabaseTables
+from app.exceptions import DatabaseException
 from app.models.notification import NotificationModel
 from app.repo.base_repo import BaseRepository
 
@@ -7,3 +12,19 @@ class NotificationRepo(BaseRepository):
 
     def __init__(self):
         super().__init__(DatabaseTables.TABLE_NOTIFICATION, NotificationModel)
+
+    def mark_read(self, user_id: str, up_to: Optional[int] = None) -> int:
+        """
+        Marks the unread notifications of a user as read, only those with an id up to the up_to
+        watermark when given. Rows already read are not rewritten.
+        """
+        self._forget()
+        try:
+            query = self.table.update({"status": True}, count=CountMethod.exact, returning=ReturnMethod.minimal)
+            query = query.eq("user_id", user_id).not_.is_("status", "true")
+            if up_to is not None:
+                query = query.lte("id", up_to)
+            response = self._execute(query, "mark_read", up_to is not None)
+            return response.count or 0
+        except Exception as e:
+            raise DatabaseException(str(e))
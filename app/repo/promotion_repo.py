@@ -1,17 +1,18 @@
 from app.config.db import DatabaseTables
 from app.models.promotion import PromotionRuleModel, PromotionModel, PromotionUsageModel
 from app.repo.base_repo import BaseRepository
+from app.repo.table_cache import reference_cache_ttl
 
 
 class PromotionRuleRepo(BaseRepository):
 
     def __init__(self):
-        super().__init__(DatabaseTables.TABLE_PROMOTION_RULE, PromotionRuleModel)
+        super().__init__(DatabaseTables.TABLE_PROMOTION_RULE, PromotionRuleModel, cache_ttl=reference_cache_ttl())
 
 
 class PromotionRepo(BaseRepository):
     def __init__(self):
-        super().__init__(DatabaseTables.TABLE_PROMOTION, PromotionModel)
+        super().__init__(DatabaseTables.TABLE_PROMOTION, PromotionModel, cache_ttl=reference_cache_ttl())
 
 
 class PromotionUsageRepo(BaseRepository):
@@ -0,0 +1,62 @@
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple, List
+
+from loguru import logger
+
+
+class QueryStats:
+    """
+    Database calls made while serving one request: the total count and time, the count and time per
+    table and operation, and how often each query shape (operation plus the columns it filters on)
+    ran. A shape repeating more than DB_N_PLUS_ONE_THRESHOLD times is logged once as a likely N+1.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.calls = 0
+        self.duration = 0.0
+        self.operations: Dict[Tuple[str, str], List[float]] = {}
+        self.__shapes: Dict[tuple, int] = {}
+        self.__threshold = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", 5))
+        self.__lock = threading.Lock()
+
+    def record(self, table: str, operation: str, shape: tuple, seconds: float):
+        key = (table, operation, *shape)
+        with self.__lock:
+            self.calls += 1
+            self.duration += seconds
+            timing = self.operations.setdefault((table, operation), [0, 0.0])
+            timing[0] += 1
+            timing[1] += seconds
+            repeated = self.__shapes[key] = self.__shapes.get(key, 0) + 1
+        if repeated == self.__threshold + 1:
+            logger.warning(f"possible N+1 on {self.path}: {table}.{operation} {shape} ran more than "
+                           f"{self.__threshold} times in one request")
+
+    def summary(self) -> str:
+        operations = ", ".join(f"{table}.{operation}={count}/{seconds * 1000:.1f}ms"
+                               for (table, operation), (count, seconds) in
+                               sorted(self.operations.items(), key=lambda item: -item[1][1]))
+        return f"{self.path}: {self.calls} db calls in {self.duration * 1000:.1f}ms ({operations})"
+
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("repository_query_stats", default=None)
+
+
+@contextmanager
+def request_query_stats(path: str):
+    query_stats = QueryStats(path)
+    token = _query_stats.set(query_stats)
+    try:
+        yield query_stats
+    finally:
+        _query_stats.reset(token)
+
+
+def record_query(table: str, operation: str, shape: tuple, seconds: float):
+    query_stats = _query_stats.get()
+    if query_stats is not None:
+        query_stats.record(table, operation, shape, seconds)
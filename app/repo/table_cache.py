@@ -0,0 +1,71 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict
+
+from app.repo.identity_map import MISSING
+
+
+class TableCache:
+    """
+    Process-wide read-through cache of the lookups made on one table. Entries expire after ttl
+    seconds, the least recently used ones are dropped past TABLE_CACHE_SIZE, and any write through a
+    repository of the table clears it.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self.generation = 0
+        self.__entries: OrderedDict[tuple, tuple] = OrderedDict()
+        self.__max_size = int(os.getenv("TABLE_CACHE_SIZE", 256))
+        self.__lock = threading.Lock()
+
+    def get(self, key: tuple) -> Any:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self.__entries[key]
+                return MISSING
+            self.__entries.move_to_end(key)
+            return value
+
+    def put(self, key: tuple, value: Any, generation: int):
+        with self.__lock:
+            # a write cleared the cache while this value was loading, it may already be stale
+            if generation != self.generation:
+                return
+            self.__entries[key] = (time.monotonic() + self.ttl, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+
+    def clear(self):
+        with self.__lock:
+            self.generation += 1
+            self.__entries.clear()
+
+
+_table_caches: Dict[str, TableCache] = {}
+_table_caches_lock = threading.Lock()
+
+
+def get_table_cache(table_name: str, ttl: int) -> TableCache:
+    with _table_caches_lock:
+        cache = _table_caches.get(table_name)
+        if cache is None:
+            cache = _table_caches[table_name] = TableCache(ttl)
+        return cache
+
+
+def clear_table_cache(table_name: str):
+    cache = _table_caches.get(table_name)
+    if cache is not None:
+        cache.clear()
+
+
+def reference_cache_ttl() -> int:
+    return int(os.getenv("REFERENCE_CACHE_TTL_SECONDS", 60))
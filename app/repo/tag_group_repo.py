@@ -1,9 +1,10 @@
 from app.config.db import DatabaseTables
 from app.models.app import TagModel
 from app.repo.base_repo import BaseRepository
+from app.repo.table_cache import reference_cache_ttl
 
 
 class tagGroupRepo(BaseRepository):
 
     def __init__(self):
-        super().__init__(DatabaseTables.TABLE_TAG_GROUP, TagModel)
\ No newline at end of file
+        super().__init__(DatabaseTables.TABLE_TAG_GROUP, TagModel, trusted_rows=True, cache_ttl=reference_cache_ttl())
\ No newline at end of file
@@ -1,5 +1,6 @@
 from app.config.db import DatabaseTables
-from app.models.user import UserOrderModel, UserProfileModel, UserProfileBundleModel, UsersCopyModel
+from app.models.user import UserOrderModel, UserProfileModel, UserProfileBundleModel, UsersCopyModel, \
+    UserCounterModel
 from app.repo.base_repo import BaseRepository
 
 
@@ -21,3 +22,8 @@ class UserProfileBundleRepo(BaseRepository):
 class UserRepo(BaseRepository):
     def __init__(self):
         super().__init__(DatabaseTables.TABLE_USER_COPY, UsersCopyModel)
+
+
+class UserCounterRepo(BaseRepository):
+    def __init__(self):
+        super().__init__(DatabaseTables.TABLE_USER_COUNTER, UserCounterModel, trusted_rows=True)
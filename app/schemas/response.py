@@ -1,6 +1,8 @@
-from typing import Optional, Generic, TypeVar
+from typing import Any, Optional, Generic, TypeVar, List
 
 from pydantic import BaseModel, ConfigDict
+from pydantic_core import to_json
+from starlette.responses import JSONResponse
 
 T = TypeVar('T')
 
@@ -17,6 +19,24 @@ class Response(BaseModel, Generic[T]):
     model_config = ConfigDict(from_attributes=True, extra="ignore")
 
 
+class CursorResponse(Response[T], Generic[T]):
+    """
+    Response of a keyset paginated list; nextCursor is passed back as cursor for the next page and is
+    None on the last one.
+    """
+    nextCursor: Optional[str] = None
+
+
+class ModelJSONResponse(JSONResponse):
+    """
+    JSONResponse that serializes already validated pydantic models (or plain data) straight to bytes
+    with pydantic-core, skipping jsonable_encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content, by_alias=True)
+
+
 class ResponseHelper:
     @staticmethod
     def success_response(message: str = None) -> Response[None]:
@@ -29,6 +49,20 @@ class ResponseHelper:
                         developerMessage=None,
                         responseCode=200)
 
+    @staticmethod
+    def success_cursor_response(data: T, total_count: int, next_cursor: Optional[str]) -> CursorResponse[T]:
+        return CursorResponse(status='success', totalCount=total_count, data=data, title="Success", message=None,
+                              developerMessage=None, responseCode=200, nextCursor=next_cursor)
+
+    @staticmethod
+    def success_json_list_response(items: List[bytes], total_count: int, message: str = None) -> bytes:
+        """
+        Serializes a success response whose data is a list of already serialized JSON items.
+        """
+        envelope = ResponseHelper.success_data_response([], total_count, message).model_dump_json().encode()
+        head, tail = envelope.split(b'"data":[]', 1)
+        return head + b'"data":[' + b",".join(items) + b"]" + tail
+
     @staticmethod
     def success_data_response_with_message(data: T, message: str, total_count: int) -> Response[T]:
         return Response(status='success', totalCount=total_count, data=data, title="Success", message=message,
@@ -41,3 +75,7 @@ class ResponseHelper:
         return Response(status='failed', totalCount=0, data=None, title=title, message=error,
                         developerMessage=developer_message,
                         responseCode=status_code)
+
+    @staticmethod
+    def json_response(response: Response, status_code: int = 200, headers: dict = None) -> ModelJSONResponse:
+        return ModelJSONResponse(content=response, status_code=status_code, headers=headers)
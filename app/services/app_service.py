@@ -10,6 +10,7 @@ from app.config.db import ConfigKeysEnum, PaymentTypeEnum
 from app.exceptions import CustomException
 from app.models.app import DeviceModel
 from app.models.user import UserModel
+from app.repo.async_repo import AsyncRepository
 from app.repo.config_repo import ConfigRepo
 from app.repo.contact_us_repo import ContactUsRepo
 from app.repo.device_repo import DeviceRepo
@@ -23,9 +24,9 @@ class AppService:
 
     def __init__(self):
         self.__esim_hub_service = esim_hub_service_instance()
-        self.__contact_us_repo = ContactUsRepo()
-        self.__device_repo = DeviceRepo()
-        self.__config_repo = ConfigRepo()
+        self.__contact_us_repo = AsyncRepository(ContactUsRepo())
+        self.__device_repo = AsyncRepository(DeviceRepo())
+        self.__config_repo = AsyncRepository(ConfigRepo())
 
     async def add_device(self, user: UserModel | None, device_id: str, device_request: DeviceRequest,
                          request: Request) -> \
@@ -50,16 +51,16 @@ class AppService:
 
         # if device_id is null we need to check if it already exist to update values, since upsert doesnt work for Null values
         if user_id is None:
-            update_response = self.__device_repo.update_by(where={"device_id": device_id},
-                                                           data=device_model.model_dump(
-                                                               exclude={"timestamp_login", "timestamp_logout"}))
+            update_response = await self.__device_repo.update_by(where={"device_id": device_id},
+                                                                 data=device_model.model_dump(
+                                                                     exclude={"timestamp_login", "timestamp_logout"}))
             # Check if any rows were updated
             if update_response and len(update_response) > 0:
                 return ResponseHelper.success_response()
 
         logger.info("No existing Device row found, performing upsert...")
         device_model.user_id = user_id
-        upsert_response = self.__device_repo.upsert(
+        upsert_response = await self.__device_repo.upsert(
             data=device_model.model_dump(exclude={"timestamp_login", "timestamp_logout"}),
             on_conflict="device_id,user_id")
 
@@ -89,7 +90,7 @@ class AppService:
         return ResponseHelper.success_data_response(DtoMapper.to_page_content_response(response), 1)
 
     async def contact_us(self, contact_us_request: ContactUsRequest):
-        response = self.__contact_us_repo.create({
+        response = await self.__contact_us_repo.create({
             "email": contact_us_request.email,
             "content": bleach.clean(contact_us_request.content),
         })
@@ -116,7 +117,7 @@ class AppService:
 
     async def configurations(self) -> Response[List[GlobalConfiguration]]:
         response = []
-        app_cache_key = self.__config_repo.get_first_by({"key": ConfigKeysEnum.APP_CACHE_KEY})
+        app_cache_key = await self.__config_repo.get_first_by({"key": ConfigKeysEnum.APP_CACHE_KEY})
         if app_cache_key:
             response.append(GlobalConfiguration(key="CATALOG.BUNDLES_CACHE_VERSION", value=app_cache_key.value))
         response.append(
@@ -6,9 +6,10 @@ from datetime import datetime, timezone
 from fastapi import Request
 from loguru import logger
 
-from app.config.config import authenticate, supabase_client, generate_otp, dcb_service_instance
+from app.config.config import authenticate, supabase_client, shared_supabase_client, generate_otp, dcb_service_instance
 from app.exceptions import CustomException, BadRequestException
 from app.models.user import UserModel
+from app.repo.async_repo import AsyncRepository
 from app.repo.device_repo import DeviceRepo
 from app.repo.user_order_repo import UserRepo
 from app.schemas.auth import LoginRequest, VerifyOtpRequest, UpdateUserInfoRequest, AuthResponseDTO
@@ -22,8 +23,8 @@ from app.services.user_wallet_service import UserWalletService
 class AuthService:
 
     def __init__(self):
-        self.__device_repo = DeviceRepo()
-        self.__user_repo = UserRepo()
+        self.__device_repo = AsyncRepository(DeviceRepo())
+        self.__user_repo = AsyncRepository(UserRepo())
         self.__user_wallet_service = UserWalletService()
         self.__promotion_service = PromotionService()
         self.__dcb_service = dcb_service_instance()
@@ -50,7 +51,7 @@ class AuthService:
             else:
                 raise BadRequestException("Email or Phone are required.")
 
-            user = self.__user_repo.get_first_by(where={"email": user_email})
+            user = await self.__user_repo.get_first_by(where={"email": user_email})
             response = supabase_client().auth.sign_in_anonymously(
                 {
                     "options": {
@@ -91,7 +92,7 @@ class AuthService:
             if not authorization or not authorization.startswith("Bearer "):
                 return ResponseHelper.success_data_response(False, 0)
             token = authorization.split("Bearer ")[1]
-            response = supabase_client().auth.get_user(token)
+            response = shared_supabase_client().auth.get_user(token)
             return ResponseHelper.success_data_response(True, 0)
         except Exception as e:
             return ResponseHelper.success_data_response(False, 0)
@@ -115,7 +116,7 @@ class AuthService:
                 "scope": "global",
                 "jwt": user.token,
             })
-            self.__device_repo.upsert({
+            await self.__device_repo.upsert({
                 "is_logged_in": False,
                 "user_id": user.id,
                 "device_id": device_id,
@@ -128,14 +129,14 @@ class AuthService:
 
     async def delete_account(self, user: UserModel) -> Response[None]:
         try:
-            supabase_client().auth.admin.delete_user(id=user.id)
+            shared_supabase_client().auth.admin.delete_user(id=user.id)
             return ResponseHelper.success_response()
         except Exception as e:
             raise CustomException(code=400, name="Delete Account Failed", details=str(e))
 
     async def get_user_info(self, user: UserModel):
         try:
-            response = supabase_client().auth.get_user(user.token)
+            response = shared_supabase_client().auth.get_user(user.token)
             user_wallet = await self.create_wallet_if_not_exists(user.id)
             return ResponseHelper.success_data_response(
                 DtoMapper.to_auth_response(supabase_response=response, user_wallet=user_wallet), 0)
@@ -145,7 +146,7 @@ class AuthService:
 
     async def update_user_info(self, user: UserModel, update_request: UpdateUserInfoRequest):
         try:
-            response = supabase_client().auth.admin.update_user_by_id(user.id, {
+            response = shared_supabase_client().auth.admin.update_user_by_id(user.id, {
                 'user_metadata': {
                     'display_email': update_request.email,
                     'first_name': update_request.first_name,
@@ -173,14 +174,14 @@ class AuthService:
             logger.error(f"exception on refresh token: {e}")
             raise CustomException(code=401, name="Refresh Token Failed", details=str(e))
 
-    def __generate_referral_code(self):
+    async def __generate_referral_code(self):
         code = uuid.uuid4().hex[:8].upper()
-        while self.__user_repo.get_first_by(where={}, filters={"metadata ->> 'referral_code' ": code}) is not None:
+        while await self.__user_repo.exists(where={}, filters={"metadata ->> 'referral_code' ": code}):
             code = uuid.uuid4().hex[:8].upper()
         return code
 
     async def __handle_email_login(self, login_request: LoginRequest) -> Response[None]:
-        user_exists: UserModel = self.__user_repo.get_first_by(
+        user_exists: UserModel = await self.__user_repo.get_first_by(
             where={"email": login_request.email})
         if login_request.email == "test.apple@example.com":
             if not user_exists:
@@ -190,7 +191,7 @@ class AuthService:
                 })
             return ResponseHelper.success_response()
 
-        referral_code = self.__generate_referral_code()
+        referral_code = await self.__generate_referral_code()
         logger.info(f"login request received: {login_request}")
         # if user exists do normal login
         if user_exists:
@@ -198,10 +199,10 @@ class AuthService:
             return ResponseHelper.success_response()
         else:
             # if user does not exist we check for previous anonymous user and update it
-            user = self.__user_repo.get_first_by(where={"email": login_request.email}, filters={
+            user = await self.__user_repo.get_first_by(where={"email": login_request.email}, filters={
                 "metadata->>email": login_request.email})  # db_anonymous_user(login_request.email)
             if user:
-                supabase_client().auth.admin.update_user_by_id(uid=user["id"], attributes={
+                shared_supabase_client().auth.admin.update_user_by_id(uid=user["id"], attributes={
                     "email": login_request.email,
                 })
             authenticate(email=str(login_request.email), referral_code=referral_code)
@@ -209,11 +210,11 @@ class AuthService:
 
     async def __handle_phone_login(self, login_request: LoginRequest) -> Response[None]:
         user_email = f"{login_request.phone}_esim@gmail.com"
-        user_exists: UserModel = self.__user_repo.get_first_by(where={"email": user_email})
+        user_exists: UserModel = await self.__user_repo.get_first_by(where={"email": user_email})
         otp = generate_otp()
         if user_exists:
             logger.info(f"generating new otp for user: {user_email}")
-            supabase_client().auth.admin.update_user_by_id(uid=user_exists.id, attributes={
+            shared_supabase_client().auth.admin.update_user_by_id(uid=user_exists.id, attributes={
                 'user_metadata': {
                     "otp": otp,
                 }
@@ -253,7 +254,7 @@ class AuthService:
         )
         # update device to be logged in
 
-        self.__device_repo.upsert({
+        await self.__device_repo.upsert({
             "is_logged_in": True,
             "user_id": response.user.id,
             "device_id": device_id,
@@ -267,7 +268,7 @@ class AuthService:
         AuthResponseDTO]:
         logger.info(f"verify_otp phone request received: {verify_otp_request}")
         user_email = f"{verify_otp_request.phone}_esim@gmail.com"
-        user = self.__user_repo.get_first_by(where={"email": user_email})
+        user = await self.__user_repo.get_first_by(where={"email": user_email})
         if not user:
             raise BadRequestException(f"user {verify_otp_request.phone} not found")
         otp = user.metadata.get("otp", None)
@@ -278,7 +279,7 @@ class AuthService:
             "password": f"static_password_{verify_otp_request.phone}",
         })
 
-        self.__device_repo.upsert({
+        await self.__device_repo.upsert({
             "is_logged_in": True,
             "user_id": response.user.id,
             "device_id": device_id,
@@ -1,6 +1,5 @@
 import asyncio
 import os
-from collections import defaultdict
 from datetime import datetime
 from typing import List
 
@@ -15,13 +14,14 @@ from app.config.push_notification_manager import fcm_service
 from app.exceptions import BadRequestException
 from app.models.user import UserOrderModel, UsersCopyModel, UserProfileModel, UserModel
 from app.repo import UserRepo, UserOrderRepo, UserProfileRepo, UserProfileBundleRepo
+from app.repo.async_repo import AsyncRepository
 from app.repo.bundle_repo import BundleRepo
-from app.repo.bundle_tage_repo import BundleTagRepo
 from app.repo.tag_repo import TagRepo
-from app.schemas.dto_mapper import DtoMapper
 from app.schemas.home import BundleDTO, RegionDTO, CountryDTO
 from app.schemas.response import Response, ResponseHelper
+from app.services.catalog_service import catalog_service
 from app.services.currency_service import CurrencyService
+from app.services.pricing_service import pricing_service
 from app.services.grouping_service import GroupingService
 
 
@@ -30,94 +30,58 @@ class BundleService:
     def __init__(self):
         self.__esim_hub_service = esim_hub_service_instance()
         self.__grouping_service = GroupingService()
-        self.__bundle_repo = BundleRepo()
-        self.__tag_repo = TagRepo()
-        self.__bundle_tag_repo = BundleTagRepo()
+        self.__bundle_repo = AsyncRepository(BundleRepo())
+        self.__tag_repo = AsyncRepository(TagRepo())
         self.__currency_service = CurrencyService()
-        self.__user_repo = UserRepo()
-        self.__user_order_repo = UserOrderRepo()
-        self.__user_profile_repo = UserProfileRepo()
-        self.__user_profile_bundle_repo = UserProfileBundleRepo()
+        self.__user_repo = AsyncRepository(UserRepo())
+        self.__user_order_repo = AsyncRepository(UserOrderRepo())
+        self.__user_profile_repo = AsyncRepository(UserProfileRepo())
+        self.__user_profile_bundle_repo = AsyncRepository(UserProfileBundleRepo())
 
     async def get_bundle(self, bundle_id: str, currency_name: str, locale: str = "en") -> Response[BundleDTO]:
         # bundle = await self.__esim_hub_service.get_bundle_by_id(bundle_id)
         # todo check if currency needed to be checked
-        bundle = self.__bundle_repo.get_bundle_by_id(bundle_id=bundle_id)
+        snapshot = catalog_service.get_snapshot()
+        bundle_model = snapshot.get_bundle(bundle_id)
+        if bundle_model and bundle_model.data:
+            bundle = BundleDTO.model_validate(bundle_model.data)
+        else:
+            bundle = await self.__bundle_repo.get_bundle_by_id(bundle_id=bundle_id)
         rate = self.__currency_service.get_rate_by_currency(currency_name)
+        prices = pricing_service.get_column(snapshot, currency_name=currency_name, rate=rate)
 
-        tags_id = [bundle_country.id for bundle_country in bundle.countries]
-        country_tags = self.__tag_repo.select_procedure(function_name="get_translated_tag_by_tag_id_list",
-                                                        where={"tag_ids": tags_id,
-                                                               "locale_param": locale})
-        for country_tag in country_tags:
-            country_tag.data["country"] = country_tag.name
-        countries = [CountryDTO(**tag.data) for tag in country_tags]
-        bundle.countries = countries
+        snapshot.localize_bundles([bundle], locale=locale)
 
-        return ResponseHelper.success_data_response(DtoMapper.bundle_currency_update(bundle, currency_name, rate), 1)
+        return ResponseHelper.success_data_response(prices.apply(bundle, bundle_id), 1)
 
     async def get_regions(self, locale: str) -> Response[List[RegionDTO]]:
         # regions = await self.__esim_hub_service.get_regions()
         regions = await self.__grouping_service.get_all_regions(locale=locale)
         return ResponseHelper.success_data_response(regions, len(regions))
 
-    async def get_bundles_by_country(self, country_codes: str, currency_name: str, locale: str) -> Response[
-        List[BundleDTO]]:
+    async def get_bundles_by_country(self, country_codes: str, currency_name: str, locale: str) -> bytes:
         if country_codes is None or len(country_codes) == 0:
             raise BadRequestException("country_codes cannot be empty")
 
-        first_tag = self.__tag_repo.get_by_id(country_codes.split(",")[0])
-        country = CountryDTO.model_validate(first_tag.data)
-
-        tags = self.__tag_repo.list_in(where={}, filter={"id": [item for item in country_codes.split(',')]})
+        snapshot = catalog_service.get_snapshot()
+        first_tag = snapshot.get_tag(country_codes.split(",")[0])
+        tags = [tag for tag in (snapshot.get_tag(item) for item in country_codes.split(',')) if tag]
 
-        if not tags:
+        if not tags or not first_tag:
             raise BadRequestException("country_codes not found")
 
-        # bundle_tags = self.__bundle_tag_repo.list_in(where={},filter = {"tag_id" : [item.id for item in tags] })
-
-        results = self.__bundle_tag_repo.table \
-            .select("bundle_id, tag_id") \
-            .filter("tag_id", "in", f"({','.join([item.id for item in tags])})") \
-            .execute()
-
-        bundle_map = defaultdict(set)
-        for row in results.data:
-            bundle_map[row["bundle_id"]].add(row["tag_id"])
-
-        target_tag_set = set([item.id for item in tags])
-        matching_bundle_ids = [
-            bundle_id for bundle_id, tags in bundle_map.items()
-            if tags >= target_tag_set
-        ]
-        is_active = True
-        bundles_model = self.__bundle_repo.list_in(where={"is_active": is_active}, filter={"id": matching_bundle_ids},
-                                                   order_by="data->price")
-
-        bundles: List[BundleDTO] = []
+        country = CountryDTO.model_validate(first_tag.data)
 
         rate = self.__currency_service.get_rate_by_currency(currency_name)
+        prices = pricing_service.get_column(snapshot, currency_name=currency_name, rate=rate)
+
+        offers = prices.get_best_offers(snapshot, tag_ids=[item.id for item in tags])
+        bundles = prices.render_bundles(snapshot, offers, locale=locale, icon=country.icon)
 
-        for bundle in bundles_model:
-            if bundle and bundle.data:
-                bundle_dto = BundleDTO(**bundle.data)
-                bundle_dto.icon = country.icon
-                tags_id = [bundle_country.id for bundle_country in bundle_dto.countries]
-                country_tags = self.__tag_repo.select_procedure(function_name="get_translated_tag_by_tag_id_list",
-                                                                where={"tag_ids": tags_id,
-                                                                       "locale_param": locale})
-                for country_tag in country_tags:
-                    country_tag.data["country"] = country_tag.name
-                countries = [CountryDTO(**tag.data) for tag in country_tags]
-                bundle_dto.countries = countries
-
-                bundles.append(DtoMapper.bundle_currency_update(bundle_dto, currency_name, rate))
-
-        filtered_bundles = self.__filter_by_gprs_limit(bundles)
         # bundles = await self.__esim_hub_service.get_bundles_by_country(country_codes.split(","))
-        return ResponseHelper.success_data_response(filtered_bundles, len(filtered_bundles))
+        return ResponseHelper.success_json_list_response(bundles, len(bundles))
 
-    async def get_bundles_by_region(self, region_code: str, currency: str, locale: str) -> Response[List[BundleDTO]]:
+    async def get_bundles_by_region(self, region_code: str, currency: str, locale: str) -> bytes:
         # regions = await self.__esim_hub_service.get_regions()
         regions = await self.__grouping_service.get_all_regions(locale)
 
@@ -130,40 +94,16 @@ class BundleService:
         # bundles = await self.__esim_hub_service.get_bundles_by_zone(zone=searched_regions[0].guid,
         #                                                             currency_code=currency)
 
-        bundle_tags = self.__bundle_tag_repo.list(where={"tag_id": searched_regions[0].guid})
-        print(bundle_tags)
-
-        is_active = True
-        bundles_model = self.__bundle_repo.list_in(where={"is_active": is_active},
-                                                   filter={"id": [item.bundle_id for item in bundle_tags]},
-                                                   order_by="data->price")
-
-        bundles: List[BundleDTO] = []
+        snapshot = catalog_service.get_snapshot()
 
         rate = self.__currency_service.get_rate_by_currency(currency)
+        prices = pricing_service.get_column(snapshot, currency_name=currency, rate=rate)
+
+        # regional offers only, bundles covering a single country are listed under that country
+        offers = prices.get_best_offers(snapshot, tag_ids=[searched_regions[0].guid], min_countries=2)
+        bundles = prices.render_bundles(snapshot, offers, locale=locale, icon=searched_regions[0].icon)
 
-        for bundle in bundles_model:
-            if bundle and bundle.data:
-                bundle_dto = BundleDTO(**bundle.data)
-                bundle_dto.icon = searched_regions[0].icon
-                tags_id = [bundle_country.id for bundle_country in bundle_dto.countries]
-                country_tags = self.__tag_repo.select_procedure(function_name="get_translated_tag_by_tag_id_list",
-                                                                where={"tag_ids": tags_id,
-                                                                       "locale_param": locale})
-                for country_tag in country_tags:
-                    country_tag.data["country"] = country_tag.name
-                countries = [tag.data for tag in country_tags]
-                bundle_dto.countries = countries
-
-                bundles.append(DtoMapper.bundle_currency_update(bundle_dto, currency, rate))
-
-        filtered_bundles = []
-        for bundle in bundles:
-            if len(bundle.countries) > 1:
-                filtered_bundles.append(bundle)
-
-        filtered = self.__filter_by_gprs_limit(filtered_bundles)
-        return ResponseHelper.success_data_response(filtered, len(filtered))
+        return ResponseHelper.success_json_list_response(bundles, len(bundles))
 
     async def get_countries(self, locale: str):
         countries = await self.__grouping_service.get_all_countries(locale)
@@ -180,13 +120,13 @@ class BundleService:
         user_order.order_status = OrderStatusEnum.SUCCESS
         if esim_hub_order is None:
             user_order.order_status = OrderStatusEnum.FAILURE
-            self.__user_order_repo.update_by({"id": user_order.id}, data=user_order.model_dump(exclude={"id"}))
+            await self.__user_order_repo.update_by({"id": user_order.id}, data=user_order.model_dump(exclude={"id"}))
             logger.info(f"error creating esim hub profile for order {user_order.id}")
             return BadRequestException("Payment failed")
         else:
             user_order.esim_order_id = esim_hub_order.orderId
-        self.__user_order_repo.update_by({"id": user_order.id}, data=user_order.model_dump(exclude={"id"}))
-        user_profile = self.__user_profile_repo.create({
+        await self.__user_order_repo.update_by({"id": user_order.id}, data=user_order.model_dump(exclude={"id"}))
+        user_profile = await self.__user_profile_repo.create({
             "user_id": user_id,
             "user_order_id": user_order.id,
             "shared_user_id": None,
@@ -199,7 +139,7 @@ class BundleService:
             "esim_hub_order_id": esim_hub_order.orderId,
             "searched_countries": user_order.searched_countries,
         })
-        self.__user_profile_bundle_repo.create({
+        await self.__user_profile_bundle_repo.create({
             "user_id": user_order.user_id,
             "user_order_id": user_order.id,
             "user_profile_id": user_profile.id,
@@ -212,7 +152,7 @@ class BundleService:
         })
         await self.__send_buy_notification(bundle_name=bundle.bundle_name, iccid=esim_hub_order.iccid,
                                            user_id=user_order.user_id)
-        user = self.__user_repo.get_by_id(record_id=user_order.user_id)
+        user = await self.__user_repo.get_by_id(record_id=user_order.user_id)
         asyncio.create_task(
             self.__send_email(
                 user=user,
@@ -227,7 +167,7 @@ class BundleService:
                             payment_status: str, user: UserModel = None):
         msisdn = user.msisdn if user else ""
         order_id = f"{msisdn}|{user_order.id}"
-        user_profile = self.__user_profile_repo.get_first_by({"user_id": user_id, "iccid": iccid})
+        user_profile = await self.__user_profile_repo.get_first_by({"user_id": user_id, "iccid": iccid})
         try:
             esim_hub_topup = await self.__esim_hub_service.create_reseller_topup(
                 esim_hub_order_id=user_profile.esim_hub_order_id,
@@ -237,7 +177,7 @@ class BundleService:
             esim_hub_topup = None
             logger.error(f"error while topping up bundle {str(e)}")
         if not esim_hub_topup:
-            self.__user_order_repo.update_by({"id": user_order.id}, {
+            await self.__user_order_repo.update_by({"id": user_order.id}, {
                 "order_status": OrderStatusEnum.FAILURE,
                 "payment_status": payment_status,
                 "callback_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
@@ -245,13 +185,13 @@ class BundleService:
             })
             logger.error(f"error while topping up bundle {user_order.id}")
             return BadRequestException("Payment failed")
-        self.__user_order_repo.update_by({"id": user_order.id}, {
+        await self.__user_order_repo.update_by({"id": user_order.id}, {
             "order_status": OrderStatusEnum.SUCCESS,
             "payment_status": payment_status,
             "callback_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "esim_order_id": None
         })
-        self.__user_profile_bundle_repo.create({
+        await self.__user_profile_bundle_repo.create({
             "user_id": user_order.user_id,
             "user_order_id": user_order.id,
             "user_profile_id": user_profile.id,
@@ -295,23 +235,8 @@ class BundleService:
 
     async def __send_buy_notification(self, bundle_name, iccid, user_id):
         notification_message = send_buy_bundle_notification(bundle_name=bundle_name, iccid=iccid)
-        fcm_service.send_notification_to_user_from_template(notification_message, user_id=user_id)
+        await fcm_service.send_notification_to_user_from_template(notification_message, user_id=user_id)
 
     async def __send_topup_notification(self, bundle_name, iccid, user_id):
         notification_message = send_buy_topup_notification(bundle_name=bundle_name, iccid=iccid)
-        fcm_service.send_notification_to_user_from_template(notification_message, user_id=user_id)
-
-    def __filter_by_gprs_limit(self, bundles: List[BundleDTO]) -> List[BundleDTO]:
-        filtered_bundles_dict = {}
-
-        for bundle in bundles:
-            gprs_limit = bundle.gprs_limit_display
-            price = bundle.price
-            validity = bundle.validity
-            key = f"{gprs_limit}_{validity}"
-
-            if key not in filtered_bundles_dict or price < filtered_bundles_dict[key].price:
-                filtered_bundles_dict[key] = bundle
-        items = list(filtered_bundles_dict.values())
-        sorted(items, key=lambda item: item.price, reverse=False)
-        return items
+        await fcm_service.send_notification_to_user_from_template(notification_message, user_id=user_id)
@@ -1,4 +1,6 @@
+import hmac
 import json
+import math
 import os
 import threading
 from datetime import datetime
@@ -17,11 +19,14 @@ from app.config.notification_types import send_consumption_80_bundle_notificatio
 from app.config.push_notification_manager import fcm_service
 from app.models.user import OrderStatusEnum, UserOrderType, UsersCopyModel
 from app.repo import UserOrderRepo, UserProfileRepo, UserProfileBundleRepo, UserRepo
+from app.repo.async_repo import AsyncRepository
 from app.schemas.callback import ConsumptionLimitRequest
 from app.schemas.dto_mapper import DtoMapper
 from app.schemas.home import BundleDTO
 from app.schemas.response import ResponseHelper
 from app.services.bundle_service import BundleService
+from app.services.currency_service import CurrencyService
+from app.services.integration.http_pool import run_with_pooled_clients
 from app.services.promotion_service import PromotionService
 from app.services.sync_service import SyncService
 from app.services.user_wallet_service import UserWalletService
@@ -31,13 +36,14 @@ class CallbackService:
 
     def __init__(self):
         self.__esim_hub_service = esim_hub_service_instance()
-        self.__user_repo = UserRepo()
-        self.__user_order_repo = UserOrderRepo()
-        self.__user_profile_repo = UserProfileRepo()
-        self.__user_profile_bundle_repo = UserProfileBundleRepo()
+        self.__user_repo = AsyncRepository(UserRepo())
+        self.__user_order_repo = AsyncRepository(UserOrderRepo())
+        self.__user_profile_repo = AsyncRepository(UserProfileRepo())
+        self.__user_profile_bundle_repo = AsyncRepository(UserProfileBundleRepo())
         self.__sync_service = SyncService()
         self.__user_wallet_service = UserWalletService()
         self.__promotion_service = PromotionService()
+        self.__currency_service = CurrencyService()
         self.__bundle_service = BundleService()
 
     async def handle_plan_event_callback(self, callback_request: Request):
@@ -49,8 +55,8 @@ class CallbackService:
             iccid = request.iccid
 
             # Get user profile information
-            orders = self.__user_profile_repo.select(tables={DatabaseTables.TABLE_USER_PROFILE_BUNDLE: "*"},
-                                                     where={"esim_hub_order_id": request.order_id, "iccid": iccid})
+            orders = await self.__user_profile_repo.select(tables={DatabaseTables.TABLE_USER_PROFILE_BUNDLE: "*"},
+                                                           where={"esim_hub_order_id": request.order_id, "iccid": iccid})
 
             if len(orders) == 0:
                 logger.warning(f"No user profile found for esim_hub_order_id {request.order_id} and iccid {iccid}")
@@ -63,7 +69,7 @@ class CallbackService:
             primary_user_id = order_info.user_id
             if primary_user_id:
                 primary_user_metadata = {}
-                primary_user = self.__user_repo.get_by_id(
+                primary_user = await self.__user_repo.get_by_id(
                     record_id=primary_user_id)  # get_user(primary_user_id)
                 if primary_user:
                     primary_user_metadata = primary_user.metadata
@@ -73,7 +79,7 @@ class CallbackService:
             shared_user_id = order_info.shared_user_id
             if shared_user_id:
                 shared_user_metadata = {}
-                shared_user = self.__user_repo.get_by_id(record_id=shared_user_id)  # get_user(shared_user_id)
+                shared_user = await self.__user_repo.get_by_id(record_id=shared_user_id)  # get_user(shared_user_id)
                 if shared_user:
                     shared_user_metadata = shared_user.metadata
                 model = DtoMapper.to_order_notification_model(order_info, shared_user_id, shared_user_metadata, iccid)
@@ -84,6 +90,7 @@ class CallbackService:
                 return
 
             # Send notification to all associated users
+            notifications = []
             for order in orders:
                 try:
                     # Get bundle info from user profile
@@ -94,7 +101,7 @@ class CallbackService:
                             bundle_name=order.bundle_display_name,
                             iccid=iccid
                         )
-                        user = self.__user_repo.get_by_id(record_id=order.user_id)
+                        user = await self.__user_repo.get_by_id(record_id=order.user_id)
                         await self.__send_email_80_consumption(
                             user=user,
                             bundle_name=order.bundle_display_name,
@@ -106,7 +113,7 @@ class CallbackService:
                             bundle_name=order.bundle_display_name,
                             iccid=iccid
                         )
-                        user = self.__user_repo.get_by_id(record_id=order.user_id)
+                        user = await self.__user_repo.get_by_id(record_id=order.user_id)
                         await self.__send_email_100_consumption(
                             user=user,
                             bundle_name=order.bundle_display_name,
@@ -125,12 +132,13 @@ class CallbackService:
                         logger.warning(f"Unsupported event type for plan status callback: {event_type}")
                         return
 
-                    fcm_service.send_notification_to_user_from_template(
-                        content_template=notification_data,
-                        user_id=order.user_id
-                    )
+                    notifications.append((order.user_id, notification_data))
                 except Exception as e:
                     logger.error(f"Failed to send notification to user {order.user_id}: {str(e)}")
+            try:
+                await fcm_service.send_notifications_to_users_from_templates(notifications)
+            except Exception as e:
+                logger.error(f"Failed to send notifications for ICCID {iccid}: {str(e)}")
 
         except Exception as e:
             logger.error(f"Error in handle_plan_event_callback: {str(e)}")
@@ -165,10 +173,24 @@ class CallbackService:
         return ResponseHelper.success_response()
 
     async def handle_exchange_rate_update(self, request: Request):
+        secret = os.getenv("EXCHANGE_RATE_WEBHOOK_SECRET")
+        # rates feed straight into charged prices, refuse updates when no secret is configured
+        if not secret or not hmac.compare_digest(request.headers.get("X-Webhook-Secret", ""), secret):
+            logger.error("rejected exchange rate update with a missing or wrong webhook secret")
+            raise HTTPException(status_code=401, detail="Invalid webhook secret")
         json_request = await request.json()
-        currency = json_request["currency"]
-        rate = json_request["rate"]
+        try:
+            currency = json_request["currency"]
+            rate = float(json_request["rate"])
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error(f"invalid exchange rate update {json_request}: {e}")
+            raise HTTPException(status_code=400, detail="Invalid payload")
+        if not math.isfinite(rate) or rate <= 0:
+            logger.error(f"invalid exchange rate {rate} for currency: {currency}")
+            raise HTTPException(status_code=400, detail="Invalid rate")
         logger.info(f"updating exchange rate for currency: {currency} with rate: {rate}")
+        self.__currency_service.update_rate(currency_name=currency, rate=rate)
+        return ResponseHelper.success_response()
 
     async def handle_sync_one_bundle(self, request: Request):
         json_data = await request.json()
@@ -194,27 +216,26 @@ class CallbackService:
         return ResponseHelper.success_response()
 
     def __run_one_sync(self, bundle_id: str, operation: str, reseller_id: str = None):
-        import asyncio
         try:
             if operation == "delete":
                 if reseller_id and reseller_id == os.getenv("RESELLER_ID"):
                     logger.info(f"deleting bundle {bundle_id} for reseller {reseller_id}")
-                    asyncio.run(self.__sync_service.delete_bundle(bundle_id=bundle_id))
+                    run_with_pooled_clients(self.__sync_service.delete_bundle(bundle_id=bundle_id))
                 else:
                     logger.info(f"ignoring delete bundle {bundle_id}, no reseller provided")
                     return
             elif operation == "update":
                 logger.info(f"updating bundle {bundle_id} for reseller {reseller_id}")
-                bundle = asyncio.run(
+                bundle = run_with_pooled_clients(
                     self.__esim_hub_service.get_bundle_by_id(bundle_id=bundle_id,
                                                              currency_code=os.getenv("DEFAULT_CURRENCY")))
-                asyncio.run(self.__sync_service.sync_bundle(bundle))
+                run_with_pooled_clients(self.__sync_service.sync_bundle(bundle))
             elif operation == "assign" or operation == "edit_price":
                 if reseller_id and  reseller_id == os.getenv("RESELLER_ID"):
-                    bundle = asyncio.run(
+                    bundle = run_with_pooled_clients(
                         self.__esim_hub_service.get_bundle_by_id(bundle_id=bundle_id,
                                                                  currency_code=os.getenv("DEFAULT_CURRENCY")))
-                    asyncio.run(self.__sync_service.sync_bundle(bundle))
+                    run_with_pooled_clients(self.__sync_service.sync_bundle(bundle))
                 else:
                     logger.info(f"ignoring assign bundle {bundle_id}, no reseller provided")
                     return
@@ -224,17 +245,16 @@ class CallbackService:
                     return
                 if reseller_id == os.getenv("RESELLER_ID"):
                     logger.info(f"unassigning bundle {bundle_id} for reseller {reseller_id}")
-                    asyncio.run(self.__sync_service.delete_bundle(bundle_id))
+                    run_with_pooled_clients(self.__sync_service.delete_bundle(bundle_id))
                 else:
                     logger.info(f"reseller id not matching")
-            asyncio.run(self.__sync_service.update_sync_version())
+            run_with_pooled_clients(self.__sync_service.update_sync_version())
         except Exception as e:
             logger.error(f"error while syncing bundle {id}: {str(e)}")
 
     def __run_full_sync(self, page_index=1):
-        import asyncio
-        asyncio.run(self.__sync_service.sync_bundles(page_index=page_index))
-        asyncio.run(self.__sync_service.update_sync_version())
+        run_with_pooled_clients(self.__sync_service.sync_bundles(page_index=page_index))
+        run_with_pooled_clients(self.__sync_service.update_sync_version())
 
     async def __handle_payment_webhook_data(self, event: dict):
         # Extract payment intent data
@@ -262,21 +282,21 @@ class CallbackService:
         promo_code = metadata.get("promo_code", None)
         rule_id = metadata.get("rule_id", None)
         amount = metadata.get("amount", None)
-        user_order = self.__user_order_repo.get_by_id(order_id)
+        user_order = await self.__user_order_repo.get_by_id(order_id)
         bundle = BundleDTO.model_validate_json(user_order.bundle_data)
-        user = self.__user_repo.get_by_id(user_id)
+        user = await self.__user_repo.get_by_id(user_id)
         payment_status = OrderStatusEnum.SUCCESS if event.get(
             "type") == "payment_intent.succeeded" else OrderStatusEnum.FAILURE
         if payment_status == OrderStatusEnum.FAILURE:
             logger.info(f"payment failed for order {order_id}")
             if promo_code:
-                self.__promotion_service.update_promotion_usage(user_id, promo_code, "failed", rule_id, amount)
+                await self.__promotion_service.update_promotion_usage(user_id, promo_code, "failed", rule_id, amount)
             return HTTPException(status_code=200, detail="Payment Failed")
 
         if payment_status == OrderStatusEnum.SUCCESS and order_type == UserOrderType.ASSIGN:
             await self.__promotion_service.check_referral_rewards_after_buy_bundle(user_id)
             if promo_code:
-                self.__promotion_service.update_promotion_usage(user_id, promo_code, "completed", rule_id, amount)
+                await self.__promotion_service.update_promotion_usage(user_id, promo_code, "completed", rule_id, amount)
             return await self.__bundle_service.buy_bundle(user_order=user_order, bundle=bundle,
                                                           payment_status=payment_status,
                                                           user_id=user_id, user=user)
@@ -342,26 +362,26 @@ class CallbackService:
         user_wallet_id = metadata.get("user_wallet_id")
         user_id = metadata.get("user_id")
         order_id = metadata.get("order_id")
-        order = self.__user_order_repo.get_by_id(order_id)
+        order = await self.__user_order_repo.get_by_id(order_id)
         user_wallet = self.__user_wallet_service.get_user_wallet_by_id(user_wallet_id)
         try:
             if event_type == "payment_intent.succeeded":
                 amount = (order.amount / 100)
                 logger.info(f"updating user wallet: {user_wallet} with new {amount=}")
                 await self.__user_wallet_service.add_wallet_transaction(amount, user_id)
-                self.__user_order_repo.update(order_id, {"payment_status": OrderStatusEnum.SUCCESS})
+                await self.__user_order_repo.update(order_id, {"payment_status": OrderStatusEnum.SUCCESS})
                 logger.info(
                     f"Top-Up for user {user_id} wallet {user_wallet} with amount {amount} {order.currency} succeeded")
                 return ResponseHelper.success_response()
             else:
-                self.__user_order_repo.update(order_id, {"payment_status": OrderStatusEnum.FAILURE})
+                await self.__user_order_repo.update(order_id, {"payment_status": OrderStatusEnum.FAILURE})
                 logger.info(
                     f"Payment Failed for Wallet Top-Up for user {user_id} with amount {order.amount} {order.currency}")
                 content = send_wallet_top_up_failed_notification()
-                fcm_service.send_notification_to_user_from_template(content, user_id=user_id)
+                await fcm_service.send_notification_to_user_from_template(content, user_id=user_id)
                 return ResponseHelper.success_response()
         except Exception as e:
             logger.error(f"error while updating user wallet {str(e)}")
             content = send_wallet_top_up_failed_notification()
-            fcm_service.send_notification_to_user_from_template(content, user_id=user_id)
+            await fcm_service.send_notification_to_user_from_template(content, user_id=user_id)
             return ResponseHelper.success_response()
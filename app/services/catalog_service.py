@@ -0,0 +1,244 @@
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from loguru import logger
+
+from app.config.db import ConfigKeysEnum
+from app.exceptions import DatabaseException
+from app.models.app import BundleModel, TagModel, BundleTagModel, TagTranslationModel
+from app.repo.bundle_repo import BundleRepo
+from app.repo.bundle_tage_repo import BundleTagRepo
+from app.repo.config_repo import ConfigRepo
+from app.repo.tag_repo import TagRepo, TagTranslationRepo
+from app.schemas.home import BundleDTO, CountryDTO
+
+CATALOG_PAGE_SIZE = 1000
+DEFAULT_LOCALE = "en"
+
+
+class CatalogSnapshot:
+    """
+    Immutable in-memory view of the bundle catalog (bundles, tags, bundle<->tag edges and
+    per-locale tag names) for a single APP_CACHE_KEY version.
+    """
+
+    def __init__(self, version: str, bundles: List[BundleModel], tags: List[TagModel],
+                 bundle_tags: List[BundleTagModel], translations: List[TagTranslationModel]):
+        self.version = version
+        self.bundles: Dict[str, BundleModel] = {bundle.id: bundle for bundle in bundles}
+        self.tags: Dict[str, TagModel] = {tag.id: tag for tag in tags}
+
+        self.tags_by_group: Dict[int, List[TagModel]] = {}
+        for tag in tags:
+            self.tags_by_group.setdefault(tag.tag_group_id, []).append(tag)
+
+        self.tag_bundles: Dict[str, List[str]] = {}
+        self.bundle_tags: Dict[str, Set[str]] = {}
+        for edge in bundle_tags:
+            bundle_tag_ids = self.bundle_tags.setdefault(edge.bundle_id, set())
+            if edge.tag_id in bundle_tag_ids:
+                continue
+            bundle_tag_ids.add(edge.tag_id)
+            self.tag_bundles.setdefault(edge.tag_id, []).append(edge.bundle_id)
+
+        self.tag_names: Dict[str, Dict[str, str]] = {}
+        for translation in translations:
+            self.tag_names.setdefault(translation.locale, {})[translation.tag_id] = translation.name
+        self.__locales: Dict[str, str] = {locale.lower(): locale for locale in self.tag_names}
+        # locale -> tag id -> CountryDTO, filled on first use so new locales cost nothing up front
+        self.__localized_countries: Dict[str, Dict[str, CountryDTO]] = {}
+
+        # inverted index: bit i of a tag bitset is set when the i-th cheapest active bundle carries the tag,
+        # so matching several tags is an AND of ints and the set bits come out already price ordered
+        self.__price_ordered_bundles: List[BundleModel] = sorted(
+            [bundle for bundle in bundles if bundle.is_active],
+            key=lambda bundle: (self.__price_key(bundle), bundle.id))
+        positions = {bundle.id: position for position, bundle in enumerate(self.__price_ordered_bundles)}
+        self.__tag_bitsets: Dict[str, int] = {}
+        for tag_id, bundle_ids in self.tag_bundles.items():
+            bitset = 0
+            for bundle_id in bundle_ids:
+                if bundle_id in positions:
+                    bitset |= 1 << positions[bundle_id]
+            self.__tag_bitsets[tag_id] = bitset
+
+    def get_bundle(self, bundle_id: str) -> Optional[BundleModel]:
+        return self.bundles.get(bundle_id)
+
+    def get_tag(self, tag_id: str) -> Optional[TagModel]:
+        return self.tags.get(tag_id)
+
+    def get_bundles_by_tags(self, tag_ids: List[str]) -> List[BundleModel]:
+        """
+        Returns the active bundles linked to every tag in tag_ids, ordered by price.
+        """
+        if not tag_ids:
+            return []
+        bitset = self.__tag_bitsets.get(tag_ids[0], 0)
+        for tag_id in tag_ids[1:]:
+            bitset &= self.__tag_bitsets.get(tag_id, 0)
+        bundles = []
+        while bitset:
+            lowest = bitset & -bitset
+            bundles.append(self.__price_ordered_bundles[lowest.bit_length() - 1])
+            bitset ^= lowest
+        return bundles
+
+    def get_tags_by_group(self, group_id: int) -> List[TagModel]:
+        return list(self.tags_by_group.get(group_id, []))
+
+    def resolve_locale(self, locale: Optional[str]) -> str:
+        """
+        Maps an Accept-Language value (e.g. "ar-LB,ar;q=0.9") to the first locale the catalog has
+        translations for, falling back to DEFAULT_LOCALE, so raw headers never become cache keys.
+        """
+        for candidate in (locale or "").split(","):
+            language = candidate.split(";")[0].strip().lower()
+            for key in (language, language.split("-")[0]):
+                if key in self.__locales:
+                    return self.__locales[key]
+        return DEFAULT_LOCALE
+
+    def get_translated_tags(self, tag_ids: List[str], locale: str) -> List[TagModel]:
+        # mirrors the get_translated_tag_by_tag_id_list rpc, returning copies since callers mutate tag.data
+        locale = self.resolve_locale(locale)
+        tags = [self.tags[tag_id] for tag_id in tag_ids if tag_id in self.tags]
+        return [self.__translate(tag, locale) for tag in tags]
+
+    def get_translated_tags_by_group(self, group_id: int, locale: str) -> List[TagModel]:
+        locale = self.resolve_locale(locale)
+        return [self.__translate(tag, locale) for tag in self.tags_by_group.get(group_id, [])]
+
+    def get_localized_countries(self, tag_ids: Iterable[str], locale: str) -> Dict[str, CountryDTO]:
+        locale = self.resolve_locale(locale)
+        countries = self.__localized_countries.setdefault(locale, {})
+        missing = [tag_id for tag_id in set(tag_ids) if tag_id not in countries]
+        for tag in self.get_translated_tags(missing, locale):
+            tag.data["country"] = tag.name
+            countries[tag.id] = CountryDTO.model_validate(tag.data)
+        return countries
+
+    def localize_bundles(self, bundles: List[BundleDTO], locale: str) -> List[BundleDTO]:
+        """
+        Replaces the countries of every bundle with their localized version, resolving the
+        country tags of the whole result set in one lookup.
+        """
+        tag_ids = {country.id for bundle in bundles for country in bundle.countries}
+        countries = self.get_localized_countries(tag_ids, locale)
+        for bundle in bundles:
+            bundle.countries = [countries[country.id] for country in bundle.countries if country.id in countries]
+        return bundles
+
+    def __translate(self, tag: TagModel, locale: str) -> TagModel:
+        name = self.tag_names.get(locale, {}).get(tag.id, tag.name)
+        return tag.model_copy(update={"name": name, "data": dict(tag.data or {})})
+
+    @staticmethod
+    def __price_key(bundle: BundleModel) -> float:
+        return float((bundle.data or {}).get("price") or 0)
+
+
+class CatalogService:
+    """
+    Holds the current CatalogSnapshot and rebuilds it when APP_CACHE_KEY rotates. The version is
+    re-checked at most every CATALOG_VERSION_CHECK_SECONDS on a background thread, so readers on the
+    event loop never wait on the database once the first snapshot is loaded; the previous snapshot is
+    served while a rebuild runs and after a failed one.
+    """
+
+    def __init__(self):
+        self.__bundle_repo = BundleRepo()
+        self.__tag_repo = TagRepo()
+        self.__bundle_tag_repo = BundleTagRepo()
+        self.__tag_translation_repo = TagTranslationRepo()
+        # APP_CACHE_KEY is already re-checked on its own interval
+        self.__config_repo = ConfigRepo(cache_ttl=0)
+        self.__snapshot: Optional[CatalogSnapshot] = None
+        self.__checked_at: Optional[float] = None
+        self.__refreshing = False
+        self.__lock = threading.Lock()
+        self.__refreshing_lock = threading.Lock()
+
+    def get_snapshot(self) -> CatalogSnapshot:
+        snapshot = self.__snapshot
+        if snapshot is None:
+            # only blocks until the first snapshot is loaded, startup warms it up
+            return self.__refresh(force=False)
+        if self.__is_check_due():
+            self.__refresh_in_background()
+        return snapshot
+
+    def refresh(self) -> CatalogSnapshot:
+        return self.__refresh(force=True)
+
+    def invalidate(self):
+        self.__checked_at = None
+
+    def __refresh_in_background(self):
+        with self.__refreshing_lock:
+            if self.__refreshing:
+                return
+            self.__refreshing = True
+        threading.Thread(target=self.__refresh_and_release, daemon=True).start()
+
+    def __refresh_and_release(self):
+        try:
+            self.__refresh(force=False)
+        except Exception as e:
+            logger.error(f"error while refreshing catalog snapshot: {e}")
+        finally:
+            with self.__refreshing_lock:
+                self.__refreshing = False
+
+    def __refresh(self, force: bool) -> CatalogSnapshot:
+        with self.__lock:
+            snapshot = self.__snapshot
+            if not force and snapshot is not None and not self.__is_check_due():
+                return snapshot
+            try:
+                version = self.__get_version()
+                if force or snapshot is None or snapshot.version != version:
+                    started = time.monotonic()
+                    snapshot = self.__build(version)
+                    self.__snapshot = snapshot
+                    logger.info(f"catalog snapshot {version} loaded: {len(snapshot.bundles)} bundles, "
+                                f"{len(snapshot.tags)} tags in {time.monotonic() - started:.2f}s")
+            except Exception as e:
+                if snapshot is None:
+                    raise DatabaseException(f"catalog snapshot unavailable: {e}")
+                logger.error(f"error while refreshing catalog snapshot, serving version {snapshot.version}: {e}")
+            self.__checked_at = time.monotonic()
+            return snapshot
+
+    def __is_check_due(self) -> bool:
+        if self.__checked_at is None:
+            return True
+        interval = int(os.getenv("CATALOG_VERSION_CHECK_SECONDS", 30))
+        return time.monotonic() - self.__checked_at >= interval
+
+    def __get_version(self) -> str:
+        config = self.__config_repo.get_first_by({"key": ConfigKeysEnum.APP_CACHE_KEY})
+        return config.value if config else ""
+
+    def __build(self, version: str) -> CatalogSnapshot:
+        return CatalogSnapshot(version=version,
+                               bundles=self.__list_all(self.__bundle_repo),
+                               tags=self.__list_all(self.__tag_repo),
+                               bundle_tags=self.__list_all(self.__bundle_tag_repo, columns="bundle_id,tag_id"),
+                               translations=self.__list_all(self.__tag_translation_repo))
+
+    @staticmethod
+    def __list_all(repo, columns: str = "*") -> list:
+        rows = []
+        offset = 0
+        while True:
+            page = repo.list(where={}, limit=CATALOG_PAGE_SIZE, offset=offset, order_by="id", columns=columns)
+            rows.extend(page)
+            if len(page) < CATALOG_PAGE_SIZE:
+                return rows
+            offset += CATALOG_PAGE_SIZE
+
+
+catalog_service: CatalogService = CatalogService()
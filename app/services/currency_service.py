@@ -1,5 +1,9 @@
 import os
-from typing import List
+import threading
+import time
+from typing import Dict, List, Optional
+
+from loguru import logger
 
 from app.repo.currency_repo import CurrencyRepo
 from app.schemas.dto_mapper import DtoMapper
@@ -7,21 +11,104 @@ from app.schemas.home import CurrencyDto
 from app.schemas.response import ResponseHelper, Response
 
 
+class ExchangeRateTable:
+    """
+    Process-wide currency -> rate table against SYSTEM_CURRENCY. Loaded from the currency table on
+    first use, updated in place by the exchange rate scheduler and webhook, and read without I/O.
+    Updates made by other workers are picked up by reloading the table in the background once it is
+    older than EXCHANGE_RATE_TABLE_TTL_SECONDS.
+    """
+
+    def __init__(self):
+        # reloads must see other workers' updates, not this worker's table cache
+        self.__currency_repo = CurrencyRepo(cache_ttl=0)
+        self.__rates: Optional[Dict[str, float]] = None
+        self.__loaded_at = 0.0
+        self.__reloading = False
+        self.__lock = threading.Lock()
+
+    def get_rate(self, currency_name: str) -> Optional[float]:
+        return self.get_rates().get(currency_name)
+
+    def get_rates(self) -> Dict[str, float]:
+        rates = self.__rates
+        if rates is None:
+            return self.load()
+        if time.monotonic() - self.__loaded_at > float(os.getenv("EXCHANGE_RATE_TABLE_TTL_SECONDS", 60)):
+            self.__reload_in_background()
+        return rates
+
+    def load(self) -> Dict[str, float]:
+        currencies = self.__currency_repo.list(where={"default_currency": os.getenv("SYSTEM_CURRENCY", "USD")})
+        rates = {currency.name: currency.rate for currency in currencies if currency.rate is not None}
+        with self.__lock:
+            self.__rates = rates
+            self.__loaded_at = time.monotonic()
+        logger.info(f"exchange rate table loaded: {len(rates)} currencies")
+        return rates
+
+    def __reload_in_background(self):
+        with self.__lock:
+            if self.__reloading:
+                return
+            self.__reloading = True
+        # readers keep the current table while the reload runs
+        threading.Thread(target=self.__reload, daemon=True).start()
+
+    def __reload(self):
+        try:
+            self.load()
+        except Exception as e:
+            logger.error(f"error while reloading exchange rates: {e}")
+            with self.__lock:
+                # keep serving the current table and retry after another ttl
+                self.__loaded_at = time.monotonic()
+        finally:
+            with self.__lock:
+                self.__reloading = False
+
+    def update(self, currency_name: str, rate: float):
+        with self.__lock:
+            # copy on write so readers never see a table being modified
+            rates = dict(self.__rates or {})
+            rates[currency_name] = rate
+            self.__rates = rates
+
+
+exchange_rate_table: ExchangeRateTable = ExchangeRateTable()
+
+
 class CurrencyService:
     def __init__(self):
         self.__currency_repo = CurrencyRepo()
 
+    def resolve_currency(self, currency_name: Optional[str]) -> str:
+        """
+        Maps an X-Currency value to a currency of the exchange rate table, falling back to
+        SYSTEM_CURRENCY (rate 1.0) for unknown ones, so raw headers never become cache keys.
+        """
+        system_currency = os.getenv("SYSTEM_CURRENCY", "USD")
+        rates = exchange_rate_table.get_rates()
+        for candidate in (currency_name, (currency_name or "").strip().upper()):
+            if candidate == system_currency or candidate in rates:
+                return candidate
+        return system_currency
+
     def get_rate_by_currency(self, currency_name: str) -> float:
         if currency_name == os.getenv("SYSTEM_CURRENCY", "USD"):
             return 1.0
 
-        currency = self.__currency_repo.get_first_by(
-            where={"name": currency_name, "default_currency": os.getenv("SYSTEM_CURRENCY", "USD")})
+        rate = exchange_rate_table.get_rate(currency_name)
 
-        if not currency:
+        if rate is None:
             return 1.0
 
-        return currency.rate
+        return rate
+
+    def update_rate(self, currency_name: str, rate: float):
+        self.__currency_repo.update_by(
+            {"name": currency_name, "default_currency": os.getenv("SYSTEM_CURRENCY", "USD")}, data={"rate": rate})
+        exchange_rate_table.update(currency_name, rate)
 
     def get_all_currency(self) -> Response[List[CurrencyDto]]:
         currency_list = self.__currency_repo.list(where={})
@@ -1,31 +1,31 @@
+import asyncio
 from typing import List
 
 from app.config.db import DatabaseTables
 from app.models.app import TagModel
-from app.repo.bundle_repo import BundleRepo
-from app.repo.bundle_tage_repo import BundleTagRepo
+from app.repo.async_repo import AsyncRepository
 from app.repo.tag_group_repo import tagGroupRepo
 from app.repo.tag_repo import TagRepo, TagTranslationRepo
-from app.schemas.dto_mapper import DtoMapper
 from app.schemas.home import CountryDTO, RegionDTO, BundleDTO
+from app.services.catalog_service import catalog_service
+from app.services.pricing_service import pricing_service
+from app.services.sync_service import SyncService
 from deep_translator import GoogleTranslator
 
 
 class GroupingService:
     def __init__(self):
-        self.__tag_group_repo = tagGroupRepo()
-        self.__tag_repo = TagRepo()
-        self.__bundle_tag_repo = BundleTagRepo()
-        self.__bundle_repo = BundleRepo()
-        self.__tag_translation_repo = TagTranslationRepo()
+        self.__tag_group_repo = AsyncRepository(tagGroupRepo())
+        self.__tag_repo = AsyncRepository(TagRepo())
+        self.__tag_translation_repo = AsyncRepository(TagTranslationRepo())
 
     async def __get_all_tags_by_group_id(self, group_id) -> List[TagModel]:
-        tags = self.__tag_repo.list(where={"tag_group_id": group_id})
+        tags = catalog_service.get_snapshot().get_tags_by_group(group_id)
         return tags
 
     async def __get_all_tags_by_group_id_with_language(self, group_id :int,locale :str ='en') -> List[TagModel]:
-        tags = self.__tag_repo.select_procedure(function_name = "get_translated_tag_by_tag_group_id",where ={"tag_group_id_param": group_id,"locale_param":locale})
-        # tags = self.__tag_repo.list(where={"tag_group_id": group_id})
+        # tags = self.__tag_repo.select_procedure(function_name = "get_translated_tag_by_tag_group_id",where ={"tag_group_id_param": group_id,"locale_param":locale})
+        tags = catalog_service.get_snapshot().get_translated_tags_by_group(group_id=group_id, locale=locale)
         return tags
 
     async def get_all_countries(self,locale :str) -> List[CountryDTO]:
@@ -42,75 +42,41 @@ class GroupingService:
         return [RegionDTO.model_validate(tag.data) for tag in tags]
 
     async def get_cruise_bundle(self,rate :float,currency_name : str,locale :str) -> List[BundleDTO]:
-        tags = await self.__get_all_tags_by_group_id(group_id=3)
-
-        tag_id = tags[0].id if tags else 0
-        bundles: List[BundleDTO] = []
-
-        if tag_id:
-            bundler_tags = self.__bundle_tag_repo.list(
-                where={"tag_id": tag_id}
-            )
-
-            for bundle_tag in bundler_tags:
-                # Assuming bundle_tag has `bundle_id` field (not `id`)
-                bundle = self.__bundle_repo.get_by_id(record_id=bundle_tag.bundle_id)
-
-                if bundle and bundle.data:
-                    bundle_dto = BundleDTO(**bundle.data)
-                    tags_id = [bundle_country.id for  bundle_country in bundle_dto.countries]
-                    country_tags = self.__tag_repo.select_procedure(function_name="get_translated_tag_by_tag_id_list",
-                                                            where={"tag_ids": tags_id,
-                                                                   "locale_param": locale})
-                    for country_tag in country_tags:
-                        country_tag.data["country"] = country_tag.name
-                    countries = [tag.data for  tag in country_tags]
-                    bundle_dto.countries = countries
-                    bundles.append(DtoMapper.bundle_currency_update(bundle_dto, currency_name, rate))
-
-        return bundles
+        return await self.__get_group_bundles(group_id=3, rate=rate, currency_name=currency_name, locale=locale)
 
     async def get_global_bundle(self,rate: float, currency_name : str,locale :str) -> List[BundleDTO]:
-        tags = await self.__get_all_tags_by_group_id(group_id=4)
+        return await self.__get_group_bundles(group_id=4, rate=rate, currency_name=currency_name, locale=locale)
+
+    async def __get_group_bundles(self, group_id: int, rate: float, currency_name: str, locale: str) -> List[BundleDTO]:
+        tags = await self.__get_all_tags_by_group_id(group_id=group_id)
         if not tags:
             return []
 
-        tag_id = tags[0].id if tags else 0
-
-        bundles: List[BundleDTO] = []
-
-        if tag_id:
-            bundler_tags = self.__bundle_tag_repo.list(
-                where={"tag_id": tag_id}
-            )
-
-            for bundle_tag in bundler_tags:
-                # Assuming bundle_tag has `bundle_id` field (not `id`)
-                bundle = self.__bundle_repo.get_by_id(record_id=bundle_tag.bundle_id)
-
-                if bundle and bundle.data:
-                    bundle_dto = BundleDTO(**bundle.data)
-                    tags_id = [bundle_country.id for  bundle_country in bundle_dto.countries]
-                    country_tags = self.__tag_repo.select_procedure(function_name="get_translated_tag_by_tag_id_list",
-                                                            where={"tag_ids": tags_id,
-                                                                   "locale_param": locale})
-                    for country_tag in country_tags:
-                        country_tag.data["country"] = country_tag.name
-                    countries = [tag.data for  tag in country_tags]
-                    bundle_dto.countries = countries
-                    bundles.append(DtoMapper.bundle_currency_update(bundle_dto, currency_name, rate))
-        return bundles
+        # active bundles of the group's first tag, read from the snapshot index already price ordered
+        snapshot = catalog_service.get_snapshot()
+        prices = pricing_service.get_column(snapshot, currency_name=currency_name, rate=rate)
+        bundles = [prices.apply(BundleDTO(**bundle.data), bundle.id)
+                   for bundle in snapshot.get_bundles_by_tags([tags[0].id]) if bundle.data]
+        return snapshot.localize_bundles(bundles, locale=locale)
 
     async def translate_tags(self,locale :str):
-        tags = self.__tag_repo.list(where={})
+        tags = await self.__tag_repo.list(where={})
+        # the translator blocks on one http call per tag
+        translations = await asyncio.to_thread(self.__translate_tags, tags, locale)
+        await self.__tag_translation_repo.create_many(translations)
+        # rotate APP_CACHE_KEY so cached payloads and ETags pick up the new translations
+        await SyncService().update_sync_version()
+
+    @staticmethod
+    def __translate_tags(tags: List[TagModel], locale: str) -> List[dict]:
+        translator = GoogleTranslator(source='en', target=locale)
+        translations = []
         for tag in tags:
-            translated = GoogleTranslator(source='en', target=locale).translate(tag.name)
-            print(tag)
-            data = {
+            translated = translator.translate(tag.name)
+            translations.append({
                 "tag_id" : tag.id,
                 "locale" : locale,
                 "name" : translated,
                 "data" : tag.data
-            }
-            print(data)
-            self.__tag_translation_repo.create(data)
\ No newline at end of file
+            })
+        return translations
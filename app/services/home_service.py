@@ -1,15 +1,38 @@
+import asyncio
 import os
-from typing import Literal, List
+from typing import Awaitable, Dict, List, Optional, Tuple
 
 from loguru import logger
 
 from app.config.config import esim_hub_service_instance
-from app.schemas.home import HomeResponseDto, BundleDTO
+from app.schemas.home import HomeResponseDto
 from app.schemas.response import Response, ResponseHelper
+from app.services.catalog_service import catalog_service
 from app.services.currency_service import CurrencyService
 from app.services.grouping_service import GroupingService
 
 
+class HomePayload:
+    """
+    A home response built for one catalog version and exchange rate, kept alongside its JSON body
+    so it can be written out without serializing it again.
+    """
+
+    def __init__(self, version: str, rate: float, response: Response[HomeResponseDto], complete: bool = True):
+        self.version = version
+        self.rate = rate
+        # False when a section failed and was served empty, such payloads are not cached
+        self.complete = complete
+        self.response = response
+        self.body: bytes = response.model_dump_json().encode()
+
+
+# (locale, currency) -> HomePayload, shared by every HomeService instance
+_home_payloads: Dict[Tuple[str, str], HomePayload] = {}
+# builds in progress per loop, (locale, currency), version and rate, awaited by concurrent misses
+_home_builds: Dict[tuple, asyncio.Future] = {}
+
+
 class HomeService:
 
     def __init__(self):
@@ -18,36 +41,77 @@ class HomeService:
         self.__currency_service = CurrencyService()
 
     async def home(self) -> Response[HomeResponseDto]:
-        all_countries = await self.__get_countries()
-        regions = await self.__get_regions()
-        cruise_bundles = await self.__get_bundles_by_category("CRUISE")
-        all_global_bundles = await self.__get_bundles_by_category("GLOBAL")
+        all_countries, regions, cruise_bundles, all_global_bundles = await asyncio.gather(
+            self.__get_section(self.__esim_hub_service.get_countries(), "countries"),
+            self.__get_section(self.__esim_hub_service.get_regions(), "regions"),
+            self.__get_section(self.__esim_hub_service.get_bundles_by_category(category="CRUISE"), "cruise bundles"),
+            self.__get_section(self.__esim_hub_service.get_bundles_by_category(category="GLOBAL"), "global bundles"))
         global_bundles = []
-        for bundle in all_global_bundles:
+        for bundle in all_global_bundles or []:
             if len(bundle.countries) >= os.getenv("GLOBAL_COUNTRIES_COUNT", 50):
                 global_bundles.append(bundle)
 
         home_response = {
-            "countries": all_countries,
-            "regions": regions,
-            "cruise_bundles": cruise_bundles,
+            "countries": all_countries or [],
+            "regions": regions or [],
+            "cruise_bundles": cruise_bundles or [],
             "global_bundles": global_bundles
         }
         return ResponseHelper.success_data_response(HomeResponseDto(**home_response), 0)
 
-    async def home_v2(self,currency: str, locale : str) -> Response[HomeResponseDto]:
-        all_countries = await self.__get_countries_v2(locale)
-        regions = await self.__get_regions_v2(locale)
+    async def home_v2(self, currency: str, locale: str) -> Response[HomeResponseDto]:
+        payload = await self.get_home_payload(currency=currency, locale=locale)
+        return payload.response
+
+    async def get_home_payload(self, currency: str, locale: str) -> HomePayload:
+        """
+        Returns the assembled home response for the supported locale and currency the headers
+        resolve to, rebuilding it only when the catalog version or the exchange rate differs from
+        the one it was built with. Concurrent requests missing the same payload share one build.
+        """
+        snapshot = catalog_service.get_snapshot()
+        locale = snapshot.resolve_locale(locale)
+        currency = self.__currency_service.resolve_currency(currency)
         rate = self.__currency_service.get_rate_by_currency(currency)
-        cruise_bundles = await self.__grouping_service.get_cruise_bundle(rate= rate,currency_name= currency,locale=locale)
+        key = (locale, currency)
+        payload = _home_payloads.get(key)
+        if payload is not None and payload.version == snapshot.version and payload.rate == rate:
+            return payload
+
+        build_key = (asyncio.get_running_loop(), key, snapshot.version, rate)
+        build = _home_builds.get(build_key)
+        if build is None:
+            build = _home_builds[build_key] = asyncio.ensure_future(
+                self.__build_and_store(build_key, version=snapshot.version, rate=rate, currency=currency,
+                                       locale=locale))
+        # shielded so one cancelled request does not cancel the build for the others
+        return await asyncio.shield(build)
+
+    async def __build_and_store(self, build_key: tuple, version: str, rate: float, currency: str,
+                                locale: str) -> HomePayload:
+        try:
+            payload = await self.__build_home_payload(version=version, rate=rate, currency=currency, locale=locale)
+            if not payload.complete:
+                return payload
+            key = (locale, currency)
+            _home_payloads.pop(key, None)
+            while len(_home_payloads) >= int(os.getenv("HOME_PAYLOAD_CACHE_SIZE", 64)):
+                _home_payloads.pop(next(iter(_home_payloads)))
+            _home_payloads[key] = payload
+            return payload
+        finally:
+            _home_builds.pop(build_key, None)
+
+    async def __build_home_payload(self, version: str, rate: float, currency: str, locale: str) -> HomePayload:
+        sections = await asyncio.gather(
+            self.__get_section(self.__grouping_service.get_all_countries(locale), "countries"),
+            self.__get_section(self.__grouping_service.get_all_regions(locale), "regions"),
+            self.__get_section(self.__grouping_service.get_cruise_bundle(rate=rate, currency_name=currency,
+                                                                         locale=locale), "cruise bundles"),
+            self.__get_section(self.__grouping_service.get_global_bundle(rate=rate, currency_name=currency,
+                                                                         locale=locale), "global bundles"))
+        all_countries, regions, cruise_bundles, global_bundles = [section or [] for section in sections]
         cruise_bundles.sort(key=lambda bundle: bundle.price or 0, reverse=False)
-        all_global_bundles = await self.__grouping_service.get_global_bundle(rate=rate,currency_name=currency,locale=locale)
-        all_global_bundles.sort(key=lambda bundle: bundle.price or 0, reverse=False)
-        global_bundles = []
-        for bundle in all_global_bundles:
-            if len(bundle.countries) >= os.getenv("GLOBAL_COUNTRIES_COUNT", 50):
-                global_bundles.append(bundle)
-        global_bundles = await self.__grouping_service.get_global_bundle(rate=rate,currency_name=currency,locale=locale)
         global_bundles.sort(key=lambda bundle: bundle.price or 0, reverse=False)
 
         home_response = {
@@ -56,39 +120,20 @@ class HomeService:
             "cruise_bundles": cruise_bundles,
             "global_bundles": global_bundles
         }
-        return ResponseHelper.success_data_response(HomeResponseDto(**home_response), 0)
-
-    async def __get_countries(self):
-        try:
-            return await self.__esim_hub_service.get_countries()
-        except Exception as e:
-            logger.error(f"error while getting countries: {str(e)}")
-            return []
-
-    async def __get_regions(self):
-        try:
-            return await self.__esim_hub_service.get_regions()
-        except Exception as e:
-            logger.error(f"error while getting regions: {str(e)}")
-            return []
-
-    async def __get_bundles_by_category(self, category: Literal["CRUISE", "GLOBAL"]) -> List[BundleDTO]:
-        try:
-            return await self.__esim_hub_service.get_bundles_by_category(category=category)
-        except Exception as e:
-            logger.error(f"error while getting cruise bundles: {str(e)}")
-            return []
-
-    async def __get_countries_v2(self,locale :str):
-        try:
-            return await self.__grouping_service.get_all_countries(locale)
-        except Exception as e:
-            logger.error(f"error while getting countries: {str(e)}")
-            return []
+        response = ResponseHelper.success_data_response(HomeResponseDto(**home_response), 0)
+        return HomePayload(version=version, rate=rate, response=response,
+                           complete=all(section is not None for section in sections))
 
-    async def __get_regions_v2(self,locale :str):
+    @staticmethod
+    async def __get_section(awaitable: Awaitable[list], section: str) -> Optional[list]:
+        """
+        Awaits one home section within HOME_SECTION_TIMEOUT_SECONDS, returning None when it fails
+        or times out so the remaining sections are still served.
+        """
         try:
-            return await self.__grouping_service.get_all_regions(locale)
+            return await asyncio.wait_for(awaitable, timeout=float(os.getenv("HOME_SECTION_TIMEOUT_SECONDS", 10)))
+        except asyncio.TimeoutError:
+            logger.error(f"timed out while getting {section}")
         except Exception as e:
-            logger.error(f"error while getting regions: {str(e)}")
-            return []
+            logger.error(f"error while getting {section}: {str(e)}")
+        return None
@@ -0,0 +1,75 @@
+import os
+import threading
+import time
+from typing import Dict
+
+from loguru import logger
+
+
+class CircuitBreaker:
+    """
+    Fails calls to an integration fast while it is down. After failure_threshold consecutive
+    failures the circuit opens and calls are refused for reset_timeout seconds; then a single trial
+    call is let through, closing the circuit if it succeeds and opening it again if it fails. A
+    trial that never reports back is replaced by a new one after another reset_timeout.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.__failures = 0
+        self.__opened_at = 0.0
+        self.__lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        with self.__lock:
+            if self.state == self.CLOSED:
+                return True
+            # also lets a new trial through when the last one never reported back
+            if time.monotonic() - self.__opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self.__opened_at = time.monotonic()
+                return True
+            # open, or half open with the trial call still running
+            return False
+
+    def record_success(self):
+        with self.__lock:
+            if self.state != self.CLOSED:
+                logger.info(f"{self.name} circuit closed")
+            self.state = self.CLOSED
+            self.__failures = 0
+
+    def record_failure(self):
+        with self.__lock:
+            self.__failures += 1
+            if self.state == self.HALF_OPEN or self.__failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"{self.name} circuit opened after {self.__failures} failures, "
+                                   f"refusing calls for {self.reset_timeout}s")
+                self.state = self.OPEN
+                self.__opened_at = time.monotonic()
+
+
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """
+    Process-wide breaker of an integration, configured by <NAME>_CIRCUIT_FAILURES (default 5) and
+    <NAME>_CIRCUIT_RESET_SECONDS (default 30).
+    """
+    with _circuit_breakers_lock:
+        circuit_breaker = _circuit_breakers.get(name)
+        if circuit_breaker is None:
+            prefix = name.upper()
+            circuit_breaker = _circuit_breakers[name] = CircuitBreaker(
+                name, failure_threshold=int(os.getenv(f"{prefix}_CIRCUIT_FAILURES", 5)),
+                reset_timeout=float(os.getenv(f"{prefix}_CIRCUIT_RESET_SECONDS", 30)))
+        return circuit_breaker
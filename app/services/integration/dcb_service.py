@@ -6,6 +6,8 @@ import httpx
 from loguru import logger
 
 from app.exceptions import DCBException, BadRequestException
+from app.services.integration.circuit_breaker import get_circuit_breaker
+from app.services.integration.http_pool import pooled_async_client
 
 
 class DCBService:
@@ -16,6 +18,11 @@ class DCBService:
         self.__verify_otp_url = verify_otp_url
         self.__api_key = api_key
         self.__merchant_msisdn = os.getenv("DCB_MERCHANT_MSISDN", "0937192488")
+        self.__limits = httpx.Limits(max_connections=int(os.getenv("DCB_POOL_SIZE", 20)),
+                                     max_keepalive_connections=int(os.getenv("DCB_POOL_KEEPALIVE", 10)))
+        self.__timeout = httpx.Timeout(float(os.getenv("DCB_READ_TIMEOUT", 15)),
+                                       connect=float(os.getenv("DCB_CONNECT_TIMEOUT", 5)))
+        self.__circuit_breaker = get_circuit_breaker("dcb")
 
     async def send_sms_template(self, msisdn: str, message: str):
         body_request = {
@@ -123,24 +130,36 @@ class DCBService:
                            body: Optional[Any] = None) -> Union[Dict[str, Any], List[Any], DCBException]:
         if headers is None:
             headers = {}
+        if not self.__circuit_breaker.allow_request():
+            raise DCBException("DCB service is unavailable, please try again later")
         try:
-            with httpx.Client() as client:
-                # headers["Tenant"] = self.__tenant_key
-                headers["Content-Type"] = "application/json"
-                headers["Accept"] = "application/json"
-                headers["Api-Key"] = self.__api_key
-                response = client.request(method=method, url=url, headers=headers, params=params,
-                                          json=body, timeout=120)
-                logger.debug("Request: curl -X {} {} {} -d '{}' Response: {}".format(method, response.url, " ".join(
-                    [f'--header "{key}: {value}"' for key, value in headers.items()]), body, response))
-                if response.status_code != httpx.codes.OK:
-                    try:
-                        json_response = response.json()
-                        raise DCBException(
-                            json_response["message"] if "message" in json_response else str(json_response))
-                    except Exception as e:
-                        raise DCBException(f"DCB API request failed: {response.status_code}")
-                return response.json()
+            client = pooled_async_client("dcb", limits=self.__limits)
+            # headers["Tenant"] = self.__tenant_key
+            headers["Content-Type"] = "application/json"
+            headers["Accept"] = "application/json"
+            headers["Api-Key"] = self.__api_key
+            try:
+                response = await client.request(method=method, url=url, headers=headers, params=params,
+                                                json=body, timeout=self.__timeout)
+            except BaseException:
+                # including cancellation, a half open trial must always report back
+                self.__circuit_breaker.record_failure()
+                raise
+            # business errors come back as 4xx or in the body, only server errors mean the API is degraded
+            if response.status_code >= httpx.codes.INTERNAL_SERVER_ERROR:
+                self.__circuit_breaker.record_failure()
+            else:
+                self.__circuit_breaker.record_success()
+            logger.debug("Request: curl -X {} {} {} -d '{}' Response: {}".format(method, response.url, " ".join(
+                [f'--header "{key}: {value}"' for key, value in headers.items()]), body, response))
+            if response.status_code != httpx.codes.OK:
+                try:
+                    json_response = response.json()
+                    raise DCBException(
+                        json_response["message"] if "message" in json_response else str(json_response))
+                except Exception as e:
+                    raise DCBException(f"DCB API request failed: {response.status_code}")
+            return response.json()
         except Exception as e:
             if type(e).__name__ == "CustomException":
                 raise e
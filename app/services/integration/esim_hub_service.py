@@ -1,3 +1,4 @@
+import json
 import os
 from typing import List, Literal, Optional, Dict, Any, Union
 
@@ -11,14 +12,34 @@ from app.schemas.bundle import ConsumptionResponse
 from app.schemas.dto_mapper import DtoMapper
 from app.schemas.esim_hub import EsimHubOrderResponse, GlobalConfigurationResponse, ContentResponse
 from app.schemas.home import RegionDTO, CountryDTO, BundleDTO, AllBundleResponse
+from app.services.integration.http_pool import pooled_async_client
+from app.services.integration.response_cache import get_response_cache
 
 
 class EsimHubService:
+    # read timeouts in seconds of the endpoints expected to outlast ESIM_HUB_READ_TIMEOUT
+    __READ_TIMEOUTS = {
+        EsimHubEndpoint.API_CREATE_RESELLER_ORDER: 120,
+        EsimHubEndpoint.API_CREATE_RESELLER_TOPUP: 120,
+        EsimHubEndpoint.API_GET_ALL_BUNDLES: 120,
+    }
+    # endpoints whose successful responses are cached, with the variable and default of their ttl in seconds;
+    # bundle details (read by the sync webhooks) and availability (gating purchases) always go to the hub
+    __CACHE_TTLS = {
+        EsimHubEndpoint.API_GET_BUNDLE_CONSUMPTION: ("ESIM_HUB_LIVE_CACHE_SECONDS", 30),
+        EsimHubEndpoint.API_GET_TOPUP_RELATED_BUNDLES: ("ESIM_HUB_CATALOG_CACHE_SECONDS", 300),
+        EsimHubEndpoint.API_GET_CONTENT_TAG: ("ESIM_HUB_CONTENT_CACHE_SECONDS", 21600),
+        EsimHubEndpoint.API_GET_CONTENT_TAGS: ("ESIM_HUB_CONTENT_CACHE_SECONDS", 21600),
+    }
 
     def __init__(self, base_url: str, api_key: str, tenant_key: str):
         self.__api_key = api_key
         self.__base_url = base_url
         self.__tenant_key = tenant_key
+        self.__limits = httpx.Limits(max_connections=int(os.getenv("ESIM_HUB_POOL_SIZE", 50)),
+                                     max_keepalive_connections=int(os.getenv("ESIM_HUB_POOL_KEEPALIVE", 20)))
+        self.__http2 = os.getenv("ESIM_HUB_HTTP2", "true").lower() == "true"
+        self.__response_cache = get_response_cache("esim_hub")
 
     async def get_regions(self) -> List[RegionDTO]:
         params = {
@@ -343,33 +364,58 @@ class EsimHubService:
                            params: Optional[Dict[str, str]] | Optional[Dict[str, List[str]]] = None,
                            body: Optional[Any] = None,
                            base_url=None) -> Union[Dict[str, Any], List[Any], EsimHubException]:
+        cache_ttl = self.__cache_ttl(path)
+        if cache_ttl <= 0:
+            return await self.__send_request(method, path, headers, params, body, base_url)
+        key = json.dumps([method, base_url or self.__base_url, path, headers, params, body], sort_keys=True,
+                         default=str)
+        return await self.__response_cache.get_or_load(
+            key, cache_ttl, lambda: self.__send_request(method, path, headers, params, body, base_url),
+            cacheable=lambda response: isinstance(response, dict) and bool(response.get("success")))
+
+    def __cache_ttl(self, path: str) -> float:
+        if path not in self.__CACHE_TTLS:
+            return 0
+        variable, default = self.__CACHE_TTLS[path]
+        return float(os.getenv(variable, default))
+
+    async def __send_request(self,
+                             method: Literal["GET", "OPTIONS", "HEAD", "POST", "PUT", "PATCH", "DELETE"], path: str,
+                             headers: Optional[Dict[str, str]] = None,
+                             params: Optional[Dict[str, str]] | Optional[Dict[str, List[str]]] = None,
+                             body: Optional[Any] = None,
+                             base_url=None) -> Union[Dict[str, Any], List[Any], EsimHubException]:
         if headers is None:
             headers = {}
         if base_url is None:
             base_url = self.__base_url
         try:
-            with httpx.Client() as client:
-                headers["Tenant"] = self.__tenant_key
-                headers["Content-Type"] = "application/json"
-                headers["Accept"] = "application/json"
-                headers["Api-Key"] = self.__api_key
-                response = client.request(method=method, url=base_url + path, headers=headers, params=params,
-                                          json=body, timeout=120)
-                logger.debug("Request: curl -X {} {} {} Response: {}".format(method, response.url, " ".join(
-                    [f'--header "{key}: {value}"' for key, value in headers.items()]), response))
-                if response.status_code != httpx.codes.OK:
-                    try:
-                        json_response = response.json()
-                        raise EsimHubException(
-                            json_response["message"] if "message" in json_response else str(json_response))
-                    except Exception as e:
-                        raise EsimHubException(f"eSIM Hub API request failed: {response.status_code}")
-                return response.json()
+            client = pooled_async_client(base_url, limits=self.__limits, http2=self.__http2)
+            headers["Tenant"] = self.__tenant_key
+            headers["Content-Type"] = "application/json"
+            headers["Accept"] = "application/json"
+            headers["Api-Key"] = self.__api_key
+            response = await client.request(method=method, url=base_url + path, headers=headers, params=params,
+                                            json=body, timeout=self.__timeout(path))
+            logger.debug("Request: curl -X {} {} {} Response: {}".format(method, response.url, " ".join(
+                [f'--header "{key}: {value}"' for key, value in headers.items()]), response))
+            if response.status_code != httpx.codes.OK:
+                try:
+                    json_response = response.json()
+                    raise EsimHubException(
+                        json_response["message"] if "message" in json_response else str(json_response))
+                except Exception as e:
+                    raise EsimHubException(f"eSIM Hub API request failed: {response.status_code}")
+            return response.json()
         except Exception as e:
             if type(e).__name__ == "CustomException":
                 raise e
             raise EsimHubException(str(e))
 
+    def __timeout(self, path: str) -> httpx.Timeout:
+        read_timeout = self.__READ_TIMEOUTS.get(path, float(os.getenv("ESIM_HUB_READ_TIMEOUT", 30)))
+        return httpx.Timeout(read_timeout, connect=float(os.getenv("ESIM_HUB_CONNECT_TIMEOUT", 5)))
+
     async def check_bundle_applicable(self, bundle_id: str) -> bool:
         try:
             params = {
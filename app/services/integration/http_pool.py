@@ -0,0 +1,58 @@
+import asyncio
+import importlib.util
+import threading
+import weakref
+from typing import Any, Coroutine, Dict, TypeVar
+
+import httpx
+
+# clients are bound to the event loop that opened their connections; besides the app's loop,
+# scheduler jobs and sync threads run integrations under their own asyncio.run loops
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = \
+    weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+T = TypeVar("T")
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def pooled_async_client(name: str, limits: httpx.Limits, http2: bool = True) -> httpx.AsyncClient:
+    """
+    Long-lived client registered under name (e.g. an integration's base url) for the running event
+    loop, keeping keep-alive connections and TLS sessions across requests. HTTP/2 is used only when
+    h2 is installed.
+    """
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        clients = _clients.setdefault(loop, {})
+        client = clients.get(name)
+        if client is None or client.is_closed:
+            client = clients[name] = httpx.AsyncClient(limits=limits, http2=http2 and http2_available())
+        return client
+
+
+async def close_pooled_async_clients():
+    """
+    Closes the clients opened on the running event loop, called on application shutdown.
+    """
+    with _clients_lock:
+        clients = _clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
+
+
+def run_with_pooled_clients(coroutine: Coroutine[Any, Any, T]) -> T:
+    """
+    asyncio.run for sync callers (scheduler jobs, sync threads): closes the clients pooled on the
+    temporary loop before it goes away instead of leaking their connections.
+    """
+    async def run() -> T:
+        try:
+            return await coroutine
+        finally:
+            await close_pooled_async_clients()
+
+    return asyncio.run(run())
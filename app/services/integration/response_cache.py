@@ -0,0 +1,88 @@
+import asyncio
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+MISSING = object()
+
+
+class ResponseCache:
+    """
+    TTL cache of integration responses with single-flight loading: concurrent calls for a key that
+    is not cached yet share one upstream request. Failed loads are not cached. Callers get their own
+    copy of the response, the least recently used entries are dropped past max_size.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.__entries: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        # loads are awaited on the loop that started them, scheduler jobs run their own loops
+        self.__in_flight: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Future] = {}
+        self.__lock = threading.Lock()
+
+    async def get_or_load(self, key: str, ttl: float, load: Callable[[], Awaitable[Any]],
+                          cacheable: Callable[[Any], bool] = lambda value: True) -> Any:
+        value = self.__get(key)
+        if value is not MISSING:
+            return copy.deepcopy(value)
+        flight_key = (asyncio.get_running_loop(), key)
+        with self.__lock:
+            future = self.__in_flight.get(flight_key)
+            if future is None:
+                future = self.__in_flight[flight_key] = asyncio.ensure_future(
+                    self.__load(flight_key, ttl, load, cacheable))
+        # shielded so one cancelled caller does not cancel the request for the others
+        return copy.deepcopy(await asyncio.shield(future))
+
+    async def __load(self, flight_key: tuple, ttl: float, load: Callable[[], Awaitable[Any]],
+                     cacheable: Callable[[Any], bool]) -> Any:
+        try:
+            value = await load()
+            if cacheable(value):
+                self.__put(flight_key[1], ttl, value)
+            return value
+        finally:
+            with self.__lock:
+                self.__in_flight.pop(flight_key, None)
+
+    def __get(self, key: str) -> Any:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self.__entries[key]
+                return MISSING
+            self.__entries.move_to_end(key)
+            return value
+
+    def __put(self, key: str, ttl: float, value: Any):
+        with self.__lock:
+            self.__entries[key] = (time.monotonic() + ttl, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+
+_response_caches: Dict[str, ResponseCache] = {}
+_response_caches_lock = threading.Lock()
+
+
+def get_response_cache(name: str) -> ResponseCache:
+    """
+    Process-wide response cache of an integration, holding at most <NAME>_CACHE_SIZE (default 1024)
+    responses.
+    """
+    with _response_caches_lock:
+        cache = _response_caches.get(name)
+        if cache is None:
+            cache = _response_caches[name] = ResponseCache(int(os.getenv(f"{name.upper()}_CACHE_SIZE", 1024)))
+        return cache
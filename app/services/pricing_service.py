@@ -0,0 +1,157 @@
+import os
+import threading
+from collections import OrderedDict
+from math import ceil
+from typing import Dict, List, Optional, Tuple
+
+from app.models.app import BundleModel
+from app.schemas.dto_mapper import DtoMapper
+from app.schemas.home import BundleDTO
+from app.services.catalog_service import CatalogSnapshot
+from app.services.currency_service import exchange_rate_table
+
+
+class PriceColumn:
+    """
+    The converted price and price_display of every catalog bundle for one currency and rate,
+    aligned with the bundle index of the PricingService that built it.
+    """
+
+    def __init__(self, currency_code: str, rate: float, index: Dict[str, int], prices: list, displays: List[str]):
+        self.currency_code = currency_code
+        self.rate = rate
+        self.__index = index
+        self.prices = prices
+        self.displays = displays
+        self.__best_offers: Dict[tuple, List[BundleModel]] = {}
+        self.__fragments: OrderedDict[tuple, bytes] = OrderedDict()
+        self.__fragments_lock = threading.Lock()
+
+    def apply(self, bundle: BundleDTO, bundle_id: str) -> BundleDTO:
+        position = self.__index.get(bundle_id)
+        if position is None:
+            # not part of the catalog snapshot (e.g. read straight from the bundle table)
+            return DtoMapper.bundle_currency_update(bundle, self.currency_code, self.rate)
+        bundle.currency_code = self.currency_code
+        bundle.price = self.prices[position]
+        bundle.price_display = self.displays[position]
+        return bundle
+
+    def get_best_offers(self, snapshot: CatalogSnapshot, tag_ids: List[str], min_countries: int = 0) -> List[
+        BundleModel]:
+        """
+        Returns the cheapest active bundle per gprs_limit_display and validity among the bundles
+        carrying every tag in tag_ids, sorted by price in this column's currency. Bundles covering
+        fewer than min_countries known countries are skipped. Results are kept per snapshot version.
+        """
+        key = (snapshot.version, tuple(tag_ids), min_countries)
+        offers = self.__best_offers.get(key)
+        if offers is not None:
+            return offers
+
+        best: Dict[str, Tuple[float, BundleModel]] = {}
+        for bundle in snapshot.get_bundles_by_tags(tag_ids):
+            data = bundle.data
+            if not data or bundle.id not in self.__index:
+                continue
+            if min_countries and sum(
+                    1 for country in data.get("countries") or [] if snapshot.get_tag(country.get("id"))) < min_countries:
+                continue
+            price = self.prices[self.__index[bundle.id]]
+            group = f"{data.get('gprs_limit_display')}_{data.get('validity')}"
+            if group not in best or price < best[group][0]:
+                best[group] = (price, bundle)
+        offers = [bundle for _, bundle in sorted(best.values(), key=lambda offer: offer[0])]
+
+        if len(self.__best_offers) >= int(os.getenv("BEST_OFFERS_CACHE_SIZE", 1024)):
+            self.__best_offers.pop(next(iter(self.__best_offers)))
+        self.__best_offers[key] = offers
+        return offers
+
+    def render_bundles(self, snapshot: CatalogSnapshot, bundles: List[BundleModel], locale: str,
+                       icon: Optional[str]) -> List[bytes]:
+        """
+        Returns the serialized BundleDTO of every bundle, priced in this column's currency and
+        localized to locale, ready to be spliced into a list response. Each fragment is rendered
+        once per snapshot version and reused afterwards.
+        """
+        locale = snapshot.resolve_locale(locale)
+        keys = [(snapshot.version, locale, bundle.id, icon) for bundle in bundles]
+        fragments: Dict[tuple, bytes] = {}
+        with self.__fragments_lock:
+            for key in keys:
+                fragment = self.__fragments.get(key)
+                if fragment is not None:
+                    self.__fragments.move_to_end(key)
+                    fragments[key] = fragment
+        missing = [(key, bundle) for key, bundle in zip(keys, bundles) if key not in fragments]
+        if missing:
+            bundle_dtos = []
+            for _, bundle in missing:
+                bundle_dto = BundleDTO(**bundle.data)
+                bundle_dto.icon = icon
+                bundle_dtos.append(self.apply(bundle_dto, bundle.id))
+            snapshot.localize_bundles(bundle_dtos, locale=locale)
+
+            max_size = int(os.getenv("BUNDLE_FRAGMENT_CACHE_SIZE", 50000))
+            with self.__fragments_lock:
+                for (key, _), bundle_dto in zip(missing, bundle_dtos):
+                    fragments[key] = self.__fragments[key] = bundle_dto.model_dump_json().encode()
+                # least recently rendered fragments go first
+                while len(self.__fragments) > max_size:
+                    self.__fragments.popitem(last=False)
+        return [fragments[key] for key in keys]
+
+
+class PricingService:
+    """
+    Materializes bundle prices per currency for the current catalog snapshot. All known exchange
+    rates are converted in one pass over the price column when the snapshot version changes, and
+    a single column is recomputed when its rate changes.
+    """
+
+    def __init__(self):
+        self.__version: Optional[str] = None
+        self.__index: Dict[str, int] = {}
+        self.__base_prices: List[float] = []
+        self.__columns: Dict[Tuple[str, float], PriceColumn] = {}
+        self.__lock = threading.Lock()
+
+    def get_column(self, snapshot: CatalogSnapshot, currency_name: str, rate: float) -> PriceColumn:
+        # mirrors DtoMapper.bundle_currency_update, a rate of 1.0 is displayed in DEFAULT_CURRENCY
+        currency_code = os.getenv("DEFAULT_CURRENCY") if rate == 1.0 else currency_name
+        column = self.__columns.get((currency_code, rate)) if self.__version == snapshot.version else None
+        if column is not None:
+            return column
+        with self.__lock:
+            if self.__version != snapshot.version:
+                self.__rebuild(snapshot)
+            column = self.__columns.get((currency_code, rate))
+            if column is None:
+                columns = {key: value for key, value in self.__columns.items() if key[0] != currency_code}
+                column = self.__build_column(currency_code, rate)
+                columns[(currency_code, rate)] = column
+                self.__columns = columns
+            return column
+
+    def __rebuild(self, snapshot: CatalogSnapshot):
+        bundle_ids = list(snapshot.bundles)
+        self.__index = {bundle_id: position for position, bundle_id in enumerate(bundle_ids)}
+        self.__base_prices = [float((snapshot.bundles[bundle_id].data or {}).get("original_price") or 0)
+                              for bundle_id in bundle_ids]
+        rates = {os.getenv("DEFAULT_CURRENCY"): 1.0}
+        rates.update({name: rate for name, rate in exchange_rate_table.get_rates().items() if rate != 1.0})
+        self.__columns = {(currency_code, rate): self.__build_column(currency_code, rate)
+                          for currency_code, rate in rates.items()}
+        self.__version = snapshot.version
+
+    def __build_column(self, currency_code: str, rate: float) -> PriceColumn:
+        prices = [price * rate for price in self.__base_prices]
+        if os.getenv("DISPLAY_PRICE", "normal") == "rounded":
+            prices = [int(ceil(price)) for price in prices]
+        displays = [f'{price:.2f} {currency_code}' for price in prices]
+        return PriceColumn(currency_code=currency_code, rate=rate, index=self.__index, prices=prices,
+                           displays=displays)
+
+
+pricing_service: PricingService = PricingService()
@@ -1,4 +1,3 @@
-import asyncio
 import os
 import time
 
@@ -9,6 +8,8 @@ from loguru import logger
 
 from app.config.config import esim_hub_service_instance
 from app.repo.currency_repo import CurrencyRepo
+from app.services.currency_service import exchange_rate_table
+from app.services.integration.http_pool import run_with_pooled_clients
 
 load_dotenv()
 
@@ -28,10 +29,11 @@ class SchedulerService:
             print("No Currency Found")
             return
         names = [currency.name for currency in currencies]
-        rates = asyncio.run(self.__esim_hub_service.get_exchange_rates(currency_codes=names))
+        rates = run_with_pooled_clients(self.__esim_hub_service.get_exchange_rates(currency_codes=names))
         logger.info(f"exchange from esim hub: {rates}")
         for rate in rates:
             self.__currency_repo.update_by({"name": rate.currency_code}, data={'rate': rate.new_rate})
+            exchange_rate_table.update(rate.currency_code, rate.new_rate)
         #  currency_url = os.getenv("CURRENCY_URL")
         # currencies_name:str = ""
         # for currency in currencies:
@@ -1,17 +1,19 @@
 import math
 import os
 import uuid
-from typing import List
+from typing import List, Set, Tuple
 
 from loguru import logger
 
 from app.config.db import ConfigKeysEnum
 from app.models.app import TagModel, BundleModel, BundleTagModel
+from app.repo.async_repo import AsyncRepository
 from app.repo.bundle_repo import BundleRepo
 from app.repo.bundle_tage_repo import BundleTagRepo
 from app.repo.config_repo import ConfigRepo
 from app.repo.tag_repo import TagRepo
 from app.schemas.home import CountryDTO, RegionDTO, BundleDTO
+from app.services.catalog_service import catalog_service
 from app.services.integration.esim_hub_service import EsimHubService
 
 
@@ -23,10 +25,10 @@ class SyncService:
             api_key=os.getenv("ESIM_HUB_API_KEY"),
             tenant_key=os.getenv("ESIM_HUB_TENANT_KEY"),
         )
-        self.__bundle_repo = BundleRepo()
-        self.__tag_repo = TagRepo()
-        self.__bundle_tag_repo = BundleTagRepo()
-        self.__config_repo = ConfigRepo()
+        self.__bundle_repo = AsyncRepository(BundleRepo())
+        self.__tag_repo = AsyncRepository(TagRepo())
+        self.__bundle_tag_repo = AsyncRepository(BundleTagRepo())
+        self.__config_repo = AsyncRepository(ConfigRepo())
 
     async def sync_bundles(self, page_index=1):
         logger.info(f"Syncing bundles started")
@@ -35,80 +37,105 @@ class SyncService:
         all_bundles_count = all_bundle_response.total_rows
         pages = math.ceil(all_bundles_count / page_size)
         logger.info(f"all bundle count: {all_bundles_count}, pages: {pages}")
-        for index, bundle in enumerate(all_bundle_response.bundles):
-            logger.info("Syncing bundle {}".format(index + 1))
-            await self.sync_bundle(bundle)
+        await self.__sync_bundle_page(all_bundle_response.bundles)
         for page in range(2, pages + 1):
             all_bundle_response = await self.__esim_hub_service.get_all_bundles(page_index=page, page_size=page_size)
             logger.info(f"Syncing bundle page: {page} of size: {pages}")
-            for index, bundle in enumerate(all_bundle_response.bundles):
-                logger.info("Syncing bundle {}".format(index + 1))
-                await self.sync_bundle(bundle)
+            await self.__sync_bundle_page(all_bundle_response.bundles)
         logger.info(f"Syncing bundles finished")
 
     async def sync_bundle(self, bundle: BundleDTO):
-        try:
-            countries = bundle.countries
-            await self.__sync_country_tags(countries)
-            regions = bundle.bundle_region
-            regions = list(filter(lambda r: r.region_code != "GLOBAL", regions))
-            await self.__sync_region_tags(regions)
-            if not self.__bundle_repo.get_by_id(bundle.bundle_code):
-                self.__bundle_repo.create(BundleModel(id=bundle.bundle_code, is_active=True,
-                                                      data=bundle.model_dump(
-                                                          exclude={"updated_at", "created_at", "id"})).model_dump(
+        await self.__sync_bundle_page([bundle])
+
+    async def __sync_bundle_page(self, bundles: List[BundleDTO]):
+        """
+        Syncs the tags of every bundle, then writes the page with one bundle upsert and one insert of
+        the bundle_tag rows that do not exist yet. When the page write fails the bundles are written
+        one by one, so a bad row only loses its own bundle.
+        """
+        bundle_rows = []
+        bundle_tags = []
+        for index, bundle in enumerate(bundles):
+            logger.info("Syncing bundle {}".format(index + 1))
+            try:
+                countries = bundle.countries
+                await self.__sync_country_tags(countries)
+                regions = bundle.bundle_region
+                regions = list(filter(lambda r: r.region_code != "GLOBAL", regions))
+                await self.__sync_region_tags(regions)
+                bundle_rows.append(BundleModel(id=bundle.bundle_code, is_active=True,
+                                               data=bundle.model_dump(
+                                                   exclude={"updated_at", "created_at", "id"})).model_dump(
                     exclude={"updated_at", "created_at"}))
                 for country in countries:
-                    self.__bundle_tag_repo.create(
-                        BundleTagModel(bundle_id=bundle.bundle_code, tag_id=country.id, id=None).model_dump(
-                            exclude={"updated_at", "created_at", "id"}))
-                for region in regions:
-                    tag = self.__tag_repo.get_first_by({"name": region.region_name})
-                    self.__bundle_tag_repo.create(
-                        BundleTagModel(bundle_id=bundle.bundle_code, tag_id=tag.id, id=None).model_dump(
-                            exclude={"updated_at", "created_at", "id"}))
-                    logger.debug("adding region for bundle {}".format(bundle.bundle_code))
-            else:
-                logger.info(f"bundle already added, updating it {bundle.bundle_code}")
-                self.__bundle_repo.update(record_id=bundle.bundle_code,
-                                          data=BundleModel(id=bundle.bundle_code, is_active=True,
-                                                           data=bundle.model_dump()).model_dump(
-                                              exclude={"updated_at", "created_at", "id"}))
-                for country in countries:
-                    if not self.__bundle_tag_repo.get_first_by({"bundle_id": bundle.bundle_code, "tag_id": country.id}):
-                        self.__bundle_tag_repo.create(
-                            BundleTagModel(bundle_id=bundle.bundle_code, tag_id=country.id, id=None).model_dump(
-                                exclude={"updated_at", "created_at", "id"}))
+                    bundle_tags.append((bundle.bundle_code, country.id))
                 for region in regions:
-                    if not self.__bundle_tag_repo.get_first_by(
-                            {"bundle_id": bundle.bundle_code, "tag_id": region.guid}):
-                        self.__bundle_tag_repo.create(
-                            BundleTagModel(bundle_id=bundle.bundle_code, tag_id=region.guid, id=None).model_dump(
-                                exclude={"updated_at", "created_at", "id"}))
-                        logger.debug("updating region for bundle {}".format(bundle.bundle_code))
+                    tag = await self.__tag_repo.get_first_by({"name": region.region_name}, columns="id")
+                    bundle_tags.append((bundle.bundle_code, tag.id if tag else region.guid))
+            except Exception as e:
+                logger.error(e)
+        if not bundle_rows:
+            return
+
+        # a bundle listed twice would make the upsert touch the same row twice
+        bundle_rows = list({row["id"]: row for row in bundle_rows}.values())
+        try:
+            await self.__write_bundles(bundle_rows, bundle_tags)
+            return
         except Exception as e:
-            logger.error(e)
+            if len(bundle_rows) == 1:
+                logger.error(f"error while syncing bundle {bundle_rows[0]['id']}: {e}")
+                return
+            logger.error(f"error while writing bundle page, retrying {len(bundle_rows)} bundles one by one: {e}")
+        for row in bundle_rows:
+            try:
+                await self.__write_bundles([row], [edge for edge in bundle_tags if edge[0] == row["id"]])
+            except Exception as e:
+                logger.error(f"error while syncing bundle {row['id']}: {e}")
+
+    async def __write_bundles(self, bundle_rows: List[dict], bundle_tags: List[Tuple[str, str]]):
+        await self.__bundle_repo.upsert_many(bundle_rows, on_conflict="id")
+        existing = await self.__get_bundle_tags([row["id"] for row in bundle_rows])
+        missing = list(dict.fromkeys(edge for edge in bundle_tags if edge not in existing))
+        added = await self.__bundle_tag_repo.create_many(
+            [BundleTagModel(bundle_id=bundle_id, tag_id=tag_id, id=None).model_dump(
+                exclude={"updated_at", "created_at", "id"}) for bundle_id, tag_id in missing])
+        logger.info(f"synced {len(bundle_rows)} bundles, added {added} bundle tags")
+
+    async def __get_bundle_tags(self, bundle_ids: List[str]) -> Set[Tuple[str, str]]:
+        edges = set()
+        offset = 0
+        page_size = 1000
+        while True:
+            page = await self.__bundle_tag_repo.list_in(where={}, filter={"bundle_id": bundle_ids},
+                                                        limit=page_size, offset=offset, order_by="id",
+                                                        columns="bundle_id,tag_id")
+            edges.update((edge.bundle_id, edge.tag_id) for edge in page)
+            if len(page) < page_size:
+                return edges
+            offset += page_size
 
     async def update_sync_version(self):
         new_key = uuid.uuid4().hex
-        old_config = self.__config_repo.get_first_by({"key": ConfigKeysEnum.APP_CACHE_KEY})
+        old_config = await self.__config_repo.get_first_by({"key": ConfigKeysEnum.APP_CACHE_KEY})
         if not old_config:
-            self.__config_repo.create({"key": ConfigKeysEnum.APP_CACHE_KEY, "value": new_key})
+            await self.__config_repo.create({"key": ConfigKeysEnum.APP_CACHE_KEY, "value": new_key})
         else:
-            self.__config_repo.update_by(where={"key": ConfigKeysEnum.APP_CACHE_KEY}, data={"value": new_key})
+            await self.__config_repo.update_by(where={"key": ConfigKeysEnum.APP_CACHE_KEY}, data={"value": new_key})
+        catalog_service.invalidate()
 
     async def delete_bundle(self, bundle_id: str):
         try:
-            self.__bundle_tag_repo.delete_by({"bundle_id": bundle_id})
-            self.__bundle_repo.delete(record_id=bundle_id)
+            await self.__bundle_tag_repo.delete_by({"bundle_id": bundle_id})
+            await self.__bundle_repo.delete(record_id=bundle_id)
             logger.info(f"deleted bundle {bundle_id}")
         except Exception as e:
             logger.error(f"error while deleting bundle {bundle_id=} {e}")
 
     async def __sync_country_tags(self, countries: List[CountryDTO]):
         for country in countries:
-            if not self.__tag_repo.get_first_by({"name": country.country}):
-                self.__tag_repo.create(
+            if not await self.__tag_repo.exists({"name": country.country}):
+                await self.__tag_repo.create(
                     TagModel(name=country.country, icon=country.icon, tag_group_id=1, data=country.model_dump(),
                              id=country.id).model_dump(
                         exclude={"updated_at", "created_at"}))
@@ -117,8 +144,8 @@ class SyncService:
         for region in regions:
             if region.region_code == "GLOBAL":
                 continue
-            if not self.__tag_repo.get_first_by({"name": region.region_name}):
-                self.__tag_repo.create(
+            if not await self.__tag_repo.exists({"name": region.region_name}):
+                await self.__tag_repo.create(
                     TagModel(name=region.region_name, icon=region.icon, tag_group_id=2, data=region.model_dump(),
                              id=region.guid).model_dump(
                         exclude={"updated_at", "created_at"}))
@@ -10,15 +10,17 @@ from app.config.config import create_payment_intent, create_payment_ephemeral, s
 from app.config.db import DatabaseTables, PaymentTypeEnum
 from app.exceptions import BadRequestException, CustomException, DCBException
 from app.models.user import UserModel, UserOrderType, OrderStatusEnum, UserOrderModel
-from app.repo import NotificationRepo, UserOrderRepo, UserProfileRepo, UserProfileBundleRepo
+from app.repo import NotificationRepo, UserOrderRepo, UserProfileRepo, UserProfileBundleRepo, UserCounterRepo
+from app.repo.async_repo import AsyncRepository
 from app.repo.bundle_repo import BundleRepo
+from app.repo.keyset import decode_cursor, keyset_page
 from app.schemas.app import UserNotificationResponse
 from app.schemas.bundle import AssignRequest, AssignTopUpRequest, PaymentIntentResponse, EsimBundleResponse, \
     ConsumptionResponse, UserOrderHistoryResponse, UpdateBundleLabelRequest, VerifyOtpRequestDto
 from app.schemas.dto_mapper import DtoMapper
 from app.schemas.home import BundleDTO
 from app.schemas.promotion import PromotionValidationRequest
-from app.schemas.response import Response, ResponseHelper
+from app.schemas.response import Response, ResponseHelper, CursorResponse
 from app.services.bundle_service import BundleService
 from app.services.promotion_service import PromotionService
 from app.services.user_wallet_service import UserWalletService
@@ -28,11 +30,12 @@ class UserBundleService:
 
     def __init__(self):
         self.__esim_hub_service = esim_hub_service_instance()
-        self.__notification_repo = NotificationRepo()
-        self.__user_order_repo = UserOrderRepo()
-        self.__user_profile_repo = UserProfileRepo()
-        self.__user_profile_bundle_repo = UserProfileBundleRepo()
-        self.__bundle_repo = BundleRepo()
+        self.__notification_repo = AsyncRepository(NotificationRepo())
+        self.__user_order_repo = AsyncRepository(UserOrderRepo())
+        self.__user_profile_repo = AsyncRepository(UserProfileRepo())
+        self.__user_profile_bundle_repo = AsyncRepository(UserProfileBundleRepo())
+        self.__user_counter_repo = AsyncRepository(UserCounterRepo())
+        self.__bundle_repo = AsyncRepository(BundleRepo())
         self.__user_wallet_service = UserWalletService()
         self.__promotion_service = PromotionService()
         self.__bundle_service = BundleService()
@@ -61,14 +64,14 @@ class UserBundleService:
                                                             bundle_code=assign_request.bundle_code)
             bundle = await self.__promotion_service.validate_promotion_code(promo_code_request, x_currency, user.id)
             bundle = bundle.data
-            promo_code_details = self.__promotion_service.code_type_and_get_rule(assign_request.promo_code,
-                                                                                 user.id).data
+            promo_code_details = (await self.__promotion_service.code_type_and_get_rule(assign_request.promo_code,
+                                                                                        user.id)).data
             rule_id = promo_code_details.rule_id
             modified_amount = await self.__promotion_service.add_reward(promo_code_details.rule_id, user.id,
                                                                         bundle.bundle_code,
                                                                         assign_request.promo_code, False)
 
-        order = self.__user_order_repo.create(data={
+        order = await self.__user_order_repo.create(data={
             "user_id": user.id,
             "bundle_id": assign_request.bundle_code,
             "order_type": UserOrderType.ASSIGN,
@@ -99,7 +102,7 @@ class UserBundleService:
                                                })
         order.payment_intent_code = payment_intent.id
         logger.debug(payment_intent)
-        self.__user_order_repo.update_by({"id": order.id}, data=order.model_dump(exclude={"id"}))
+        await self.__user_order_repo.update_by({"id": order.id}, data=order.model_dump(exclude={"id"}))
         ephemeral = create_payment_ephemeral(payment_intent.customer)
         response = PaymentIntentResponse(publishable_key=os.getenv("STRIPE_PUBLIC_KEY"),
                                          merchant_identifier=os.getenv("MERCHANT_ID"),
@@ -114,9 +117,9 @@ class UserBundleService:
 
     async def assign_top_up(self, user: UserModel, assign_top_up_request: AssignTopUpRequest, device_id) -> Response:
         # bundle = await self.__esim_hub_service.get_bundle_by_id(assign_top_up_request.bundle_code)
-        bundle = self.__bundle_repo.get_bundle_by_id(bundle_id=assign_top_up_request.bundle_code)
+        bundle = await self.__bundle_repo.get_bundle_by_id(bundle_id=assign_top_up_request.bundle_code)
 
-        order = self.__user_order_repo.create({
+        order = await self.__user_order_repo.create({
             "user_id": user.id,
             "bundle_id": assign_top_up_request.bundle_code,
             "order_type": UserOrderType.BUNDLE_TOP_UP,
@@ -142,7 +145,7 @@ class UserBundleService:
         })
         order.payment_intent_code = payment_intent.id
         order.modified_amount = order.amount
-        self.__user_order_repo.update_by({"id": order.id}, data=order.model_dump(exclude={"id"}))
+        await self.__user_order_repo.update_by({"id": order.id}, data=order.model_dump(exclude={"id"}))
 
         ephemeral = create_payment_ephemeral(payment_intent.customer)
         response = PaymentIntentResponse(publishable_key=os.getenv("STRIPE_PUBLIC_KEY"),
@@ -156,8 +159,8 @@ class UserBundleService:
         return ResponseHelper.success_data_response(response, 0)
 
     async def get_user_esims(self, user: UserModel) -> Response[List[EsimBundleResponse]]:
-        user_profiles = self.__user_profile_repo.select(tables={DatabaseTables.TABLE_USER_PROFILE_BUNDLE: "*"},
-                                                        where={"user_id": user.id})
+        user_profiles = await self.__user_profile_repo.select(tables={DatabaseTables.TABLE_USER_PROFILE_BUNDLE: "*"},
+                                                              where={"user_id": user.id})
         esim_bundle_response = []
         for profile in user_profiles:
             try:
@@ -171,32 +174,45 @@ class UserBundleService:
         return ResponseHelper.success_data_response(esim_bundle_response, len(esim_bundle_response))
 
     async def get_user_esim(self, iccid: str, user: UserModel) -> Response[EsimBundleResponse | None]:
-        user_profiles = self.__user_profile_repo.select(tables={DatabaseTables.TABLE_USER_PROFILE_BUNDLE: "*"},
-                                                        where={"user_id": user.id, "iccid": iccid})
+        user_profiles = await self.__user_profile_repo.select(tables={DatabaseTables.TABLE_USER_PROFILE_BUNDLE: "*"},
+                                                              where={"user_id": user.id, "iccid": iccid})
         if len(user_profiles) == 0:
             raise CustomException(code=404, name="Not Found", details="user profile not found")
         return ResponseHelper.success_data_response(DtoMapper.to_esim_bundle_response(user_profiles[0]), 0)
 
     async def consumption(self, user: UserModel, iccid: str) -> Response[ConsumptionResponse]:
-        profile = self.__user_profile_repo.get_first_by({"user_id": user.id, "iccid": iccid})
+        profile = await self.__user_profile_repo.get_first_by({"user_id": user.id, "iccid": iccid})
         consumption = await self.__esim_hub_service.get_bundle_consumption(profile.esim_hub_order_id)
         return ResponseHelper.success_data_response(consumption, 0)
 
-    async def user_notifications(self, user: UserModel, page_index: int, page_size: int) -> Response[
-        List[UserNotificationResponse]]:
-        notifications = self.__notification_repo.list(where={"user_id": user.id}, limit=page_size,
-                                                      offset=((page_index - 1) * page_size), order_by="created_at",
-                                                      desc=True)
-        return ResponseHelper.success_data_response(
-            [DtoMapper.to_user_notification_response(data) for data in notifications], 1)
-
-    async def read_user_notification(self, user: UserModel, device_id) -> Response:
+    async def user_notifications(self, user: UserModel, page_index: int, page_size: int, cursor: str = None,
+                                 include_total: bool = False) -> CursorResponse[List[UserNotificationResponse]]:
+        # page_index is only honoured without a cursor, for clients still paging by offset
+        rows = await self.__notification_repo.list_keyset(where={"user_id": user.id}, after=decode_cursor(cursor),
+                                                          limit=page_size + 1,
+                                                          offset=0 if cursor else (page_index - 1) * page_size)
+        notifications, next_cursor = keyset_page(rows, page_size)
+        total_count = await self.__counted_total(user.id, "notification_count") if include_total else len(
+            notifications)
+        return ResponseHelper.success_cursor_response(
+            [DtoMapper.to_user_notification_response(data) for data in notifications], total_count, next_cursor)
+
+    async def __counted_total(self, user_id: str, counter: str) -> int:
+        # kept up to date by triggers on notification and user_order, see user_counter in supabase_ddl.sql
+        user_counter = await self.__user_counter_repo.get_first_by({"user_id": user_id})
+        return getattr(user_counter, counter) if user_counter else 0
+
+    async def unread_notifications_count(self, user: UserModel) -> Response[int]:
+        unread_count = await self.__counted_total(user.id, "unread_notification_count")
+        return ResponseHelper.success_data_response(unread_count, unread_count)
+
+    async def read_user_notification(self, user: UserModel, device_id, up_to: int = None) -> Response:
         logger.info("read user notification for user {}".format(user.email))
-        self.__notification_repo.update_by(where={"user_id": user.id}, data={"status": True})
+        await self.__notification_repo.mark_read(user.id, up_to)
         return ResponseHelper.success_response()
 
     async def bundle_exists(self, user_id: str, bundle_id: str) -> Response[bool]:
-        orders = self.__user_order_repo.select(tables={DatabaseTables.TABLE_USER_PROFILE: "*"}, where={
+        orders = await self.__user_order_repo.select(tables={DatabaseTables.TABLE_USER_PROFILE: "*"}, where={
             "user_id": user_id,
             "bundle_id": bundle_id,
             "payment_status": "success",
@@ -211,26 +227,26 @@ class UserBundleService:
         return ResponseHelper.success_data_response(False, 0)
 
     async def update_bundle_name(self, code: str, bundle_label_request: UpdateBundleLabelRequest, user: UserModel):
-        user_profile_bundle = self.__user_profile_bundle_repo.get_first_by(where={"user_id": user.id},
-                                                                           filters={
-                                                                               "bundle_data ->> bundle_code": code})
+        user_profile_bundle = await self.__user_profile_bundle_repo.get_first_by(where={"user_id": user.id},
+                                                                                 filters={
+                                                                                     "bundle_data ->> bundle_code": code})
         if user_profile_bundle is None:
             raise CustomException(code=400, name="DB Exception", details="Bundle Not Found")
         bundle = BundleDTO.model_validate(user_profile_bundle.bundle_data)
         bundle.label = bleach.clean(bundle_label_request.label)
-        self.__user_profile_bundle_repo.update_by(
+        await self.__user_profile_bundle_repo.update_by(
             where={"user_id": user.id}, filters={"bundle_data ->> bundle_code ": code},
             data={"bundle_data": bundle.model_dump()})
         return ResponseHelper.success_response()
 
     async def update_bundle_name_by_iccid(self, iccid: str, bundle_label_request: UpdateBundleLabelRequest,
                                           user: UserModel):
-        user_profile_bundle = self.__user_profile_bundle_repo.get_first_by(where={"user_id": user.id, "iccid": iccid})
+        user_profile_bundle = await self.__user_profile_bundle_repo.get_first_by(where={"user_id": user.id, "iccid": iccid})
         if user_profile_bundle is None:
             raise CustomException(code=400, name="DB Exception", details="Bundle Not Found")
         bundle = BundleDTO.model_validate(user_profile_bundle.bundle_data)
         bundle.label = bleach.clean(bundle_label_request.label)
-        self.__user_profile_bundle_repo.update_by(
+        await self.__user_profile_bundle_repo.update_by(
             where={"user_id": user.id, "iccid": iccid},
             data={"bundle_data": bundle.model_dump()})
         return ResponseHelper.success_response()
@@ -238,7 +254,7 @@ class UserBundleService:
     async def get_topup_related_bundle(self, bundle_code: str, iccid: str, user: UserModel, accept_language: str = "en",
                                        currency_code: str = os.getenv("DEFAULT_CURRENCY")) -> Response[
         List[BundleDTO]]:
-        profile = self.__user_profile_repo.get_first_by({"user_id": user.id, "iccid": iccid})
+        profile = await self.__user_profile_repo.get_first_by({"user_id": user.id, "iccid": iccid})
         if not profile:
             raise BadRequestException(details="This ICCID is not linked to this user")
         bundles = await self.__esim_hub_service.get_topup_related_bundles(bundle_code=bundle_code,
@@ -254,7 +270,7 @@ class UserBundleService:
         return ResponseHelper.success_data_response(all_bundles, len(all_bundles))
 
     async def get_user_esim_by_order_id(self, order_id: str, user: UserModel) -> Response[EsimBundleResponse]:
-        user_order = self.__user_order_repo.get_first_by({"user_id": user.id, "id": order_id})
+        user_order = await self.__user_order_repo.get_first_by({"user_id": user.id, "id": order_id})
         if not user_order:
             raise CustomException(code=404, name=f"Order Not Found", details="Order not found")
         if user_order.payment_status != OrderStatusEnum.SUCCESS:
@@ -263,23 +279,25 @@ class UserBundleService:
         if user_order.order_status != OrderStatusEnum.SUCCESS:
             raise CustomException(code=400, name=f"Order {user_order.order_status}",
                                   details="Order Failed Please try again")
-        profiles = self.__user_profile_repo.select(tables={DatabaseTables.TABLE_USER_PROFILE_BUNDLE: "*"},
-                                                   where={"user_id": user.id, "user_order_id": order_id})
+        profiles = await self.__user_profile_repo.select(tables={DatabaseTables.TABLE_USER_PROFILE_BUNDLE: "*"},
+                                                         where={"user_id": user.id, "user_order_id": order_id})
         if len(profiles) == 0:
             raise CustomException(code=404, name="Not Found", details="Order Not Found")
         return ResponseHelper.success_data_response(DtoMapper.to_esim_bundle_response(profiles[0]), 0)
 
-    async def get_order_history(self, user_id: str, page_index: int, page_size: int) -> Response[
-        List[UserOrderHistoryResponse]]:
-        user_orders = self.__user_order_repo.list(
+    async def get_order_history(self, user_id: str, page_index: int, page_size: int, cursor: str = None,
+                                include_total: bool = False) -> CursorResponse[List[UserOrderHistoryResponse]]:
+        rows = await self.__user_order_repo.list_keyset(
             where={"user_id": user_id, "payment_status": OrderStatusEnum.SUCCESS,
-                   "order_status": OrderStatusEnum.SUCCESS}, limit=page_size,
-            offset=((page_index - 1) * page_size))
-        return ResponseHelper.success_data_response([DtoMapper.to_user_order_history(data) for data in user_orders],
-                                                    len(user_orders))
+                   "order_status": OrderStatusEnum.SUCCESS}, after=decode_cursor(cursor), limit=page_size + 1,
+            offset=0 if cursor else (page_index - 1) * page_size)
+        user_orders, next_cursor = keyset_page(rows, page_size)
+        total_count = await self.__counted_total(user_id, "order_count") if include_total else len(user_orders)
+        return ResponseHelper.success_cursor_response(
+            [DtoMapper.to_user_order_history(data) for data in user_orders], total_count, next_cursor)
 
     async def get_order_history_by_id(self, user_id: str, order_id: str) -> Response[UserOrderHistoryResponse]:
-        order = self.__user_order_repo.get_first_by({"user_id": user_id, "id": order_id})
+        order = await self.__user_order_repo.get_first_by({"user_id": user_id, "id": order_id})
         payment_details = stripe_get_payment_details(order.payment_intent_code)
         user_order_history = DtoMapper.to_user_order_history(order)
         user_order_history.payment_details = payment_details
@@ -287,17 +305,17 @@ class UserBundleService:
 
     async def cancel_order(self, order_id: str, user: UserModel) -> Response[None]:
         try:
-            order = self.__user_order_repo.get_first_by({"user_id": user.id, "id": order_id})
+            order = await self.__user_order_repo.get_first_by({"user_id": user.id, "id": order_id})
             if not order:
                 raise CustomException(code=404, name=f"Order Not Found", details="Order not found")
-            self.__user_order_repo.update(order_id, {"order_status": OrderStatusEnum.CANCELED})
+            await self.__user_order_repo.update(order_id, {"order_status": OrderStatusEnum.CANCELED})
             stripe.PaymentIntent.cancel(order.payment_intent_code)
             return ResponseHelper.success_response()
         except Exception as e:
             raise CustomException(code=400, name=f" Error While Canceling Order {order_id}", details=str(e))
 
     async def resend_order_otp(self, user: UserModel, order_id: str) -> Response[None]:
-        order = self.__user_order_repo.get_first_by({"user_id": user.id, "id": order_id})
+        order = await self.__user_order_repo.get_first_by({"user_id": user.id, "id": order_id})
         if not order:
             raise BadRequestException(f"Order {order_id} not found")
         await self.__dcb_service.resend_otp(msisdn=user.msisdn, transaction_id=order.id)
@@ -305,7 +323,7 @@ class UserBundleService:
 
     async def verify_order_otp(self, user: UserModel, request: VerifyOtpRequestDto) -> Response[None]:
         logger.info(f"receiving verification otp request {request}")
-        user_order: UserOrderModel = self.__user_order_repo.get_by_id(record_id=request.order_id)
+        user_order: UserOrderModel = await self.__user_order_repo.get_by_id(record_id=request.order_id)
         if not user_order:
             raise BadRequestException("Order not found")
 
@@ -347,7 +365,7 @@ class UserBundleService:
     async def __handle_dcb_payment(self, user: UserModel, user_order: UserOrderModel, bundle: BundleDTO) -> Response[
         PaymentIntentResponse]:
         otp = generate_otp()
-        self.__user_order_repo.update_by(where={"id": user_order.id}, data={"otp": otp})
+        await self.__user_order_repo.update_by(where={"id": user_order.id}, data={"otp": otp})
         msisdn = user.msisdn
         logger.info(f"requesting new otp for msisdn: {msisdn}")
         await self.__dcb_service.payment_request(user_msisdn=user.msisdn,
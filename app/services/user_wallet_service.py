@@ -1,3 +1,4 @@
+import asyncio
 import os
 import threading
 
@@ -10,6 +11,7 @@ from app.config.push_notification_manager import fcm_service
 from app.exceptions import CustomException
 from app.models.user import UserWalletModel, UserModel
 from app.repo import UserWalletRepo, UserOrderRepo, UserWalletTransactionRepo
+from app.repo.async_repo import AsyncRepository
 from app.schemas.bundle import PaymentIntentResponse
 from app.schemas.dto_mapper import DtoMapper
 from app.schemas.response import Response, ResponseHelper
@@ -19,23 +21,23 @@ from app.schemas.user_wallet import UserWalletResponse
 
 class UserWalletService:
     def __init__(self):
-        self.__user_wallet_repo = UserWalletRepo()
-        self.__user_order_repo = UserOrderRepo()
-        self.__user_wallet_transaction_repo = UserWalletTransactionRepo()
+        self.__user_wallet_repo = AsyncRepository(UserWalletRepo())
+        self.__user_order_repo = AsyncRepository(UserOrderRepo())
+        self.__user_wallet_transaction_repo = AsyncRepository(UserWalletTransactionRepo())
 
     async def get_user_wallet_by_id(self, user_wallet_id: str) -> UserWalletResponse | None:
-        wallet: UserWalletModel = self.__user_wallet_repo.get_first_by({"id": user_wallet_id})
+        wallet: UserWalletModel = await self.__user_wallet_repo.get_first_by({"id": user_wallet_id})
         if not wallet:
             return None
         return DtoMapper.to_user_wallet_response(wallet)
 
     async def create_wallet(self, user_wallet_request_dto: UserWalletRequestDto) -> UserWalletResponse:
-        wallet = self.__create_wallet(user_id=user_wallet_request_dto.user_id, amount=user_wallet_request_dto.amount,
-                                      currency=user_wallet_request_dto.currency)
+        wallet = await self.__create_wallet(user_id=user_wallet_request_dto.user_id, amount=user_wallet_request_dto.amount,
+                                            currency=user_wallet_request_dto.currency)
         return DtoMapper.to_user_wallet_response(wallet)
 
     async def get_user_wallet_by_user_id(self, user_id: str) -> UserWalletResponse | None:
-        wallet: UserWalletModel = self.__user_wallet_repo.get_first_by({"user_id": user_id})
+        wallet: UserWalletModel = await self.__user_wallet_repo.get_first_by({"user_id": user_id})
         if not wallet:
             return None
         return DtoMapper.to_user_wallet_response(wallet)
@@ -43,7 +45,7 @@ class UserWalletService:
     async def add_wallet_transaction(self, amount: float, user_id: str, source: str = "TopUp") -> Response[
         UserWalletResponse]:
         try:
-            user_wallet: UserWalletModel = self.__user_wallet_repo.get_first_by(where={"user_id": user_id})
+            user_wallet: UserWalletModel = await self.__user_wallet_repo.get_first_by(where={"user_id": user_id})
             if user_wallet is None:
                 raise CustomException(code=400, name="wallet not found", details="user wallet not found")
 
@@ -51,10 +53,10 @@ class UserWalletService:
             #     raise CustomException(code=400, name="amount cannot be negative", details="amount cannot be negative")
 
             user_wallet.amount += amount
-            self.__user_wallet_repo.update_by(where={"user_id": user_id},
-                                              data=user_wallet.model_dump())
+            await self.__user_wallet_repo.update_by(where={"user_id": user_id},
+                                                    data=user_wallet.model_dump())
 
-            self.__user_wallet_transaction_repo.create(data={
+            await self.__user_wallet_transaction_repo.create(data={
                 "wallet_id": user_wallet.id,
                 "amount": amount,
                 "source": source,
@@ -71,10 +73,10 @@ class UserWalletService:
     async def top_up_wallet(self, top_up_request: TopUpWalletRequest, user: UserModel) -> Response[
         PaymentIntentResponse]:
         currency = os.getenv("DEFAULT_CURRENCY")
-        user_wallet = self.__user_wallet_repo.get_first_by(where={"user_id": user.id})
+        user_wallet = await self.__user_wallet_repo.get_first_by(where={"user_id": user.id})
         if not user_wallet:
-            user_wallet = self.__create_wallet(user_id=user.user_id, amount=0, currency=currency)
-        order = self.__user_order_repo.create(data={
+            user_wallet = await self.__create_wallet(user_id=user.user_id, amount=0, currency=currency)
+        order = await self.__user_order_repo.create(data={
             "user_id": user.id,
             "bundle_id": None,
             "order_type": UserOrderType.WALLET_TOP_UP,
@@ -95,7 +97,7 @@ class UserWalletService:
                                              })
 
         order.payment_intent_code = intent.id
-        self.__user_order_repo.update_by({"id": order.id}, data=order.model_dump(exclude={"id"}))
+        await self.__user_order_repo.update_by({"id": order.id}, data=order.model_dump(exclude={"id"}))
         ephemeral = create_payment_ephemeral(intent.customer)
         response = PaymentIntentResponse(publishable_key=os.getenv("STRIPE_PUBLIC_KEY"),
                                          merchant_identifier=os.getenv("MERCHANT_ID"),
@@ -108,8 +110,8 @@ class UserWalletService:
                                          order_id=order.id)
         return ResponseHelper.success_data_response(response, 0)
 
-    def __create_wallet(self, user_id: str, amount: float, currency: str):
-        wallet = self.__user_wallet_repo.create(data={
+    async def __create_wallet(self, user_id: str, amount: float, currency: str):
+        wallet = await self.__user_wallet_repo.create(data={
             "user_id": user_id,
             "amount": amount,
             "currency": currency
@@ -120,4 +122,4 @@ class UserWalletService:
 
     def __send_push(self,amount:float,currency:str,user_id:str):
         content = send_wallet_top_up_succeeded_notification(f"{amount} {currency}")
-        fcm_service.send_notification_to_user_from_template(content, user_id=user_id)
+        asyncio.run(fcm_service.send_notification_to_user_from_template(content, user_id=user_id))
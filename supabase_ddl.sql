@@ -452,4 +452,176 @@ DROP CONSTRAINT promotion_usage_status_check;
 
 ALTER TABLE promotion_usage
 ADD CONSTRAINT promotion_usage_status_check
-CHECK (status IN ('pending', 'success', 'failed'));
\ No newline at end of file
+CHECK (status IN ('pending', 'success', 'failed'));
+
+-- query indexes
+-- supporting indexes for the filters used by the repositories, checked by tests/db/test_query_plans.py
+
+-- catalog: bundles of a tag, and the existence check of a bundle/tag pair in the bundle sync
+CREATE INDEX IF NOT EXISTS bundle_tag_tag_id_idx ON bundle_tag (tag_id);
+CREATE INDEX IF NOT EXISTS bundle_tag_bundle_id_tag_id_idx ON bundle_tag (bundle_id, tag_id);
+
+-- user esims and consumption by iccid
+CREATE INDEX IF NOT EXISTS user_profile_user_id_iccid_idx ON user_profile (user_id, iccid);
+
+-- order history, newest first
+CREATE INDEX IF NOT EXISTS user_order_user_id_status_idx
+    ON user_order (user_id, payment_status, order_status, created_at DESC, id DESC);
+
+-- user notifications, newest first
+CREATE INDEX IF NOT EXISTS notification_user_id_created_at_idx ON notification (user_id, created_at DESC, id DESC);
+
+-- unread notifications of a user up to the mark read watermark
+CREATE INDEX IF NOT EXISTS notification_user_id_unread_idx ON notification (user_id, id) WHERE status IS NOT TRUE;
+
+-- push tokens of the logged in devices of a user
+CREATE INDEX IF NOT EXISTS device_user_id_logged_in_idx ON device (user_id) WHERE is_logged_in;
+
+-- promotion usage of a user per code
+CREATE INDEX IF NOT EXISTS promotion_usage_user_id_promotion_code_idx ON promotion_usage (user_id, promotion_code);
+
+-- referral code lookups on the user metadata
+CREATE INDEX IF NOT EXISTS users_copy_referral_code_idx ON users_copy ((metadata ->> 'referral_code'));
+-- end query indexes
+
+
+-- per user counters, read instead of counting rows for paginated totals
+CREATE TABLE IF NOT EXISTS user_counter
+(
+    user_id            UUID                    NOT NULL PRIMARY KEY REFERENCES auth.users (id),
+    notification_count INTEGER   DEFAULT 0     NOT NULL,
+    order_count        INTEGER   DEFAULT 0     NOT NULL,
+    updated_at         TIMESTAMP DEFAULT NOW() NOT NULL
+);
+
+ALTER TABLE user_counter
+    OWNER TO postgres;
+
+GRANT SELECT ON user_counter TO anon;
+GRANT SELECT ON user_counter TO authenticated;
+GRANT DELETE, INSERT, REFERENCES, SELECT, TRIGGER, TRUNCATE, UPDATE ON user_counter TO service_role;
+
+CREATE OR REPLACE FUNCTION bump_user_counter(p_user_id UUID, p_counter TEXT, p_delta INTEGER) RETURNS VOID
+    LANGUAGE plpgsql
+    SECURITY DEFINER
+    SET search_path = public
+AS
+$$
+BEGIN
+    IF p_user_id IS NULL OR p_delta = 0 THEN
+        RETURN;
+    END IF;
+    EXECUTE format('INSERT INTO user_counter (user_id, %1$I) VALUES ($1, GREATEST($2, 0)) '
+                       'ON CONFLICT (user_id) DO UPDATE '
+                       'SET %1$I = GREATEST(user_counter.%1$I + $2, 0), updated_at = NOW()', p_counter)
+        USING p_user_id, p_delta;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION count_user_notification() RETURNS TRIGGER
+    LANGUAGE plpgsql
+AS
+$$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM bump_user_counter(OLD.user_id, 'notification_count', -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM bump_user_counter(NEW.user_id, 'notification_count', 1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS notification_user_counter ON notification;
+CREATE TRIGGER notification_user_counter
+    AFTER INSERT OR DELETE OR UPDATE OF user_id
+    ON notification
+    FOR EACH ROW
+EXECUTE FUNCTION count_user_notification();
+
+-- only successful orders are listed in the order history
+CREATE OR REPLACE FUNCTION count_user_order() RETURNS TRIGGER
+    LANGUAGE plpgsql
+AS
+$$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.payment_status = 'success' AND OLD.order_status = 'success' THEN
+        PERFORM bump_user_counter(OLD.user_id, 'order_count', -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.payment_status = 'success' AND NEW.order_status = 'success' THEN
+        PERFORM bump_user_counter(NEW.user_id, 'order_count', 1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS user_order_user_counter ON user_order;
+CREATE TRIGGER user_order_user_counter
+    AFTER INSERT OR DELETE OR UPDATE OF user_id, payment_status, order_status
+    ON user_order
+    FOR EACH ROW
+EXECUTE FUNCTION count_user_order();
+
+-- backfill of the counters for the rows written before the triggers
+INSERT INTO user_counter (user_id, notification_count, order_count)
+SELECT user_id, SUM(notification_count), SUM(order_count)
+FROM (SELECT user_id, COUNT(*) AS notification_count, 0 AS order_count
+      FROM notification
+      WHERE user_id IS NOT NULL
+      GROUP BY user_id
+      UNION ALL
+      SELECT user_id, 0, COUNT(*)
+      FROM user_order
+      WHERE payment_status = 'success'
+        AND order_status = 'success'
+      GROUP BY user_id) counts
+GROUP BY user_id
+ON CONFLICT (user_id) DO UPDATE SET notification_count = EXCLUDED.notification_count,
+                                    order_count        = EXCLUDED.order_count,
+                                    updated_at         = NOW();
+
+
+-- unread notifications counter
+ALTER TABLE user_counter
+    ADD COLUMN IF NOT EXISTS unread_notification_count INTEGER DEFAULT 0 NOT NULL;
+
+CREATE OR REPLACE FUNCTION count_user_notification() RETURNS TRIGGER
+    LANGUAGE plpgsql
+AS
+$$
+BEGIN
+    -- marking as read only moves the unread counter
+    IF TG_OP = 'UPDATE' AND OLD.user_id IS NOT DISTINCT FROM NEW.user_id THEN
+        PERFORM bump_user_counter(NEW.user_id, 'unread_notification_count',
+                                  (NEW.status IS NOT TRUE)::INTEGER - (OLD.status IS NOT TRUE)::INTEGER);
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM bump_user_counter(OLD.user_id, 'notification_count', -1);
+        PERFORM bump_user_counter(OLD.user_id, 'unread_notification_count', -(OLD.status IS NOT TRUE)::INTEGER);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM bump_user_counter(NEW.user_id, 'notification_count', 1);
+        PERFORM bump_user_counter(NEW.user_id, 'unread_notification_count', (NEW.status IS NOT TRUE)::INTEGER);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS notification_user_counter ON notification;
+CREATE TRIGGER notification_user_counter
+    AFTER INSERT OR DELETE OR UPDATE OF user_id, status
+    ON notification
+    FOR EACH ROW
+EXECUTE FUNCTION count_user_notification();
+
+-- backfill of the unread counters for the rows written before the trigger
+INSERT INTO user_counter (user_id, unread_notification_count)
+SELECT user_id, COUNT(*)
+FROM notification
+WHERE user_id IS NOT NULL
+  AND status IS NOT TRUE
+GROUP BY user_id
+ON CONFLICT (user_id) DO UPDATE SET unread_notification_count = EXCLUDED.unread_notification_count,
+                                    updated_at                = NOW();
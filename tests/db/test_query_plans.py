@@ -0,0 +1,126 @@
+import json
+import os
+import re
+import unittest
+import uuid
+from pathlib import Path
+
+try:
+    import psycopg as pg_driver
+except ImportError:
+    try:
+        import psycopg2 as pg_driver
+    except ImportError:
+        pg_driver = None
+
+DATABASE_URL = os.getenv("QUERY_PLAN_DATABASE_URL")
+DDL_FILE = Path(__file__).resolve().parents[2] / "supabase_ddl.sql"
+
+# the full ddl needs the supabase auth schema and roles, the plans only need the indexed columns
+TABLES = """
+CREATE TABLE bundle_tag (id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY, bundle_id UUID NOT NULL,
+                         tag_id UUID NOT NULL, is_active BOOLEAN DEFAULT TRUE);
+CREATE TABLE user_profile (id UUID DEFAULT gen_random_uuid() PRIMARY KEY, user_id UUID, iccid VARCHAR(100) NOT NULL);
+CREATE TABLE user_order (id UUID DEFAULT gen_random_uuid() PRIMARY KEY, user_id UUID NOT NULL,
+                         payment_status VARCHAR NOT NULL, order_status VARCHAR NOT NULL,
+                         created_at TIMESTAMP DEFAULT NOW() NOT NULL, bundle_data TEXT);
+CREATE TABLE notification (id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY, user_id UUID,
+                           created_at TIMESTAMP DEFAULT NOW() NOT NULL, title TEXT, status BOOLEAN);
+CREATE TABLE device (id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY, user_id UUID, fcm_token VARCHAR,
+                     is_logged_in BOOLEAN NOT NULL);
+CREATE TABLE promotion_usage (id UUID DEFAULT gen_random_uuid() PRIMARY KEY, user_id UUID, promotion_code VARCHAR,
+                              status VARCHAR(20) NOT NULL DEFAULT 'pending');
+CREATE TABLE users_copy (id UUID NOT NULL PRIMARY KEY, email TEXT UNIQUE, metadata JSONB);
+"""
+
+# user ids are derived from the row number so the queries below can target a known user
+USER_ID = "md5('user-' || (i % 2000))::uuid"
+DATA = f"""
+INSERT INTO bundle_tag (bundle_id, tag_id)
+SELECT md5('bundle-' || i)::uuid, md5('tag-' || (i % 300))::uuid FROM generate_series(1, 60000) i;
+INSERT INTO user_profile (user_id, iccid) SELECT {USER_ID}, 'iccid-' || i FROM generate_series(1, 40000) i;
+INSERT INTO user_order (user_id, payment_status, order_status, created_at, bundle_data)
+SELECT {USER_ID}, CASE WHEN i % 4 = 0 THEN 'pending' ELSE 'success' END, 'success',
+       NOW() - i * INTERVAL '1 minute', repeat('x', 200)
+FROM generate_series(1, 60000) i;
+INSERT INTO notification (user_id, created_at, title, status)
+SELECT {USER_ID}, NOW() - i * INTERVAL '1 minute', 'title ' || i, i % 3 = 0 FROM generate_series(1, 60000) i;
+INSERT INTO device (user_id, fcm_token, is_logged_in)
+SELECT {USER_ID}, 'token-' || i, i % 10 = 0 FROM generate_series(1, 40000) i;
+INSERT INTO promotion_usage (user_id, promotion_code, status)
+SELECT {USER_ID}, 'code-' || (i % 50), 'completed' FROM generate_series(1, 40000) i;
+INSERT INTO users_copy (id, email, metadata)
+SELECT md5('user-' || i)::uuid, 'user' || i || '@example.com', jsonb_build_object('referral_code', 'ref-' || i)
+FROM generate_series(1, 20000) i;
+ANALYZE;
+"""
+
+USER = "md5('user-7')::uuid"
+
+# the query each repository method sends through postgrest, and the index its plan must use
+PLANS = {
+    "bundle_tag_tag_id_idx": "SELECT bundle_id FROM bundle_tag WHERE tag_id = md5('tag-7')::uuid",
+    "bundle_tag_bundle_id_tag_id_idx": "SELECT id FROM bundle_tag "
+                                       "WHERE bundle_id = md5('bundle-7')::uuid AND tag_id = md5('tag-7')::uuid "
+                                       "LIMIT 1",
+    "user_profile_user_id_iccid_idx": f"SELECT * FROM user_profile WHERE user_id = {USER} AND iccid = 'iccid-7' "
+                                      f"LIMIT 1",
+    "user_order_user_id_status_idx": f"SELECT * FROM user_order WHERE user_id = {USER} "
+                                     f"AND payment_status = 'success' AND order_status = 'success' "
+                                     f"ORDER BY created_at DESC, id DESC LIMIT 20",
+    "notification_user_id_created_at_idx": f"SELECT * FROM notification WHERE user_id = {USER} "
+                                           f"ORDER BY created_at DESC, id DESC LIMIT 20",
+    "notification_user_id_unread_idx": f"UPDATE notification SET status = TRUE WHERE user_id = {USER} "
+                                       f"AND status IS NOT TRUE AND id <= 30000",
+    "device_user_id_logged_in_idx": f"SELECT fcm_token FROM device WHERE user_id = {USER} AND is_logged_in",
+    "promotion_usage_user_id_promotion_code_idx": f"SELECT * FROM promotion_usage WHERE user_id = {USER} "
+                                                  f"AND promotion_code = 'code-7'",
+    "users_copy_referral_code_idx": "SELECT * FROM users_copy WHERE metadata ->> 'referral_code' = 'ref-7' LIMIT 1",
+}
+
+
+def get_index_statements() -> str:
+    ddl = DDL_FILE.read_text()
+    section = re.search(r"-- query indexes\n(.*?)-- end query indexes", ddl, re.DOTALL)
+    return section.group(1)
+
+
+def get_index_names(plan: dict) -> set:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= get_index_names(child)
+    return names
+
+
+@unittest.skipUnless(DATABASE_URL and pg_driver, "QUERY_PLAN_DATABASE_URL and psycopg are required")
+class TestQueryPlans(unittest.TestCase):
+    """
+    Loads synthetic rows into a throwaway schema, applies the query indexes section of
+    supabase_ddl.sql and checks the plan of each hot query still goes through its index.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.schema = f"query_plans_{uuid.uuid4().hex[:8]}"
+        cls.connection = pg_driver.connect(DATABASE_URL)
+        cls.connection.autocommit = True
+        cls.cursor = cls.connection.cursor()
+        cls.cursor.execute(f"CREATE SCHEMA {cls.schema}")
+        cls.cursor.execute(f"SET search_path TO {cls.schema}, public")
+        cls.cursor.execute(TABLES)
+        cls.cursor.execute(get_index_statements())
+        cls.cursor.execute(DATA)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.cursor.execute(f"DROP SCHEMA {cls.schema} CASCADE")
+        cls.connection.close()
+
+    def test_queries_use_indexes(self):
+        for index_name, query in PLANS.items():
+            with self.subTest(index_name):
+                self.cursor.execute(f"EXPLAIN (FORMAT JSON) {query}")
+                plan = self.cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                self.assertIn(index_name, get_index_names(plan[0]["Plan"]))
@@ -0,0 +1,46 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+from fastapi import Response
+
+from app.dependencies.catalog_cache import catalog_validator, catalog_locale_validator
+from app.exceptions import NotModifiedException
+
+
+class TestCatalogValidators(unittest.TestCase):
+
+    def setUp(self):
+        catalog_patcher = patch("app.dependencies.catalog_cache.catalog_service")
+        self.addCleanup(catalog_patcher.stop)
+        snapshot = catalog_patcher.start().get_snapshot.return_value
+        snapshot.version = "v1"
+        snapshot.resolve_locale.side_effect = lambda locale: "ar" if locale.startswith("ar") else "en"
+        currency_patcher = patch("app.dependencies.catalog_cache.currency_service")
+        self.addCleanup(currency_patcher.stop)
+        self.currency_service = currency_patcher.start()
+        self.currency_service.get_rate_by_currency.return_value = 0.9
+
+    @staticmethod
+    def get_request(if_none_match: str = None) -> MagicMock:
+        return MagicMock(headers={"If-None-Match": if_none_match} if if_none_match else {})
+
+    def test_locale_validator_ignores_rate_updates(self):
+        first = catalog_locale_validator(self.get_request(), Response(), accept_language="en-US")
+        priced = catalog_validator(self.get_request(), Response(), x_currency="EUR", accept_language="en")
+        self.currency_service.get_rate_by_currency.return_value = 0.95
+
+        with self.assertRaises(NotModifiedException):
+            catalog_locale_validator(self.get_request(first.etag), Response(), accept_language="en")
+        self.assertNotEqual(catalog_validator(self.get_request(priced.etag), Response(), x_currency="EUR",
+                                              accept_language="en").etag, priced.etag)
+        self.assertEqual(first.headers["Vary"], "Accept-Language")
+
+    def test_device_gated_responses_are_private(self):
+        response = Response()
+        catalog_validator(self.get_request(), response, x_currency="EUR", accept_language="ar")
+        self.assertTrue(response.headers["Cache-Control"].startswith("private"))
+        self.assertNotIn("s-maxage", response.headers["Cache-Control"])
+
+
+if __name__ == "__main__":
+    unittest.main()
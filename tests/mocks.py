@@ -1,4 +1,8 @@
+from unittest.mock import MagicMock
+
+from app.models.app import BundleModel
 from app.models.user import UserModel
+from app.repo.base_repo import BaseRepository
 from app.schemas.app import DeviceRequest
 from app.schemas.home import BundleDTO, CountryDTO, RegionDTO, BundleCategoryDTO
 
@@ -67,3 +71,17 @@ def get_device_request_mock():
   "screen_resolution": "string",
   "is_rooted": true
 }''')
+
+
+def get_bundle_repository_mock() -> BaseRepository:
+    repository = BaseRepository.__new__(BaseRepository)
+    repository.table_name = "bundle"
+    repository.model = BundleModel
+    repository.trusted_rows = False
+    repository.cache = None
+    repository.table = MagicMock()
+    select = repository.table.select.return_value
+    select.eq.return_value.execute.return_value = MagicMock(data=[{"id": "b1", "is_active": True}])
+    select.in_.return_value.execute.side_effect = lambda: MagicMock(
+        data=[{"id": record_id, "is_active": True} for record_id in select.in_.call_args.args[1]])
+    return repository
@@ -0,0 +1,41 @@
+import asyncio
+import unittest
+
+from app.repo.async_repo import AsyncRepository
+from app.repo.identity_map import request_identity_map
+from tests.mocks import get_bundle_repository_mock
+
+
+class TestIdentityMap(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.repository = get_bundle_repository_mock()
+        self.select = self.repository.table.select.return_value
+
+    def test_get_by_id_is_fetched_once_per_request(self):
+        with request_identity_map():
+            first = self.repository.get_by_id("b1")
+            first.is_active = False
+            second = self.repository.get_by_id("b1")
+        self.assertEqual(self.select.eq.call_count, 1)
+        self.assertTrue(second.is_active)
+
+        self.repository.get_by_id("b1")
+        self.assertEqual(self.select.eq.call_count, 2)
+
+    def test_write_forgets_table(self):
+        with request_identity_map():
+            self.repository.get_by_id("b1")
+            self.repository.update("b1", {"is_active": False})
+            self.repository.get_by_id("b1")
+        self.assertEqual(self.select.eq.call_count, 2)
+
+    async def test_concurrent_lookups_are_coalesced(self):
+        repository = AsyncRepository(self.repository)
+        with request_identity_map():
+            bundles = await asyncio.gather(repository.get_by_id("b1"), repository.get_by_id("b2"),
+                                           repository.get_by_id("b1"))
+            await repository.get_by_id("b2")
+        self.assertEqual([bundle.id for bundle in bundles], ["b1", "b2", "b1"])
+        self.select.in_.assert_called_once_with("id", ["b1", "b2"])
+        self.select.eq.assert_not_called()
@@ -0,0 +1,50 @@
+import unittest
+from unittest.mock import MagicMock
+
+from postgrest import SyncPostgrestClient
+
+from app.exceptions import BadRequestException
+from app.models.notification import NotificationModel
+from app.repo.base_repo import BaseRepository
+from app.repo.keyset import decode_cursor, keyset_page
+
+
+def get_notification(notification_id: int) -> NotificationModel:
+    return NotificationModel(id=notification_id, title="title", content="content",
+                             created_at=f"2025-01-01T10:00:{notification_id:02d}.123456", user_id="u1")
+
+
+class TestKeysetPagination(unittest.TestCase):
+
+    def setUp(self):
+        self.repository = BaseRepository.__new__(BaseRepository)
+        self.repository.table_name = "notification"
+        self.repository.model = NotificationModel
+        self.repository.trusted_rows = False
+        self.repository.cache = None
+        self.repository.table = SyncPostgrestClient("http://localhost").from_("notification")
+        self.repository._execute = MagicMock(return_value=MagicMock(data=[]))
+
+    def get_params(self) -> dict:
+        return dict(self.repository._execute.call_args.args[0].params)
+
+    def test_next_page_starts_after_cursor(self):
+        page, cursor = keyset_page([get_notification(3), get_notification(2), get_notification(1)], 2)
+        self.assertEqual([row.id for row in page], [3, 2])
+
+        self.repository.list_keyset(where={"user_id": "u1"}, after=decode_cursor(cursor), limit=3)
+        params = self.get_params()
+        self.assertEqual(params["order"], "created_at.desc,id.desc")
+        self.assertEqual(params["offset"], "0")
+        self.assertEqual(params["or"], '(created_at.lt."2025-01-01T10:00:02.123456",'
+                                       'and(created_at.eq."2025-01-01T10:00:02.123456",id.lt."2"))')
+
+    def test_last_page_has_no_cursor(self):
+        page, cursor = keyset_page([get_notification(1)], 2)
+        self.assertEqual(len(page), 1)
+        self.assertIsNone(cursor)
+        self.assertIsNone(decode_cursor(None))
+
+    def test_invalid_cursor_is_rejected(self):
+        with self.assertRaises(BadRequestException):
+            decode_cursor("not-a-cursor")
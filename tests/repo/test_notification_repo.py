@@ -0,0 +1,31 @@
+import unittest
+from unittest.mock import MagicMock
+
+from postgrest import SyncPostgrestClient
+
+from app.models.notification import NotificationModel
+from app.repo.notification_repo import NotificationRepo
+
+
+class TestMarkRead(unittest.TestCase):
+
+    def setUp(self):
+        self.repository = NotificationRepo.__new__(NotificationRepo)
+        self.repository.table_name = "notification"
+        self.repository.model = NotificationModel
+        self.repository.cache = None
+        self.repository.table = SyncPostgrestClient("http://localhost").from_("notification")
+        self.repository._execute = MagicMock(return_value=MagicMock(count=3))
+
+    def get_query(self):
+        return self.repository._execute.call_args.args[0]
+
+    def test_only_unread_rows_up_to_watermark_are_updated(self):
+        self.assertEqual(self.repository.mark_read("u1", up_to=42), 3)
+        query = self.get_query()
+        self.assertEqual(dict(query.params), {"user_id": "eq.u1", "status": "not.is.true", "id": "lte.42"})
+        self.assertIn("return=minimal", query.headers["prefer"])
+
+    def test_without_watermark_all_unread_rows_are_updated(self):
+        self.repository.mark_read("u1")
+        self.assertEqual(dict(self.get_query().params), {"user_id": "eq.u1", "status": "not.is.true"})
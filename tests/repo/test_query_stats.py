@@ -0,0 +1,24 @@
+import unittest
+from unittest.mock import patch
+
+from app.repo.query_stats import request_query_stats
+from tests.mocks import get_bundle_repository_mock
+
+
+class TestQueryStats(unittest.TestCase):
+
+    def test_calls_are_counted_per_request(self):
+        repository = get_bundle_repository_mock()
+        with request_query_stats("/bundles") as query_stats:
+            repository.get_by_id("b1")
+            repository.get_by_ids(["b2", "b3"])
+        repository.get_by_id("b1")
+        self.assertEqual(query_stats.calls, 2)
+        self.assertEqual(set(query_stats.operations), {("bundle", "get_by_id"), ("bundle", "get_by_ids")})
+
+    def test_repeated_shape_is_reported_once(self):
+        repository = get_bundle_repository_mock()
+        with patch("app.repo.query_stats.logger") as logger, request_query_stats("/bundles"):
+            for _ in range(8):
+                repository.get_by_id("b1")
+        logger.warning.assert_called_once()
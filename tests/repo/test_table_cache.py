@@ -0,0 +1,30 @@
+import unittest
+from unittest.mock import patch
+
+from app.repo.table_cache import TableCache
+from tests.mocks import get_bundle_repository_mock
+
+
+class TestTableCache(unittest.TestCase):
+
+    def setUp(self):
+        self.repository = get_bundle_repository_mock()
+        self.repository.cache = TableCache(ttl=60)
+        self.select = self.repository.table.select.return_value
+
+    def test_reads_are_served_from_cache_until_a_write(self):
+        first = self.repository.get_by_id("b1")
+        first.is_active = False
+        self.assertTrue(self.repository.get_by_id("b1").is_active)
+        self.assertEqual(self.select.eq.call_count, 1)
+
+        with patch("app.repo.base_repo.clear_table_cache", lambda table_name: self.repository.cache.clear()):
+            self.repository.update("b1", {"is_active": False})
+        self.repository.get_by_id("b1")
+        self.assertEqual(self.select.eq.call_count, 2)
+
+    def test_expired_entries_are_reloaded(self):
+        self.repository.cache.ttl = -1
+        self.repository.get_by_id("b1")
+        self.repository.get_by_id("b1")
+        self.assertEqual(self.select.eq.call_count, 2)
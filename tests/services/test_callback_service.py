@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from fastapi import HTTPException
+
+from app.services.callback_service import CallbackService
+
+
+def get_request(rate, secret: str = "secret") -> MagicMock:
+    request = MagicMock(headers={"X-Webhook-Secret": secret} if secret else {})
+    request.json = AsyncMock(return_value={"currency": "EUR", "rate": rate})
+    return request
+
+
+class TestExchangeRateWebhook(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        patcher = patch.dict("os.environ", {"EXCHANGE_RATE_WEBHOOK_SECRET": "secret"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        with patch("app.services.callback_service.CurrencyService") as currency_service:
+            self.service = CallbackService()
+        self.currency_service = currency_service.return_value
+
+    async def test_valid_rate_is_stored(self):
+        await self.service.handle_exchange_rate_update(get_request("0.92"))
+        self.currency_service.update_rate.assert_called_once_with(currency_name="EUR", rate=0.92)
+
+    async def test_missing_or_wrong_secret_is_rejected(self):
+        for secret in [None, "wrong"]:
+            with self.assertRaises(HTTPException) as context:
+                await self.service.handle_exchange_rate_update(get_request("0.92", secret))
+            self.assertEqual(context.exception.status_code, 401)
+        self.currency_service.update_rate.assert_not_called()
+
+    async def test_invalid_rates_are_rejected(self):
+        for rate in ["0", "-1", "nan", "inf", "rate"]:
+            with self.assertRaises(HTTPException) as context:
+                await self.service.handle_exchange_rate_update(get_request(rate))
+            self.assertEqual(context.exception.status_code, 400)
+        self.currency_service.update_rate.assert_not_called()
+
+
+class TestPlanEventCallback(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        with patch("app.services.callback_service.CurrencyService"):
+            self.service = CallbackService()
+        order = MagicMock(user_id="user", shared_user_id="user", validity="2026-01-31T00:00:00")
+        self.service._CallbackService__user_profile_repo = MagicMock(select=AsyncMock(return_value=[order]))
+        self.service._CallbackService__user_repo = MagicMock(get_by_id=AsyncMock(return_value=None))
+
+    async def test_every_order_gets_its_own_notification(self):
+        request = MagicMock()
+        request.json = AsyncMock(return_value={"event_type": "StartBundle", "iccid": "iccid", "order_id": "order"})
+        with patch("app.services.callback_service.ConsumptionLimitRequest.model_validate",
+                   side_effect=lambda data: MagicMock(**data)), \
+                patch("app.services.callback_service.DtoMapper.to_order_notification_model",
+                      side_effect=lambda order, user_id, metadata, iccid: MagicMock(user_id=user_id)), \
+                patch("app.services.callback_service.fcm_service") as fcm_service:
+            fcm_service.send_notifications_to_users_from_templates = AsyncMock()
+            await self.service.handle_plan_event_callback(request)
+
+        notifications = fcm_service.send_notifications_to_users_from_templates.call_args.args[0]
+        self.assertEqual([user_id for user_id, _ in notifications], ["user", "user"])
+
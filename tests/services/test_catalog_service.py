@@ -0,0 +1,181 @@
+import os
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+from app.exceptions import DatabaseException
+from app.models.app import BundleModel, TagModel, BundleTagModel, TagTranslationModel, AppConfigModel
+from app.schemas.home import BundleDTO, CountryDTO
+from app.services.catalog_service import CatalogSnapshot, CatalogService
+
+
+def get_country_data(tag_id: str, name: str) -> dict:
+    return {"id": tag_id, "alternative_country": name, "country": name, "country_code": tag_id.upper(),
+            "iso3_code": None, "zone_name": None}
+
+
+def get_catalog_rows():
+    bundles = [
+        BundleModel(id="b1", is_active=True, data={"bundle_code": "b1", "price": 12.0}),
+        BundleModel(id="b2", is_active=True, data={"bundle_code": "b2", "price": 5.0}),
+        BundleModel(id="b3", is_active=False, data={"bundle_code": "b3", "price": 1.0}),
+    ]
+    tags = [
+        TagModel(id="lb", tag_group_id=1, name="Lebanon", data=get_country_data("lb", "Lebanon")),
+        TagModel(id="fr", tag_group_id=1, name="France", data=get_country_data("fr", "France")),
+        TagModel(id="eu", tag_group_id=2, name="Europe", data={"guid": "eu", "region_name": "Europe"}),
+    ]
+    bundle_tags = [
+        BundleTagModel(bundle_id="b1", tag_id="lb"),
+        BundleTagModel(bundle_id="b1", tag_id="fr"),
+        BundleTagModel(bundle_id="b2", tag_id="lb"),
+        BundleTagModel(bundle_id="b2", tag_id="fr"),
+        BundleTagModel(bundle_id="b3", tag_id="lb"),
+        BundleTagModel(bundle_id="b3", tag_id="fr"),
+        BundleTagModel(bundle_id="b1", tag_id="eu"),
+    ]
+    translations = [TagTranslationModel(tag_id="lb", locale="ar", name="لبنان")]
+    return bundles, tags, bundle_tags, translations
+
+
+class TestCatalogSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        bundles, tags, bundle_tags, translations = get_catalog_rows()
+        self.snapshot = CatalogSnapshot(version="v1", bundles=bundles, tags=tags, bundle_tags=bundle_tags,
+                                        translations=translations)
+
+    def test_get_bundles_by_tags_is_price_ordered_and_active_only(self):
+        bundles = self.snapshot.get_bundles_by_tags(["lb", "fr"])
+        self.assertEqual([bundle.id for bundle in bundles], ["b2", "b1"])
+
+    def test_get_bundles_by_tags_requires_every_tag(self):
+        bundles = self.snapshot.get_bundles_by_tags(["lb", "eu"])
+        self.assertEqual([bundle.id for bundle in bundles], ["b1"])
+        self.assertEqual(self.snapshot.get_bundles_by_tags(["unknown"]), [])
+
+    def test_get_bundles_by_tags_matches_brute_force(self):
+        tag_ids = [f"t{index}" for index in range(6)]
+        bundles = [BundleModel(id=f"b{index}", is_active=index % 7 != 0, data={"price": (index * 37) % 101})
+                   for index in range(300)]
+        bundle_tags = [BundleTagModel(bundle_id=bundle.id, tag_id=tag_id)
+                       for index, bundle in enumerate(bundles)
+                       for position, tag_id in enumerate(tag_ids) if index % (position + 2) != 1]
+        snapshot = CatalogSnapshot(version="v1", bundles=bundles, tags=[], bundle_tags=bundle_tags, translations=[])
+
+        searched = tag_ids[:4]
+        edges = {(edge.bundle_id, edge.tag_id) for edge in bundle_tags}
+        expected = sorted(
+            [bundle for bundle in bundles if bundle.is_active and all(
+                (bundle.id, tag_id) in edges for tag_id in searched)],
+            key=lambda bundle: (bundle.data["price"], bundle.id))
+        self.assertEqual(snapshot.get_bundles_by_tags(searched), expected)
+
+    def test_get_translated_tags_falls_back_to_tag_name(self):
+        tags = self.snapshot.get_translated_tags(["lb", "fr"], locale="ar")
+        self.assertEqual([tag.name for tag in tags], ["لبنان", "France"])
+
+    def test_get_translated_tags_returns_copies(self):
+        tag = self.snapshot.get_translated_tags(["lb"], locale="ar")[0]
+        tag.data["country"] = tag.name
+        self.assertEqual(self.snapshot.get_tag("lb").data["country"], "Lebanon")
+
+    def test_accept_language_resolves_to_translated_locale(self):
+        self.assertEqual(self.snapshot.resolve_locale("ar"), "ar")
+        self.assertEqual(self.snapshot.resolve_locale("AR-lb,en;q=0.8"), "ar")
+        self.assertEqual(self.snapshot.resolve_locale("de-DE,ar;q=0.5"), "ar")
+        for header in [None, "", "fr", "x" * 4096]:
+            self.assertEqual(self.snapshot.resolve_locale(header), "en")
+
+    def test_localized_countries_are_cached_per_supported_locale(self):
+        arabic = self.snapshot.get_localized_countries(["lb"], locale="ar-LB")
+        self.assertIs(self.snapshot.get_localized_countries(["lb"], locale="ar"), arabic)
+        self.assertEqual(arabic["lb"].country, "لبنان")
+        self.assertIs(self.snapshot.get_localized_countries(["lb"], locale="unknown-1"),
+                      self.snapshot.get_localized_countries(["lb"], locale="unknown-2"))
+
+    def test_localize_bundles_resolves_countries_once_per_locale(self):
+        lb, fr, xx = (CountryDTO(**get_country_data(tag_id, tag_id)) for tag_id in ("lb", "fr", "xx"))
+        bundles = [BundleDTO.model_construct(bundle_code="b1", countries=[lb, fr]),
+                   BundleDTO.model_construct(bundle_code="b2", countries=[lb, xx])]
+        self.snapshot.localize_bundles(bundles, locale="ar")
+        self.assertEqual([country.country for country in bundles[0].countries], ["لبنان", "France"])
+        self.assertEqual([country.country for country in bundles[1].countries], ["لبنان"])
+        self.assertIs(bundles[0].countries[0], bundles[1].countries[0])
+
+
+class TestCatalogService(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        os.environ["CATALOG_VERSION_CHECK_SECONDS"] = "3600"
+
+    def setUp(self):
+        bundles, tags, bundle_tags, translations = get_catalog_rows()
+        patchers = {
+            "bundle": (patch("app.services.catalog_service.BundleRepo"), bundles),
+            "tag": (patch("app.services.catalog_service.TagRepo"), tags),
+            "bundle_tag": (patch("app.services.catalog_service.BundleTagRepo"), bundle_tags),
+            "translation": (patch("app.services.catalog_service.TagTranslationRepo"), translations),
+        }
+        self.repos = {}
+        for name, (patcher, rows) in patchers.items():
+            self.addCleanup(patcher.stop)
+            repo = patcher.start().return_value
+            repo.list = MagicMock(return_value=rows)
+            self.repos[name] = repo
+        config_patcher = patch("app.services.catalog_service.ConfigRepo")
+        self.addCleanup(config_patcher.stop)
+        self.config_repo = config_patcher.start().return_value
+        self.config_repo.get_first_by.return_value = AppConfigModel(key="APP_CACHE_KEY", value="v1")
+
+        self.service = CatalogService()
+
+    def test_snapshot_is_reused_within_check_interval(self):
+        first = self.service.get_snapshot()
+        second = self.service.get_snapshot()
+        self.assertIs(first, second)
+        self.repos["bundle"].list.assert_called_once()
+
+    def test_snapshot_rebuilt_in_background_when_version_rotates(self):
+        first = self.service.get_snapshot()
+        building = threading.Event()
+        release = threading.Event()
+
+        def list_bundles(*args, **kwargs):
+            building.set()
+            release.wait(5)
+            return get_catalog_rows()[0]
+
+        self.config_repo.get_first_by.return_value = AppConfigModel(key="APP_CACHE_KEY", value="v2")
+        self.repos["bundle"].list.side_effect = list_bundles
+        self.service.invalidate()
+        self.assertIs(self.service.get_snapshot(), first)
+        self.assertTrue(building.wait(5))
+        # the previous snapshot is served without waiting while the rebuild runs
+        self.assertIs(self.service.get_snapshot(), first)
+        release.set()
+
+        deadline = time.monotonic() + 5
+        while self.service.get_snapshot() is first and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.service.get_snapshot().version, "v2")
+        self.assertEqual(self.repos["bundle"].list.call_count, 2)
+
+    def test_failed_rebuild_keeps_previous_snapshot(self):
+        first = self.service.get_snapshot()
+        self.config_repo.get_first_by.return_value = AppConfigModel(key="APP_CACHE_KEY", value="v2")
+        self.repos["bundle"].list.side_effect = DatabaseException("down")
+        self.assertIs(self.service.refresh(), first)
+        self.service.invalidate()
+        self.assertIs(self.service.get_snapshot(), first)
+
+    def test_first_build_failure_raises(self):
+        self.repos["bundle"].list.side_effect = DatabaseException("down")
+        with self.assertRaises(DatabaseException):
+            self.service.get_snapshot()
+
+
+if __name__ == "__main__":
+    unittest.main()
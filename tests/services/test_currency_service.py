@@ -0,0 +1,66 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from app.models.app import CurrencyModel
+from app.services.currency_service import ExchangeRateTable, CurrencyService
+
+
+class TestExchangeRateTable(unittest.TestCase):
+
+    def setUp(self):
+        os.environ["SYSTEM_CURRENCY"] = "USD"
+        patcher = patch("app.services.currency_service.CurrencyRepo")
+        self.addCleanup(patcher.stop)
+        self.currency_repo_class = patcher.start()
+        self.currency_repo = self.currency_repo_class.return_value
+        self.currency_repo.list.return_value = [CurrencyModel(name="EUR", default_currency="USD", rate=0.9),
+                                                CurrencyModel(name="LBP", default_currency="USD", rate=89000)]
+        self.table = ExchangeRateTable()
+
+    def test_rates_loaded_once(self):
+        self.assertEqual(self.table.get_rate("EUR"), 0.9)
+        self.assertEqual(self.table.get_rate("LBP"), 89000)
+        self.assertIsNone(self.table.get_rate("GBP"))
+        self.currency_repo.list.assert_called_once_with(where={"default_currency": "USD"})
+        # reloads must not read through the table cache
+        self.currency_repo_class.assert_called_once_with(cache_ttl=0)
+
+    def test_update_is_visible_without_reload(self):
+        self.table.get_rate("EUR")
+        self.table.update("EUR", 0.95)
+        self.assertEqual(self.table.get_rate("EUR"), 0.95)
+        self.currency_repo.list.assert_called_once()
+
+    def test_stale_table_is_reloaded_in_background(self):
+        self.assertEqual(self.table.get_rate("EUR"), 0.9)
+        self.currency_repo.list.return_value = [CurrencyModel(name="EUR", default_currency="USD", rate=0.8)]
+        with patch.dict("os.environ", {"EXCHANGE_RATE_TABLE_TTL_SECONDS": "-1"}), \
+                patch("app.services.currency_service.threading.Thread") as thread:
+            self.assertEqual(self.table.get_rate("EUR"), 0.9)
+            self.table.get_rate("EUR")
+        thread.assert_called_once()
+        thread.call_args.kwargs["target"]()
+        self.assertEqual(self.table.get_rate("EUR"), 0.8)
+
+    def test_currency_service_reads_from_table(self):
+        with patch("app.services.currency_service.exchange_rate_table", self.table):
+            service = CurrencyService()
+            self.assertEqual(service.get_rate_by_currency("EUR"), 0.9)
+            self.assertEqual(service.get_rate_by_currency("USD"), 1.0)
+            self.assertEqual(service.get_rate_by_currency("GBP"), 1.0)
+
+            service.update_rate("EUR", 0.92)
+            self.assertEqual(service.get_rate_by_currency("EUR"), 0.92)
+            self.currency_repo.update_by.assert_called_once_with({"name": "EUR", "default_currency": "USD"},
+                                                                 data={"rate": 0.92})
+
+    def test_unknown_currencies_resolve_to_system_currency(self):
+        with patch("app.services.currency_service.exchange_rate_table", self.table):
+            service = CurrencyService()
+            self.assertEqual([service.resolve_currency(currency) for currency in ["EUR", " eur", "USD", "GBP", None]],
+                             ["EUR", "EUR", "USD", "USD", "USD"])
+
+
+if __name__ == "__main__":
+    unittest.main()
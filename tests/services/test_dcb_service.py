@@ -0,0 +1,80 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from app.exceptions import DCBException
+from app.services.integration.circuit_breaker import CircuitBreaker
+from app.services.integration.dcb_service import DCBService
+
+
+class TestDCBCircuitBreaker(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.status_code = 503
+        self.calls = 0
+
+        async def handle(request: httpx.Request) -> httpx.Response:
+            self.calls += 1
+            if self.status_code is None:
+                await asyncio.sleep(60)
+            return httpx.Response(self.status_code, json={"data": {"errorCode": "0"}})
+
+        self.client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+        self.circuit_breaker = CircuitBreaker("dcb", failure_threshold=2, reset_timeout=30)
+        for target, value in [("pooled_async_client", self.client), ("get_circuit_breaker", self.circuit_breaker)]:
+            patcher = patch(f"app.services.integration.dcb_service.{target}", return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.service = DCBService(send_otp_url="https://dcb/otp", charge_url="https://dcb/deduct",
+                                  verify_otp_url="https://dcb/verify", api_key="key")
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    async def test_open_circuit_fails_fast_until_trial_call_succeeds(self):
+        for _ in range(3):
+            with self.assertRaises(DCBException):
+                await self.service.send_sms_template("+963900000000", "1234")
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.OPEN)
+
+        self.status_code = 200
+        with patch("app.services.integration.circuit_breaker.time.monotonic", return_value=10 ** 9):
+            await self.service.send_sms_template("+963900000000", "1234")
+        self.assertEqual(self.calls, 3)
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.CLOSED)
+
+    async def test_client_errors_do_not_open_circuit(self):
+        self.status_code = 400
+        for _ in range(3):
+            with self.assertRaises(DCBException):
+                await self.service.send_sms_template("+963900000000", "1234")
+        self.assertEqual(self.calls, 3)
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.CLOSED)
+
+    async def test_cancelled_trial_call_releases_circuit(self):
+        for _ in range(2):
+            with self.assertRaises(DCBException):
+                await self.service.send_sms_template("+963900000000", "1234")
+
+        self.status_code = None
+        self.circuit_breaker.reset_timeout = 0
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(self.service.send_sms_template("+963900000000", "1234"), 0.01)
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.OPEN)
+
+        self.status_code = 200
+        await self.service.send_sms_template("+963900000000", "1234")
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.CLOSED)
+
+    def test_unreported_trial_expires(self):
+        with patch("app.services.integration.circuit_breaker.time.monotonic", return_value=0):
+            self.circuit_breaker.record_failure()
+            self.circuit_breaker.record_failure()
+        with patch("app.services.integration.circuit_breaker.time.monotonic", return_value=30):
+            self.assertTrue(self.circuit_breaker.allow_request())
+            self.assertFalse(self.circuit_breaker.allow_request())
+        with patch("app.services.integration.circuit_breaker.time.monotonic", return_value=60):
+            self.assertTrue(self.circuit_breaker.allow_request())
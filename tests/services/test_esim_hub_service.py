@@ -0,0 +1,109 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from app.config.api import EsimHubEndpoint
+from app.services.integration.esim_hub_service import EsimHubService
+from app.services.integration.http_pool import pooled_async_client, close_pooled_async_clients, \
+    run_with_pooled_clients
+from app.services.integration.response_cache import get_response_cache
+
+LIMITS = httpx.Limits(max_connections=5)
+
+
+class TestPooledAsyncClient(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncTearDown(self):
+        await close_pooled_async_clients()
+
+    async def test_client_is_reused_per_name_and_loop(self):
+        client = pooled_async_client("https://hub", LIMITS)
+        self.assertIs(pooled_async_client("https://hub", LIMITS), client)
+        self.assertIsNot(pooled_async_client("https://hub2", LIMITS), client)
+
+        other_loop_client = await asyncio.to_thread(asyncio.run, self.get_client("https://hub"))
+        self.assertIsNot(other_loop_client, client)
+
+        await close_pooled_async_clients()
+        self.assertTrue(client.is_closed)
+        self.assertIsNot(pooled_async_client("https://hub", LIMITS), client)
+
+    def test_clients_are_closed_when_sync_run_returns(self):
+        client = run_with_pooled_clients(self.get_client("https://hub"))
+        self.assertTrue(client.is_closed)
+
+    @staticmethod
+    async def get_client(name: str) -> httpx.AsyncClient:
+        return pooled_async_client(name, LIMITS)
+
+
+class TestEsimHubRequests(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.requests = []
+        self.response = {"success": True, "data": {"item": {}}}
+
+        async def handle(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            await asyncio.sleep(0)
+            return httpx.Response(200, json=self.response)
+
+        self.client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+        get_response_cache("esim_hub").clear()
+        patcher = patch("app.services.integration.esim_hub_service.pooled_async_client", return_value=self.client)
+        self.pooled_async_client = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = EsimHubService(base_url="https://hub", api_key="key", tenant_key="tenant")
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    async def test_timeouts_are_set_per_endpoint(self):
+        with patch.dict("os.environ", {"ESIM_HUB_READ_TIMEOUT": "10", "ESIM_HUB_CONNECT_TIMEOUT": "2"}):
+            await self.service.check_bundle_applicable("bundle")
+            await self.service.create_reseller_order("bundle", "order")
+
+        self.assertEqual(self.requests[0].extensions["timeout"], {"connect": 2, "read": 10, "write": 10, "pool": 10})
+        self.assertEqual(self.requests[1].url.path, EsimHubEndpoint.API_CREATE_RESELLER_ORDER)
+        self.assertEqual(self.requests[1].extensions["timeout"]["read"], 120)
+        self.assertEqual(self.requests[1].headers["Tenant"], "tenant")
+
+    async def test_concurrent_reads_share_one_request(self):
+        self.response = {"success": True, "data": {"dataAllocated": 100, "dataUsed": 40}}
+        with patch("app.services.integration.esim_hub_service.DtoMapper.to_consumption_response",
+                   side_effect=lambda data: data):
+            consumptions = await asyncio.gather(*[self.service.get_bundle_consumption("order") for _ in range(3)])
+            consumptions[0]["dataUsed"] = 0
+            cached = await self.service.get_bundle_consumption("order")
+            await self.service.get_bundle_consumption("other-order")
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(cached["dataUsed"], 40)
+
+    async def test_failed_responses_are_not_cached(self):
+        self.response = {"success": False, "data": {}}
+        with patch("app.services.integration.esim_hub_service.DtoMapper.to_consumption_response",
+                   side_effect=lambda data: data):
+            await self.service.get_bundle_consumption("order")
+            self.response = {"success": True, "data": {"dataUsed": 40}}
+            await self.service.get_bundle_consumption("order")
+            await self.service.get_bundle_consumption("order")
+        self.assertEqual(len(self.requests), 2)
+
+    async def test_sync_and_purchase_reads_are_not_cached(self):
+        with patch("app.services.integration.esim_hub_service.DtoMapper.to_bundle_dto",
+                   side_effect=lambda bundle, currency: bundle):
+            await self.service.get_bundle_by_id("bundle")
+            await self.service.get_bundle_by_id("bundle")
+        self.assertTrue(await self.service.check_bundle_applicable("bundle"))
+        self.response = {"message": "not available"}
+        self.assertFalse(await self.service.check_bundle_applicable("bundle"))
+        self.assertEqual([request.url.path for request in self.requests],
+                         [EsimHubEndpoint.API_GET_BUNDLE_BY_ID] * 2 + [EsimHubEndpoint.API_CHECK_BUNDLE_APPLICABLE] * 2)
+
+    async def test_writes_are_not_cached(self):
+        await self.service.create_reseller_order("bundle", "order")
+        await self.service.create_reseller_order("bundle", "order")
+        self.assertEqual([request.url.path for request in self.requests].count(
+            EsimHubEndpoint.API_CREATE_RESELLER_ORDER), 2)
@@ -1,8 +1,10 @@
+import asyncio
 import unittest
-from unittest.mock import patch, AsyncMock
+from unittest.mock import patch, AsyncMock, MagicMock
 
 from app.schemas.home import HomeResponseDto
 from app.schemas.response import Response
+from app.services import home_service
 from app.services.home_service import HomeService
 from tests.mocks import get_country_mocks, get_region_mocks, get_bundle_mocks
 
@@ -38,5 +40,83 @@ class TestHomeService(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(home_data.global_bundles, get_bundle_mocks())
 
 
+class TestHomeV2Payload(unittest.IsolatedAsyncioTestCase):
+
+    @patch("app.services.home_service.esim_hub_service_instance")
+    def setUp(self, mock_esim_hub_service):
+        catalog_patcher = patch("app.services.home_service.catalog_service")
+        self.addCleanup(catalog_patcher.stop)
+        self.catalog_service = catalog_patcher.start()
+        self.catalog_service.get_snapshot.return_value.version = "v1"
+        self.catalog_service.get_snapshot.return_value.resolve_locale.side_effect = \
+            lambda locale: "ar" if locale.startswith("ar") else "en"
+        home_service._home_payloads.clear()
+        self.addCleanup(home_service._home_payloads.clear)
+
+        self.grouping_service = MagicMock()
+        self.grouping_service.get_all_countries = AsyncMock(return_value=get_country_mocks())
+        self.grouping_service.get_all_regions = AsyncMock(return_value=get_region_mocks())
+        self.grouping_service.get_cruise_bundle = AsyncMock(side_effect=lambda **kwargs: get_bundle_mocks())
+        self.grouping_service.get_global_bundle = AsyncMock(side_effect=lambda **kwargs: get_bundle_mocks())
+        self.currency_service = MagicMock()
+        self.currency_service.get_rate_by_currency.return_value = 1.0
+        self.currency_service.resolve_currency.side_effect = lambda currency: currency.upper()
+
+        self.home_service = HomeService()
+        self.home_service._HomeService__grouping_service = self.grouping_service
+        self.home_service._HomeService__currency_service = self.currency_service
+
+    async def test_payload_reused_for_same_locale_and_currency(self):
+        first = await self.home_service.get_home_payload(currency="EUR", locale="en")
+        second = await self.home_service.get_home_payload(currency="EUR", locale="en")
+
+        self.assertIs(first, second)
+        self.grouping_service.get_global_bundle.assert_called_once()
+        self.assertEqual(Response[HomeResponseDto].model_validate_json(first.body), first.response)
+
+    async def test_header_variants_share_one_payload(self):
+        first = await self.home_service.get_home_payload(currency="EUR", locale="en")
+        for currency, locale in [("eur", "en-US"), ("EUR", "en-US,en;q=0.9"), ("EUR", "xx")]:
+            self.assertIs(await self.home_service.get_home_payload(currency=currency, locale=locale), first)
+        self.assertIsNot(await self.home_service.get_home_payload(currency="EUR", locale="ar-LB"), first)
+        self.assertEqual(self.grouping_service.get_global_bundle.call_count, 2)
+        self.assertEqual(len(home_service._home_payloads), 2)
+
+    async def test_concurrent_misses_share_one_build(self):
+        async def get_bundles(**kwargs):
+            await asyncio.sleep(0.01)
+            return get_bundle_mocks()
+
+        self.grouping_service.get_global_bundle.side_effect = get_bundles
+        payloads = await asyncio.gather(
+            *[self.home_service.get_home_payload(currency="EUR", locale="en") for _ in range(10)])
+
+        self.assertTrue(all(payload is payloads[0] for payload in payloads))
+        self.grouping_service.get_global_bundle.assert_called_once()
+        self.assertEqual(home_service._home_builds, {})
+
+    async def test_payload_rebuilt_when_rate_or_version_changes(self):
+        first = await self.home_service.get_home_payload(currency="EUR", locale="en")
+        self.currency_service.get_rate_by_currency.return_value = 1.1
+        second = await self.home_service.get_home_payload(currency="EUR", locale="en")
+        self.catalog_service.get_snapshot.return_value.version = "v2"
+        third = await self.home_service.get_home_payload(currency="EUR", locale="en")
+
+        self.assertIsNot(first, second)
+        self.assertIsNot(second, third)
+        self.assertEqual(third.version, "v2")
+
+    async def test_failed_section_served_empty_and_not_cached(self):
+        self.grouping_service.get_all_regions.side_effect = Exception("down")
+
+        first = await self.home_service.get_home_payload(currency="EUR", locale="en")
+        second = await self.home_service.get_home_payload(currency="EUR", locale="en")
+
+        self.assertEqual(first.response.data.regions, [])
+        self.assertEqual(first.response.data.countries, get_country_mocks())
+        self.assertFalse(first.complete)
+        self.assertIsNot(first, second)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,125 @@
+import json
+import os
+import unittest
+from unittest.mock import patch
+
+from app.models.app import BundleModel, BundleTagModel
+from app.schemas.dto_mapper import DtoMapper
+from app.schemas.home import BundleDTO
+from app.schemas.response import ResponseHelper
+from app.services.catalog_service import CatalogSnapshot
+from app.services.pricing_service import PricingService
+from tests.mocks import get_bundle_mock
+
+
+def get_snapshot(version: str = "v1") -> CatalogSnapshot:
+    bundles = [BundleModel(id=f"b{index}", is_active=True, data={"original_price": price})
+               for index, price in enumerate([10.99, 5.0, 0.333, 20.5])]
+    return CatalogSnapshot(version=version, bundles=bundles, tags=[], bundle_tags=[], translations=[])
+
+
+class TestPricingService(unittest.TestCase):
+
+    def setUp(self):
+        os.environ["DEFAULT_CURRENCY"] = "USD"
+        os.environ["DISPLAY_PRICE"] = "normal"
+        self.addCleanup(os.environ.pop, "DISPLAY_PRICE")
+        patcher = patch("app.services.pricing_service.exchange_rate_table")
+        self.addCleanup(patcher.stop)
+        self.rate_table = patcher.start()
+        self.rate_table.get_rates.return_value = {"EUR": 0.9, "GBP": 0.8}
+        self.service = PricingService()
+
+    def assert_matches_dto_mapper(self, snapshot, currency, rate):
+        column = self.service.get_column(snapshot, currency_name=currency, rate=rate)
+        for bundle_id, bundle_model in snapshot.bundles.items():
+            expected = get_bundle_mock()
+            expected.original_price = bundle_model.data["original_price"]
+            actual = expected.model_copy()
+            DtoMapper.bundle_currency_update(expected, currency, rate)
+            column.apply(actual, bundle_id)
+            self.assertEqual((actual.price, actual.price_display, actual.currency_code),
+                             (expected.price, expected.price_display, expected.currency_code))
+
+    def test_columns_match_per_bundle_conversion(self):
+        snapshot = get_snapshot()
+        self.assert_matches_dto_mapper(snapshot, "EUR", 0.9)
+        self.assert_matches_dto_mapper(snapshot, "XYZ", 1.0)
+
+    def test_rounded_display_price(self):
+        os.environ["DISPLAY_PRICE"] = "rounded"
+        self.assert_matches_dto_mapper(get_snapshot(), "EUR", 0.9)
+
+    def test_known_rates_built_in_one_pass_and_reused(self):
+        snapshot = get_snapshot()
+        first = self.service.get_column(snapshot, currency_name="GBP", rate=0.8)
+        self.assertIs(self.service.get_column(snapshot, currency_name="GBP", rate=0.8), first)
+        self.rate_table.get_rates.assert_called_once()
+
+        changed = self.service.get_column(snapshot, currency_name="GBP", rate=0.85)
+        self.assertIsNot(changed, first)
+        self.assertIsNot(self.service.get_column(get_snapshot("v2"), currency_name="GBP", rate=0.85), changed)
+
+    def test_bundle_outside_snapshot_is_converted_directly(self):
+        column = self.service.get_column(get_snapshot(), currency_name="EUR", rate=0.9)
+        bundle = column.apply(get_bundle_mock(), "unknown")
+        self.assertEqual(bundle.currency_code, "EUR")
+
+    def test_best_offers_keep_cheapest_per_data_and_validity(self):
+        bundles = [
+            BundleModel(id="a", is_active=True, data={"original_price": 9.0, "price": 9.0, "gprs_limit_display": "1 GB",
+                                                      "validity": 7, "countries": []}),
+            BundleModel(id="b", is_active=True, data={"original_price": 4.0, "price": 4.0, "gprs_limit_display": "1 GB",
+                                                      "validity": 7, "countries": []}),
+            BundleModel(id="c", is_active=True, data={"original_price": 6.0, "price": 6.0, "gprs_limit_display": "5 GB",
+                                                      "validity": 30, "countries": []}),
+            BundleModel(id="d", is_active=True, data={"original_price": 1.0, "price": 1.0, "gprs_limit_display": "5 GB",
+                                                      "validity": 7, "countries": []}),
+        ]
+        bundle_tags = [BundleTagModel(bundle_id=bundle.id, tag_id="lb") for bundle in bundles]
+        snapshot = CatalogSnapshot(version="v1", bundles=bundles, tags=[], bundle_tags=bundle_tags, translations=[])
+        column = self.service.get_column(snapshot, currency_name="EUR", rate=0.9)
+
+        offers = column.get_best_offers(snapshot, tag_ids=["lb"])
+        self.assertEqual([bundle.id for bundle in offers], ["d", "b", "c"])
+        self.assertIs(column.get_best_offers(snapshot, tag_ids=["lb"]), offers)
+        self.assertEqual(column.get_best_offers(snapshot, tag_ids=["lb"], min_countries=2), [])
+
+    def test_rendered_bundles_match_model_serialization(self):
+        bundle = get_bundle_mock()
+        bundle.countries = []
+        snapshot = CatalogSnapshot(version="v1", bundles=[BundleModel(id="b1", is_active=True,
+                                                                      data=bundle.model_dump(mode="json"))],
+                                   tags=[], bundle_tags=[], translations=[])
+        column = self.service.get_column(snapshot, currency_name="EUR", rate=0.9)
+
+        fragments = column.render_bundles(snapshot, list(snapshot.bundles.values()), locale="en", icon="icon.png")
+        expected = column.apply(BundleDTO(**bundle.model_dump()), "b1")
+        expected.icon = "icon.png"
+        self.assertEqual(fragments, [expected.model_dump_json().encode()])
+        self.assertIs(column.render_bundles(snapshot, list(snapshot.bundles.values()), locale="en",
+                                            icon="icon.png")[0], fragments[0])
+
+        body = ResponseHelper.success_json_list_response(fragments, len(fragments))
+        self.assertEqual(json.loads(body),
+                         ResponseHelper.success_data_response([expected], 1).model_dump(mode="json"))
+
+    def test_rendered_bundles_past_cache_size(self):
+        snapshot = get_snapshot()
+        for bundle in snapshot.bundles.values():
+            bundle.data.update(get_bundle_mock().model_dump(mode="json", exclude={"original_price"}), countries=[])
+        column = self.service.get_column(snapshot, currency_name="EUR", rate=0.9)
+        bundles = list(snapshot.bundles.values())
+
+        with patch.dict("os.environ", {"BUNDLE_FRAGMENT_CACHE_SIZE": "3"}):
+            first = column.render_bundles(snapshot, bundles[:2], locale="en", icon=None)
+            fragments = column.render_bundles(snapshot, bundles[:1] + bundles[2:], locale="en", icon=None)
+            self.assertEqual(len(fragments), 3)
+            self.assertIs(fragments[0], first[0])
+            # b1 was the least recently used fragment and got evicted
+            self.assertIsNot(column.render_bundles(snapshot, bundles[1:2], locale="en", icon=None)[0], first[1])
+            self.assertIs(column.render_bundles(snapshot, bundles[3:], locale="en", icon=None)[0], fragments[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
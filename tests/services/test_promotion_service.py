@@ -0,0 +1,38 @@
+import unittest
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from app.config.db import PromotionRuleAction
+from app.services.promotion_service import PromotionService
+
+
+class TestPromotionUsageCashback(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.repos = {}
+        for name in ["PromotionRepo", "PromotionRuleRepo", "PromotionUsageRepo", "UserRepo", "BundleRepo",
+                     "esim_hub_service_instance", "BundleService", "UserWalletService"]:
+            patcher = patch(f"app.services.promotion_service.{name}")
+            self.addCleanup(patcher.stop)
+            self.repos[name] = patcher.start().return_value
+        self.user_wallet_service = self.repos["UserWalletService"]
+        self.user_wallet_service.add_wallet_transaction = AsyncMock()
+        self.service = PromotionService()
+
+    def set_rule_action(self, action: PromotionRuleAction):
+        self.repos["PromotionRuleRepo"].get_by_id.return_value = MagicMock(promotion_rule_event_id=action)
+
+    async def test_completed_cashback_order_credits_wallet(self):
+        self.set_rule_action(PromotionRuleAction.CASHBACK_AMOUNT)
+        await self.service.update_promotion_usage("user", "CODE", "completed", "rule", 5.0)
+        self.user_wallet_service.add_wallet_transaction.assert_awaited_once_with(5.0, "user")
+
+    async def test_discount_or_failed_order_credits_nothing(self):
+        self.set_rule_action(PromotionRuleAction.DISCOUNT_AMOUNT)
+        await self.service.update_promotion_usage("user", "CODE", "completed", "rule", 5.0)
+        self.set_rule_action(PromotionRuleAction.CASHBACK_PERCENTAGE)
+        await self.service.update_promotion_usage("user", "CODE", "failed", "rule", 5.0)
+        self.user_wallet_service.add_wallet_transaction.assert_not_awaited()
+
+
+if __name__ == "__main__":
+    unittest.main()
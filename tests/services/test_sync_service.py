@@ -0,0 +1,59 @@
+import unittest
+from unittest.mock import patch
+
+from app.exceptions import DatabaseException
+
+from app.models.app import BundleTagModel
+from app.schemas.home import BundleDTO, CountryDTO
+from app.services.sync_service import SyncService
+
+
+def get_bundle(bundle_code: str, country_ids: list) -> BundleDTO:
+    countries = [CountryDTO.model_construct(id=country_id, country=country_id.upper()) for country_id in country_ids]
+    return BundleDTO.model_construct(bundle_code=bundle_code, countries=countries, bundle_region=[])
+
+
+class TestSyncBundles(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.repos = {}
+        for name in ["BundleRepo", "TagRepo", "BundleTagRepo", "ConfigRepo"]:
+            patcher = patch(f"app.services.sync_service.{name}")
+            self.addCleanup(patcher.stop)
+            self.repos[name] = patcher.start().return_value
+        self.repos["TagRepo"].exists.return_value = True
+        self.repos["BundleTagRepo"].list_in.return_value = [BundleTagModel(bundle_id="b1", tag_id="lb")]
+        self.repos["BundleTagRepo"].create_many.return_value = 2
+        self.sync_service = SyncService()
+
+    async def test_page_written_with_one_upsert_and_one_insert(self):
+        await self.sync_service.sync_bundle(get_bundle("b1", ["lb", "fr"]))
+
+        bundle_repo = self.repos["BundleRepo"]
+        bundle_repo.upsert_many.assert_called_once()
+        rows = bundle_repo.upsert_many.call_args.args[0]
+        self.assertEqual([row["id"] for row in rows], ["b1"])
+        self.assertEqual(bundle_repo.upsert_many.call_args.kwargs, {"on_conflict": "id"})
+        bundle_repo.create.assert_not_called()
+        bundle_repo.update.assert_not_called()
+
+        bundle_tag_repo = self.repos["BundleTagRepo"]
+        bundle_tag_repo.create_many.assert_called_once_with([{"bundle_id": "b1", "tag_id": "fr"}])
+        bundle_tag_repo.create.assert_not_called()
+
+    async def test_failed_page_falls_back_to_one_bundle_at_a_time(self):
+        def upsert_many(rows, on_conflict):
+            if any(row["id"] == "bad" for row in rows):
+                raise DatabaseException("invalid input syntax")
+            return len(rows)
+
+        bundle_repo = self.repos["BundleRepo"]
+        bundle_repo.upsert_many.side_effect = upsert_many
+        self.repos["BundleTagRepo"].list_in.return_value = []
+        await self.sync_service._SyncService__sync_bundle_page(
+            [get_bundle("b1", ["lb"]), get_bundle("bad", ["lb"]), get_bundle("b2", ["fr"])])
+
+        written = [[row["id"] for row in call.args[0]] for call in bundle_repo.upsert_many.call_args_list]
+        self.assertEqual(written, [["b1", "bad", "b2"], ["b1"], ["bad"], ["b2"]])
+        created = [call.args[0] for call in self.repos["BundleTagRepo"].create_many.call_args_list]
+        self.assertEqual(created, [[{"bundle_id": "b1", "tag_id": "lb"}], [{"bundle_id": "b2", "tag_id": "fr"}]])